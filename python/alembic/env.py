@@ -16,6 +16,7 @@ from bytebot.models.base import Base
 from bytebot.models.task import Task
 from bytebot.models.message import Message
 from bytebot.models.summary import Summary
+from bytebot.models.desktop_action import DesktopActionLog
 
 # This is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
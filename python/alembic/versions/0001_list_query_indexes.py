@@ -0,0 +1,50 @@
+"""Add indexes for task and message list queries
+
+Revision ID: 0001_list_query_indexes
+Revises:
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_list_query_indexes'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns)
+INDEXES = [
+    ("ix_task_status_priority", "task", ["status", "priority"]),
+    ("ix_message_task_created", "message", ["task_id", "created_at"]),
+    ("ix_message_parent_message_id", "message", ["parent_message_id"]),
+    ("ix_summary_task_id", "summary", ["task_id"]),
+    ("ix_summary_parent_summary_id", "summary", ["parent_summary_id"]),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
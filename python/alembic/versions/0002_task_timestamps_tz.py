@@ -0,0 +1,52 @@
+"""Store task start and completion times with time zone
+
+Revision ID: 0002_task_timestamps_tz
+Revises: 0001_list_query_indexes
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_task_timestamps_tz'
+down_revision = '0001_list_query_indexes'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = ("started_at", "completed_at")
+
+
+def upgrade() -> None:
+    # Other dialects (e.g. SQLite) use the same column type with or without
+    # a time zone
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    # Existing naive values were written with datetime.utcnow()
+    for column in COLUMNS:
+        op.alter_column(
+            "task",
+            column,
+            type_=sa.DateTime(timezone=True),
+            existing_type=sa.DateTime(),
+            existing_nullable=True,
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for column in COLUMNS:
+        op.alter_column(
+            "task",
+            column,
+            type_=sa.DateTime(),
+            existing_type=sa.DateTime(timezone=True),
+            existing_nullable=True,
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+        )
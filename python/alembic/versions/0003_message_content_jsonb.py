@@ -0,0 +1,65 @@
+"""Store message content as JSONB with a GIN index
+
+Revision ID: 0003_message_content_jsonb
+Revises: 0002_task_timestamps_tz
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_message_content_jsonb'
+down_revision = '0002_task_timestamps_tz'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.alter_column(
+        "message",
+        "content",
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        existing_nullable=False,
+        postgresql_using="content::jsonb",
+    )
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_message_content_gin",
+            "message",
+            ["content"],
+            if_not_exists=True,
+            postgresql_using="gin",
+            postgresql_ops={"content": "jsonb_path_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_message_content_gin",
+            table_name="message",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+
+    op.alter_column(
+        "message",
+        "content",
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=False,
+        postgresql_using="content::json",
+    )
@@ -0,0 +1,56 @@
+"""Add generated content flag columns to messages
+
+Revision ID: 0004_message_content_flags
+Revises: 0003_message_content_jsonb
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_message_content_flags'
+down_revision = '0003_message_content_jsonb'
+branch_labels = None
+depends_on = None
+
+
+# (column, content block type)
+FLAGS = [
+    ("has_tool_use", "tool_use"),
+    ("has_images", "image"),
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        # The model computes NULL here (the Python properties read content).
+        # SQLite cannot add a STORED column to an existing table, and a
+        # VIRTUAL one holds the same value.
+        for column, _ in FLAGS:
+            op.add_column(
+                "message",
+                sa.Column(column, sa.Boolean(), sa.Computed("NULL", persisted=False), nullable=True),
+            )
+        return
+
+    # Adding a stored generated column rewrites the table once
+    for column, block_type in FLAGS:
+        op.add_column(
+            "message",
+            sa.Column(
+                column,
+                sa.Boolean(),
+                sa.Computed(
+                    f"jsonb_path_exists(content, '$[*] ? (@.type == \"{block_type}\")')",
+                    persisted=True,
+                ),
+                nullable=True,
+            ),
+        )
+
+
+def downgrade() -> None:
+    for column, _ in reversed(FLAGS):
+        op.drop_column("message", column)
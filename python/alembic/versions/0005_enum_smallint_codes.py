@@ -0,0 +1,146 @@
+"""Store task and message enums as SMALLINT codes
+
+Revision ID: 0005_enum_smallint_codes
+Revises: 0004_message_content_flags
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from bytebot.shared.task_types import (
+    ROLE_CODES,
+    TASK_PRIORITY_CODES,
+    TASK_STATUS_CODES,
+    TASK_TYPE_CODES,
+)
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_enum_smallint_codes'
+down_revision = '0004_message_content_flags'
+branch_labels = None
+depends_on = None
+
+
+# (table, column, native enum type, codes)
+COLUMNS = [
+    ("task", "status", "taskstatus", TASK_STATUS_CODES),
+    ("task", "priority", "taskpriority", TASK_PRIORITY_CODES),
+    ("task", "task_type", "tasktype", TASK_TYPE_CODES),
+    ("message", "role", "role", ROLE_CODES),
+]
+
+
+# Generated content flags added to message by 0004. SQLite batch mode
+# cannot copy generated columns, so they are dropped around the rebuild.
+MESSAGE_FLAGS = ("has_tool_use", "has_images")
+
+
+def _table_columns(table: str):
+    """Get the (column, codes) pairs of one table."""
+    return [(column, codes) for t, column, _, codes in COLUMNS if t == table]
+
+
+def _name_length(codes) -> int:
+    """Get the VARCHAR length a non-native enum of these members used."""
+    return max(len(member.name) for member in codes)
+
+
+def _rebuild(table: str, type_for) -> None:
+    """Retype one table's enum columns; type_for(codes) gives (new, existing)."""
+    if table == "message":
+        for flag in MESSAGE_FLAGS:
+            op.drop_column("message", flag)
+
+    with op.batch_alter_table(table) as batch_op:
+        for column, codes in _table_columns(table):
+            type_, existing_type = type_for(codes)
+            batch_op.alter_column(
+                column,
+                type_=type_,
+                existing_type=existing_type,
+                existing_nullable=False,
+            )
+
+    if table == "message":
+        for flag in MESSAGE_FLAGS:
+            op.add_column(
+                "message",
+                sa.Column(flag, sa.Boolean(), sa.Computed("NULL", persisted=False), nullable=True),
+            )
+
+
+def _recode(table: str, mapping) -> None:
+    """Rewrite one table's enum values; mapping(codes) gives {old: new}."""
+    columns = _table_columns(table)
+    t = sa.table(table, *(sa.column(column, sa.String) for column, _ in columns))
+    op.execute(
+        t.update().values({
+            column: sa.case(mapping(codes), value=t.c[column])
+            for column, codes in columns
+        })
+    )
+
+
+def _upgrade_other() -> None:
+    """Convert the VARCHAR member names of other dialects to SMALLINT codes."""
+    for table in ("task", "message"):
+        _recode(table, lambda codes: {member.name: str(code) for member, code in codes.items()})
+        _rebuild(table, lambda codes: (sa.SmallInteger(), sa.String(_name_length(codes))))
+
+
+def _downgrade_other() -> None:
+    """Convert SMALLINT codes back to VARCHAR member names."""
+    for table in ("message", "task"):
+        _rebuild(table, lambda codes: (sa.String(_name_length(codes)), sa.SmallInteger()))
+        _recode(table, lambda codes: {str(code): member.name for member, code in codes.items()})
+
+
+def _case(column: str, pairs) -> str:
+    """Build a CASE expression mapping each source value to its target."""
+    branches = " ".join(f"WHEN {source} THEN {target}" for source, target in pairs)
+    return f"CASE {column} {branches} END"
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        # Non-native enums stored member names in VARCHAR columns
+        _upgrade_other()
+        return
+
+    for table, column, enum_name, codes in COLUMNS:
+        # The native enum stores member names
+        using = _case(
+            f"{column}::text",
+            ((f"'{member.name}'", code) for member, code in codes.items()),
+        )
+        op.alter_column(
+            table,
+            column,
+            type_=sa.SmallInteger(),
+            existing_nullable=False,
+            postgresql_using=using,
+        )
+        op.execute(f"DROP TYPE IF EXISTS {enum_name}")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        _downgrade_other()
+        return
+
+    for table, column, enum_name, codes in reversed(COLUMNS):
+        names = ", ".join(f"'{member.name}'" for member in codes)
+        op.execute(f"CREATE TYPE {enum_name} AS ENUM ({names})")
+        using = _case(
+            column,
+            ((code, f"'{member.name}'::{enum_name}") for member, code in codes.items()),
+        )
+        op.alter_column(
+            table,
+            column,
+            type_=sa.Enum(*(member.name for member in codes), name=enum_name),
+            existing_nullable=False,
+            postgresql_using=using,
+        )
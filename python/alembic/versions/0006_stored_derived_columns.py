@@ -0,0 +1,58 @@
+"""Add generated token total and task duration columns
+
+Revision ID: 0006_stored_derived_columns
+Revises: 0005_enum_smallint_codes
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_stored_derived_columns'
+down_revision = '0005_enum_smallint_codes'
+branch_labels = None
+depends_on = None
+
+
+# (table, column, type, generation expression)
+COLUMNS = [
+    ("message", "total_tokens", sa.Integer(), "input_tokens + output_tokens"),
+    ("summary", "total_tokens", sa.Integer(), "input_tokens + output_tokens"),
+    ("task", "duration_seconds", sa.Float(), "EXTRACT(EPOCH FROM completed_at - started_at)"),
+]
+
+# SQLite spelling of the duration, rounded to hide julianday's float error
+SQLITE_DURATION = "round((julianday(completed_at) - julianday(started_at)) * 86400.0, 3)"
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        # ALTER TABLE can only add virtual generated columns on SQLite
+        for table, column, type_, expression in COLUMNS:
+            if column == "duration_seconds":
+                expression = SQLITE_DURATION
+            op.add_column(
+                table,
+                sa.Column(column, type_, sa.Computed(expression, persisted=False), nullable=True),
+            )
+        return
+
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    # Adding a stored generated column rewrites the table once
+    for table, column, type_, expression in COLUMNS:
+        op.add_column(
+            table,
+            sa.Column(column, type_, sa.Computed(expression, persisted=True), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name not in ("postgresql", "sqlite"):
+        return
+
+    for table, column, _, _ in reversed(COLUMNS):
+        op.drop_column(table, column)
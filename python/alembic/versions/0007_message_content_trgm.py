@@ -0,0 +1,42 @@
+"""Add a trigram index for substring search over message content
+
+Revision ID: 0007_message_content_trgm
+Revises: 0006_stored_derived_columns
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_message_content_trgm'
+down_revision = '0006_stored_derived_columns'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_message_content_trgm "
+            "ON message USING gin (CAST(content AS TEXT) gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_message_content_trgm",
+            table_name="message",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,43 @@
+"""Notify listeners when a task is inserted
+
+Revision ID: 0008_task_insert_notify
+Revises: 0007_message_content_trgm
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_task_insert_notify'
+down_revision = '0007_message_content_trgm'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_task_inserted() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('tasks_new', NEW.id::text);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER task_inserted_notify AFTER INSERT ON task "
+        "FOR EACH ROW EXECUTE FUNCTION notify_task_inserted()"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS task_inserted_notify ON task")
+    op.execute("DROP FUNCTION IF EXISTS notify_task_inserted()")
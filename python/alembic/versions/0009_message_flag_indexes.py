@@ -0,0 +1,54 @@
+"""Add partial indexes on the generated message content flags
+
+Revision ID: 0009_message_flag_indexes
+Revises: 0008_task_insert_notify
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_message_flag_indexes'
+down_revision = '0008_task_insert_notify'
+branch_labels = None
+depends_on = None
+
+
+# (index, generated flag column)
+INDEXES = [
+    ("ix_message_has_tool_use", "has_tool_use"),
+    ("ix_message_has_images", "has_images"),
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for index, column in INDEXES:
+            op.create_index(
+                index,
+                "message",
+                [column],
+                if_not_exists=True,
+                postgresql_where=sa.text(column),
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    with op.get_context().autocommit_block():
+        for index, _ in reversed(INDEXES):
+            op.drop_index(
+                index,
+                table_name="message",
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
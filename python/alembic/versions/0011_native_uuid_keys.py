@@ -0,0 +1,116 @@
+"""Store primary and foreign keys as native UUIDs
+
+Revision ID: 0011_native_uuid_keys
+Revises: 0010_model_created_indexes
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011_native_uuid_keys'
+down_revision = '0010_model_created_indexes'
+branch_labels = None
+depends_on = None
+
+
+# (table, UUID columns)
+COLUMNS = [
+    ("task", ["id"]),
+    ("message", ["id", "task_id", "parent_message_id"]),
+    ("summary", ["id", "task_id", "parent_summary_id"]),
+]
+
+# (table, column, referenced table, ON DELETE)
+FOREIGN_KEYS = [
+    ("message", "task_id", "task", "CASCADE"),
+    ("message", "parent_message_id", "message", "SET NULL"),
+    ("summary", "task_id", "task", "CASCADE"),
+    ("summary", "parent_summary_id", "summary", "SET NULL"),
+]
+
+
+def _drop_foreign_keys() -> dict:
+    """Drop the foreign keys on the UUID columns, returning their names."""
+    inspector = sa.inspect(op.get_bind())
+    names = {}
+    for table, column, _, _ in FOREIGN_KEYS:
+        for fk in inspector.get_foreign_keys(table):
+            if fk["constrained_columns"] == [column] and fk["name"]:
+                op.drop_constraint(fk["name"], table, type_="foreignkey")
+                names[(table, column)] = fk["name"]
+    return names
+
+
+def _create_foreign_keys(names: dict) -> None:
+    """Re-create the foreign keys under their previous names."""
+    for table, column, referred, ondelete in FOREIGN_KEYS:
+        op.create_foreign_key(
+            names.get((table, column), f"{table}_{column}_fkey"),
+            table,
+            referred,
+            [column],
+            ["id"],
+            ondelete=ondelete,
+        )
+
+
+def _hyphenated(column: sa.ColumnClause) -> sa.ColumnElement:
+    """Rebuild the 8-4-4-4-12 form of a 32-character hex UUID string."""
+    parts = [
+        sa.func.substr(column, start, length)
+        for start, length in ((1, 8), (9, 4), (13, 4), (17, 4), (21, 12))
+    ]
+    result = parts[0]
+    for part in parts[1:]:
+        result = result + "-" + part
+    return result
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        # sa.Uuid stores 32-character hex strings on other dialects
+        for table, columns in COLUMNS:
+            t = sa.table(table, *(sa.column(c, sa.String) for c in columns))
+            op.execute(
+                t.update().values(
+                    {c: sa.func.replace(t.c[c], "-", "") for c in columns}
+                )
+            )
+        return
+
+    names = _drop_foreign_keys()
+    for table, columns in COLUMNS:
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=sa.Uuid(),
+                existing_type=sa.String(36),
+                postgresql_using=f"{column}::uuid",
+            )
+    _create_foreign_keys(names)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        for table, columns in COLUMNS:
+            t = sa.table(table, *(sa.column(c, sa.String) for c in columns))
+            op.execute(
+                t.update().values({c: _hyphenated(t.c[c]) for c in columns})
+            )
+        return
+
+    names = _drop_foreign_keys()
+    for table, columns in reversed(COLUMNS):
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=sa.String(36),
+                existing_type=sa.Uuid(),
+                postgresql_using=f"{column}::text",
+            )
+    _create_foreign_keys(names)
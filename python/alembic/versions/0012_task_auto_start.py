@@ -0,0 +1,43 @@
+"""Persist task auto_start and notify only for auto-start tasks
+
+Revision ID: 0012_task_auto_start
+Revises: 0011_native_uuid_keys
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0012_task_auto_start'
+down_revision = '0011_native_uuid_keys'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "task",
+        sa.Column("auto_start", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS task_inserted_notify ON task")
+    op.execute(
+        "CREATE TRIGGER task_inserted_notify AFTER INSERT ON task "
+        "FOR EACH ROW WHEN (NEW.auto_start) EXECUTE FUNCTION notify_task_inserted()"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS task_inserted_notify ON task")
+        op.execute(
+            "CREATE TRIGGER task_inserted_notify AFTER INSERT ON task "
+            "FOR EACH ROW EXECUTE FUNCTION notify_task_inserted()"
+        )
+
+    op.drop_column("task", "auto_start")
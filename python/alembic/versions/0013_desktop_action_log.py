@@ -0,0 +1,63 @@
+"""Create the desktop action log table
+
+Revision ID: 0013_desktop_action_log
+Revises: 0012_task_auto_start
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0013_desktop_action_log'
+down_revision = '0012_task_auto_start'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "desktop_action_log",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("action_id", sa.Uuid(), nullable=False),
+        sa.Column("action_type", sa.String(50), nullable=False),
+        sa.Column("parameters_json", sa.Text(), nullable=False),
+        sa.Column("response_json", sa.Text(), nullable=True),
+        sa.Column("executed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("task_id", sa.Uuid(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["task_id"], ["task.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        # Databases set up with create_all may already have the table
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_desktop_action_log_action_id",
+        "desktop_action_log",
+        ["action_id"],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_desktop_action_log_task_id",
+        "desktop_action_log",
+        ["task_id"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_desktop_action_log_task_id", table_name="desktop_action_log")
+    op.drop_index("ix_desktop_action_log_action_id", table_name="desktop_action_log")
+    op.drop_table("desktop_action_log")
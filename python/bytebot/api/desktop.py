@@ -2,7 +2,7 @@
 
 import asyncio
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -71,6 +71,8 @@ class DesktopActionSequenceRequest(BaseModel):
     actions: List[DesktopActionRequest]
     stop_on_error: bool = True
     delay_between_actions: float = Field(default=0.1, ge=0.0, le=5.0)
+    pacing: Literal["rate", "gap"] = "rate"
+    concurrency: int = Field(default=1, ge=1, le=16)
     task_id: Optional[UUID] = None
 
 
@@ -227,9 +229,16 @@ async def execute_desktop_action_sequence(
             task_id=request.task_id,
             stop_on_error=request.stop_on_error,
             delay_between_actions=request.delay_between_actions,
+            pacing=request.pacing,
+            concurrency=request.concurrency,
             db=db,
         )
         return responses
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     except Exception as e:
         logger.error(f"Desktop action sequence execution failed: {e}")
         raise HTTPException(
@@ -12,6 +12,8 @@ from ..core.config import settings
 from ..core.database import init_database, close_database
 from ..core.logging import get_logger
 from ..core.exceptions import BytebotException, HTTP_EXCEPTION_MAP
+from ..desktop import desktop_service
+from ..services.agent_service import TaskListener
 from ..websocket import websocket_manager, websocket_router
 from .v1 import api_router
 from .desktop import router as desktop_router
@@ -32,11 +34,24 @@ async def lifespan(app: FastAPI):
     await websocket_manager.start()
     logger.info("WebSocket manager started")
     
+    # Start processing inserted tasks as they are announced
+    task_listener = None
+    if settings.task_listener_enabled:
+        task_listener = TaskListener(settings.task_listener_poll_seconds)
+        await task_listener.start()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down Bytebot Agent service...")
     
+    if task_listener is not None:
+        await task_listener.stop()
+    
+    # Write out buffered desktop actions while the database is still open
+    await desktop_service.close()
+    logger.info("Desktop service closed")
+    
     # Stop WebSocket manager
     await websocket_manager.stop()
     logger.info("WebSocket manager stopped")
@@ -3,11 +3,13 @@
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...core.config import settings
 from ...core.database import get_db_session
 from ...core.logging import get_logger
+from ...schemas._fast import encode_message_list
 from ...schemas.message import (
     MessageCreate,
     MessageUpdate,
@@ -41,11 +43,16 @@ async def list_messages(
         search=search,
     )
     
-    return MessageListResponse(
-        messages=[MessageResponse.model_validate(message) for message in messages],
-        total=total,
-        skip=skip,
-        limit=limit,
+    if settings.fast_list_responses:
+        return Response(
+            content=encode_message_list(messages, total, skip, limit),
+            media_type="application/json",
+        )
+    
+    response = MessageListResponse.build(messages, total, skip, limit)
+    return Response(
+        content=response.to_json_bytes(),
+        media_type="application/json",
     )
 
 
@@ -61,7 +68,10 @@ async def get_message(
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
     
-    return MessageResponse.model_validate(message)
+    return Response(
+        content=MessageResponse.from_row(message).to_json_bytes(),
+        media_type="application/json",
+    )
 
 
 @router.put("/{message_id}", response_model=MessageResponse)
@@ -77,7 +87,10 @@ async def update_message(
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
     
-    return MessageResponse.model_validate(message)
+    return Response(
+        content=MessageResponse.from_row(message).to_json_bytes(),
+        media_type="application/json",
+    )
 
 
 @router.delete("/{message_id}")
@@ -136,10 +149,12 @@ async def get_message_text(
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
     
+    text_content = message.text_content
+    
     return {
         "message_id": str(message_id),
-        "text_content": message.text_content,
-        "word_count": len(message.text_content.split()) if message.text_content else 0,
+        "text_content": text_content,
+        "word_count": len(text_content.split()),
     }
 
 
@@ -23,7 +23,7 @@ async def get_available_models(
     """Get list of available AI models."""
     model_service = ModelService(db)
     
-    models = await model_service.get_available_models(
+    models = model_service.get_available_models(
         provider=provider,
         model_type=model_type,
     )
@@ -129,7 +129,7 @@ async def get_model_limits(
     """Get model limits and constraints."""
     model_service = ModelService(db)
     
-    limits = await model_service.get_model_limits(model_name=model_name)
+    limits = model_service.get_model_limits(model_name=model_name)
     
     return {
         "limits": limits,
@@ -146,7 +146,7 @@ async def get_model_capabilities(
     """Get model capabilities and features."""
     model_service = ModelService(db)
     
-    capabilities = await model_service.get_model_capabilities(
+    capabilities = model_service.get_model_capabilities(
         model_name=model_name,
         capability=capability,
     )
@@ -3,11 +3,13 @@
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...core.config import settings
 from ...core.database import get_db_session
 from ...core.logging import get_logger
+from ...schemas._fast import encode_summary_list
 from ...schemas.summary import (
     SummaryCreate,
     SummaryUpdate,
@@ -43,11 +45,16 @@ async def list_summaries(
         search=search,
     )
     
-    return SummaryListResponse(
-        summaries=[SummaryResponse.model_validate(summary) for summary in summaries],
-        total=total,
-        skip=skip,
-        limit=limit,
+    if settings.fast_list_responses:
+        return Response(
+            content=encode_summary_list(summaries, total, skip, limit),
+            media_type="application/json",
+        )
+    
+    response = SummaryListResponse.build(summaries, total, skip, limit)
+    return Response(
+        content=response.to_json_bytes(),
+        media_type="application/json",
     )
 
 
@@ -60,7 +67,10 @@ async def create_summary(
     summary_service = SummaryService(db)
     
     summary = await summary_service.create_summary(summary_data)
-    return SummaryResponse.model_validate(summary)
+    return Response(
+        content=SummaryResponse.from_row(summary).to_json_bytes(),
+        media_type="application/json",
+    )
 
 
 @router.get("/{summary_id}", response_model=SummaryResponse)
@@ -75,7 +85,10 @@ async def get_summary(
     if not summary:
         raise HTTPException(status_code=404, detail="Summary not found")
     
-    return SummaryResponse.model_validate(summary)
+    return Response(
+        content=SummaryResponse.from_row(summary).to_json_bytes(),
+        media_type="application/json",
+    )
 
 
 @router.put("/{summary_id}", response_model=SummaryResponse)
@@ -91,7 +104,10 @@ async def update_summary(
     if not summary:
         raise HTTPException(status_code=404, detail="Summary not found")
     
-    return SummaryResponse.model_validate(summary)
+    return Response(
+        content=SummaryResponse.from_row(summary).to_json_bytes(),
+        media_type="application/json",
+    )
 
 
 @router.delete("/{summary_id}")
@@ -265,9 +281,14 @@ async def get_task_summaries(
         summary_type=summary_type,
     )
     
-    return SummaryListResponse(
-        summaries=[SummaryResponse.model_validate(summary) for summary in summaries],
-        total=total,
-        skip=skip,
-        limit=limit,
+    if settings.fast_list_responses:
+        return Response(
+            content=encode_summary_list(summaries, total, skip, limit),
+            media_type="application/json",
+        )
+    
+    response = SummaryListResponse.build(summaries, total, skip, limit)
+    return Response(
+        content=response.to_json_bytes(),
+        media_type="application/json",
     )
\ No newline at end of file
@@ -3,31 +3,40 @@
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...core.config import settings
 from ...core.database import get_db_session
 from ...core.logging import get_logger
+from ...schemas._fast import encode_task_list
 from ...schemas.task import (
     TaskCreate,
     TaskUpdate,
     TaskResponse,
     TaskListResponse,
     TaskWithMessages,
+    set_response_time,
 )
-from ...schemas.message import MessageCreate, MessageResponse
+from ...schemas.message import MESSAGE_LIST_ADAPTER, MessageCreate, MessageResponse
 from ...services.task_service import TaskService
 from ...services.agent_service import AgentService
 from ...shared.task_types import TaskStatus, TaskPriority, TaskType
 
 logger = get_logger(__name__)
-router = APIRouter()
+
+
+async def _stamp_request_time() -> None:
+    """Read the clock once per request for the task durations it returns."""
+    set_response_time()
+
+
+router = APIRouter(dependencies=[Depends(_stamp_request_time)])
 
 
 @router.post("/", response_model=TaskResponse)
 async def create_task(
     task_data: TaskCreate,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db_session),
 ) -> TaskResponse:
     """Create a new task."""
@@ -41,12 +50,12 @@ async def create_task(
     
     # Start task processing in background if auto_start is True
     if task_data.auto_start:
-        background_tasks.add_task(
-            agent_service.process_task,
-            task.id
-        )
+        agent_service.start_processing(task.id)
     
-    return TaskResponse.model_validate(task)
+    return Response(
+        content=TaskResponse.from_row(task).to_json_bytes(),
+        media_type="application/json",
+    )
 
 
 @router.get("/", response_model=TaskListResponse)
@@ -71,11 +80,16 @@ async def list_tasks(
         search=search,
     )
     
-    return TaskListResponse(
-        tasks=[TaskResponse.model_validate(task) for task in tasks],
-        total=total,
-        skip=skip,
-        limit=limit,
+    if settings.fast_list_responses:
+        return Response(
+            content=encode_task_list(tasks, total, skip, limit),
+            media_type="application/json",
+        )
+    
+    response = TaskListResponse.build(tasks, total, skip, limit)
+    return Response(
+        content=response.to_json_bytes(),
+        media_type="application/json",
     )
 
 
@@ -92,7 +106,16 @@ async def get_task(
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    return TaskWithMessages.model_validate(task)
+    # Without include_messages the message rows are loaded without content
+    if include_messages:
+        response = TaskWithMessages.from_row(task)
+    else:
+        response = TaskWithMessages.from_task_row(task)
+    
+    return Response(
+        content=response.to_json_bytes(),
+        media_type="application/json",
+    )
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
@@ -108,7 +131,10 @@ async def update_task(
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    return TaskResponse.model_validate(task)
+    return Response(
+        content=TaskResponse.from_row(task).to_json_bytes(),
+        media_type="application/json",
+    )
 
 
 @router.delete("/{task_id}")
@@ -129,7 +155,6 @@ async def delete_task(
 @router.post("/{task_id}/start")
 async def start_task(
     task_id: UUID,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db_session),
 ) -> dict:
     """Start task execution."""
@@ -148,10 +173,7 @@ async def start_task(
         )
     
     # Start task processing in background
-    background_tasks.add_task(
-        agent_service.process_task,
-        task_id
-    )
+    agent_service.start_processing(task_id)
     
     return {"message": "Task started successfully"}
 
@@ -174,7 +196,6 @@ async def pause_task(
 @router.post("/{task_id}/resume")
 async def resume_task(
     task_id: UUID,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db_session),
 ) -> dict:
     """Resume task execution."""
@@ -193,10 +214,7 @@ async def resume_task(
         )
     
     # Resume task processing in background
-    background_tasks.add_task(
-        agent_service.process_task,
-        task_id
-    )
+    agent_service.start_processing(task_id)
     
     return {"message": "Task resumed successfully"}
 
@@ -213,6 +231,9 @@ async def cancel_task(
     if not success:
         raise HTTPException(status_code=404, detail="Task not found")
     
+    # Stop a processing run started by this process, if any
+    await AgentService(db).cancel_task_processing(task_id)
+    
     return {"message": "Task cancelled successfully"}
 
 
@@ -220,30 +241,24 @@ async def cancel_task(
 async def add_task_message(
     task_id: UUID,
     message_data: MessageCreate,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db_session),
 ) -> MessageResponse:
     """Add a message to a task."""
     task_service = TaskService(db)
-    agent_service = AgentService(db)
     
     # Check if task exists
     task = await task_service.get_task(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    # Add message to task
+    # Add message to task; a running task is already being processed, and
+    # processing only claims pending or paused tasks
     message = await task_service.add_message(task_id, message_data)
     
-    # If this is a user message and task is running, continue processing
-    if (message_data.role.value == "user" and 
-        task.status == TaskStatus.RUNNING):
-        background_tasks.add_task(
-            agent_service.process_task,
-            task_id
-        )
-    
-    return MessageResponse.model_validate(message)
+    return Response(
+        content=MessageResponse.from_row(message).to_json_bytes(),
+        media_type="application/json",
+    )
 
 
 @router.get("/{task_id}/messages", response_model=List[MessageResponse])
@@ -263,7 +278,10 @@ async def get_task_messages(
     
     messages = await task_service.get_messages(task_id, skip=skip, limit=limit)
     
-    return [MessageResponse.model_validate(message) for message in messages]
+    return Response(
+        content=MESSAGE_LIST_ADAPTER.dump_json([MessageResponse.from_row(message) for message in messages]),
+        media_type="application/json",
+    )
 
 
 @router.get("/{task_id}/status")
@@ -1,8 +1,9 @@
 """Database connection and session management."""
 
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, Optional
 
+import orjson
 from sqlalchemy import event, pool
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -18,6 +19,11 @@ from .logging import get_logger
 logger = get_logger(__name__)
 
 
+def _json_serializer(value: Any) -> str:
+    """Serialize JSON column values with orjson."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 class Base(DeclarativeBase):
     """Base class for all database models."""
     pass
@@ -47,6 +53,13 @@ class DatabaseManager:
             "pool_recycle": 3600,  # 1 hour
             "pool_size": 10,
             "max_overflow": 20,
+            # Batch executemany INSERTs (ORM flushes, insert(Model) with a
+            # list of rows) into multi-row VALUES statements
+            "use_insertmanyvalues": True,
+            "insertmanyvalues_page_size": settings.database_insert_page_size,
+            # JSON columns (message content, metadata) go through orjson
+            "json_serializer": _json_serializer,
+            "json_deserializer": orjson.loads,
             # Async engines use AsyncAdaptedQueuePool by default, no need to specify poolclass
         }
         
@@ -1,9 +1,13 @@
 """Logging configuration for the application."""
 
+import atexit
+import copy
 import json
 import logging
+import logging.handlers
+import queue
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
 from pythonjsonlogger import jsonlogger
@@ -11,6 +15,30 @@ from pythonjsonlogger import jsonlogger
 from .config import settings
 
 
+class _ThreadQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler for a listener thread in the same process.
+    
+    Arguments are merged into the message up front so later mutation of
+    them cannot change the output, but ``exc_info`` is kept for the
+    formatter instead of being flattened into the message.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# Background thread that formats and writes records handed off by callers
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _record_time(record: logging.LogRecord) -> datetime:
+    """Get the UTC time at which a record was created."""
+    return datetime.fromtimestamp(record.created, timezone.utc)
+
+
 class CustomJSONFormatter(jsonlogger.JsonFormatter):
     """Custom JSON formatter with additional fields."""
 
@@ -23,8 +51,9 @@ class CustomJSONFormatter(jsonlogger.JsonFormatter):
         """Add custom fields to log record."""
         super().add_fields(log_record, record, message_dict)
         
-        # Add timestamp
-        log_record["timestamp"] = datetime.utcnow().isoformat() + "Z"
+        # Add timestamp of the logging call; formatting runs later on the
+        # queue listener thread
+        log_record["timestamp"] = _record_time(record).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
         
         # Add service information
         log_record["service"] = "bytebot"
@@ -54,8 +83,8 @@ class CustomTextFormatter(logging.Formatter):
 
     def format(self, record: logging.LogRecord) -> str:
         """Format log record with colors."""
-        # Add timestamp
-        timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        # Add timestamp of the logging call
+        timestamp = _record_time(record).strftime("%Y-%m-%d %H:%M:%S")
         
         # Add color if terminal supports it
         level_color = self.COLORS.get(record.levelname, "")
@@ -100,7 +129,18 @@ def setup_logging() -> None:
         formatter = CustomTextFormatter()
     
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    
+    # Callers only enqueue records; formatting and the stdout write happen on
+    # the listener thread, off the request path
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root_logger.addHandler(_ThreadQueueHandler(log_queue))
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, console_handler, respect_handler_level=True
+    )
+    _queue_listener.start()
     
     # Configure specific loggers
     configure_third_party_loggers()
@@ -190,4 +230,5 @@ class LogContext:
 
 
 # Initialize logging on module import
-setup_logging()
\ No newline at end of file
+setup_logging()
+atexit.register(lambda: _queue_listener and _queue_listener.stop())
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""Numeric kernels for screen recording frame processing.
+
+The kernels are JIT-compiled with Numba when it is installed (the
+``recording`` extra) and fall back to vectorized NumPy otherwise.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # pragma: no cover - exercised only without numba
+    njit = None
+
+
+def _frame_diff_score_numpy(prev: np.ndarray, cur: np.ndarray) -> float:
+    """Mean absolute RGB difference between two RGBA frames (0-255)."""
+    diff = np.abs(cur[..., :3].astype(np.int16) - prev[..., :3].astype(np.int16))
+    return float(diff.mean())
+
+
+if njit is not None:
+
+    @njit(
+        "float64(uint8[:, :, ::1], uint8[:, :, ::1])",
+        parallel=True,
+        fastmath=True,
+        cache=True,
+    )
+    def _frame_diff_score_numba(prev, cur):  # pragma: no cover - compiled
+        height, width = cur.shape[0], cur.shape[1]
+        total = 0
+        for y in prange(height):
+            row = 0
+            for x in range(width):
+                for c in range(3):
+                    row += abs(np.int32(cur[y, x, c]) - np.int32(prev[y, x, c]))
+            total += row
+        return total / (height * width * 3)
+
+    def frame_diff_score(prev: np.ndarray, cur: np.ndarray) -> float:
+        """Mean absolute RGB difference between two RGBA frames (0-255)."""
+        return _frame_diff_score_numba(
+            np.ascontiguousarray(prev),
+            np.ascontiguousarray(cur),
+        )
+
+else:
+    frame_diff_score = _frame_diff_score_numpy
@@ -5,6 +5,7 @@ import base64
 import json
 import subprocess
 from datetime import datetime
+from functools import cached_property
 from io import BytesIO
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
@@ -652,16 +653,16 @@ class DesktopClient:
         """Test desktop connection."""
         try:
             result = await self._run_command(["xdpyinfo", "-display", self.display or ":0"])
-            return result.returncode == 0
+            self.is_connected = result.returncode == 0
         except Exception:
-            return False
+            self.is_connected = False
+        return self.is_connected
     
-    def get_capabilities(self) -> Dict[str, Any]:
-        """Get desktop client capabilities."""
+    @cached_property
+    def _static_capabilities(self) -> Dict[str, Any]:
+        """Capabilities that don't change at runtime, probed once."""
         return {
             "platform": "linux",
-            "display": self.display,
-            "connected": self.is_connected,
             "supported_actions": [action.value for action in DesktopActionType],
             "tools": {
                 "xdotool": self._check_tool("xdotool"),
@@ -672,6 +673,18 @@ class DesktopClient:
             },
         }
     
+    def get_capabilities(self) -> Dict[str, Any]:
+        """Get desktop client capabilities."""
+        return {
+            **self._static_capabilities,
+            "display": self.display,
+            "connected": self.is_connected,
+        }
+    
+    def invalidate_capabilities(self):
+        """Drop cached capabilities so tools are probed again on next use."""
+        self.__dict__.pop("_static_capabilities", None)
+    
     def _check_tool(self, tool_name: str) -> bool:
         """Check if a tool is available."""
         try:
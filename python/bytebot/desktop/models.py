@@ -1,8 +1,9 @@
 """Desktop control models and data structures."""
 
 import base64
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
+from functools import cached_property
 from typing import Any, Dict, List, Optional, Tuple, Union
 from uuid import UUID, uuid4
 
@@ -248,6 +249,19 @@ class DesktopAction(BaseModel):
     # Additional parameters
     parameters: Dict[str, Any] = Field(default_factory=dict, description="Additional parameters")
     
+    @cached_property
+    def type_value(self) -> str:
+        """Action type as a plain string, computed once per action."""
+        return self.type.value
+    
+    @cached_property
+    def iso_timestamp(self) -> str:
+        """ISO 8601 timestamp (naive values treated as UTC), computed once per action."""
+        timestamp = self.timestamp
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return timestamp.isoformat()
+    
     def get_mouse_event(self) -> Optional[MouseEvent]:
         """Get mouse event data if applicable."""
         if self.type in [
@@ -366,8 +380,4 @@ class DesktopResponse(BaseModel):
             error=error,
             data=data or {},
             **kwargs,
-        )
-
-
-# Update forward references
-DesktopWindow.model_rebuild()
\ No newline at end of file
+        )
\ No newline at end of file
@@ -2,17 +2,22 @@
 
 import asyncio
 import json
+from bisect import bisect_left, bisect_right
+from collections import Counter, deque
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Deque, Dict, List, Literal, Optional, Tuple
 from uuid import UUID, uuid4
 
-from sqlalchemy import and_, desc, func, select
+import numpy as np
+from sqlalchemy import and_, desc, func, insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..core.database import get_db_session
+from ..core.database import db_manager, get_db_session
 from ..core.logging import get_logger
-from ..models import Task
-from ..websocket.router import notify_desktop_action
+from ..models import DesktopActionLog, Task
+from ..websocket.router import notify_desktop_action, notify_desktop_event
+from ._recording_kernels import frame_diff_score
 from .client import DesktopClient
 from .models import (
     DesktopAction,
@@ -28,16 +33,121 @@ from .models import (
 
 logger = get_logger(__name__)
 
+# Number of frames kept per recording before the ring buffer wraps
+DEFAULT_RECORDING_MAX_FRAMES = 300
+
+# Response fields persisted alongside each desktop action
+_RESPONSE_LOG_FIELDS = {"success", "message", "error", "execution_time"}
+
+# Upper bound on queued notifications per task; beyond it the oldest "started"
+# notification is dropped, while terminal ones are always delivered
+MAX_PENDING_NOTIFICATIONS = 256
+
+# Notification statuses that end an action and are never dropped
+TERMINAL_NOTIFICATION_STATUSES = frozenset({"completed", "failed", "error"})
+
+# Action types that only read desktop state, so they may run concurrently
+READ_ONLY_ACTION_TYPES = frozenset({
+    DesktopActionType.SCREENSHOT,
+    DesktopActionType.CLIPBOARD_GET,
+    DesktopActionType.WAIT,
+    DesktopActionType.WAIT_FOR_ELEMENT,
+    DesktopActionType.WAIT_FOR_WINDOW,
+})
+
+# Desktop action log rows are inserted in batches of this size, or after this many seconds
+DB_FLUSH_BATCH_SIZE = 100
+DB_FLUSH_INTERVAL = 0.25
+
+# Rows kept for a retry after a failed flush, and the delay before retrying
+DB_FLUSH_MAX_BUFFERED = 10_000
+DB_FLUSH_RETRY_DELAY = 5.0
+
 
 class DesktopService:
     """High-level desktop service for automation and control."""
     
     def __init__(self):
         self.client = DesktopClient()
+        # Kept sorted by action timestamp, with a parallel list of timestamps for bisection
         self.action_history: List[DesktopAction] = []
+        self._action_timestamps: List[datetime] = []
         self.event_history: List[DesktopEvent] = []
         self.active_recordings: Dict[UUID, Dict[str, Any]] = {}
         self.automation_scripts: Dict[str, List[DesktopAction]] = {}
+        # Per-task notification queues, each drained in order by one sender task
+        self._notify_queues: Dict[UUID, Deque[Dict[str, Any]]] = {}
+        self._notify_senders: Dict[UUID, asyncio.Task] = {}
+        # Desktop action log rows waiting for the next bulk insert
+        self._db_flush_buffer: List[Dict[str, Any]] = []
+        self._db_flush_lock = asyncio.Lock()
+        self._db_flush_task: Optional[asyncio.Task] = None
+    
+    def _notify_action(self, task_id: UUID, action_data: Dict[str, Any]) -> None:
+        """Queue a desktop action notification without blocking the caller."""
+        queue = self._notify_queues.setdefault(task_id, deque())
+        
+        if len(queue) >= MAX_PENDING_NOTIFICATIONS:
+            for index, queued in enumerate(queue):
+                if queued.get("status") not in TERMINAL_NOTIFICATION_STATUSES:
+                    del queue[index]
+                    logger.warning(
+                        f"Too many pending desktop notifications for task {task_id}, "
+                        f"dropping the oldest started one"
+                    )
+                    break
+        
+        queue.append(action_data)
+        
+        if task_id not in self._notify_senders:
+            self._notify_senders[task_id] = asyncio.create_task(
+                self._drain_notifications(task_id, queue)
+            )
+    
+    async def _drain_notifications(
+        self,
+        task_id: UUID,
+        queue: Deque[Dict[str, Any]],
+    ):
+        """Send a task's queued notifications one at a time, in order."""
+        try:
+            while queue:
+                await self._send_action_notification(task_id, queue.popleft())
+        finally:
+            # No await between the empty check and this cleanup, so later
+            # notifications start a new sender
+            del self._notify_senders[task_id]
+            if not queue:
+                del self._notify_queues[task_id]
+    
+    async def _send_action_notification(
+        self,
+        task_id: UUID,
+        action_data: Dict[str, Any],
+    ):
+        """Deliver a desktop action notification, logging failures."""
+        try:
+            await notify_desktop_action(task_id=str(task_id), action_data=action_data)
+        except Exception as e:
+            logger.error(f"Failed to send desktop action notification: {e}")
+    
+    async def flush_notifications(self):
+        """Wait for all queued notifications to be delivered."""
+        while self._notify_senders:
+            await asyncio.gather(*list(self._notify_senders.values()), return_exceptions=True)
+    
+    def _record_action(self, action: DesktopAction) -> None:
+        """Add an action to the history, keeping it ordered by timestamp."""
+        timestamp = action.timestamp
+        
+        if not self._action_timestamps or timestamp >= self._action_timestamps[-1]:
+            self.action_history.append(action)
+            self._action_timestamps.append(timestamp)
+        else:
+            # Re-executed actions (e.g. reused script steps) carry older timestamps
+            index = bisect_right(self._action_timestamps, timestamp)
+            self.action_history.insert(index, action)
+            self._action_timestamps.insert(index, timestamp)
     
     async def execute_action(
         self,
@@ -51,17 +161,17 @@ class DesktopService:
             logger.info(f"Executing desktop action: {action.type} (ID: {action.id})")
             
             # Add to history
-            self.action_history.append(action)
+            self._record_action(action)
             
             # Notify action started
             if notify and task_id:
-                await notify_desktop_action(
-                    task_id=str(task_id),
-                    action_data={
-                        "action_id": str(action.id),
-                        "type": action.type.value,
+                self._notify_action(
+                    task_id,
+                    {
+                        "action_id": action.id,
+                        "type": action.type_value,
                         "status": "started",
-                        "timestamp": action.timestamp.isoformat(),
+                        "timestamp": action.iso_timestamp,
                     },
                 )
             
@@ -70,21 +180,21 @@ class DesktopService:
             
             # Save to database if available
             if db and task_id:
-                await self._save_action_to_db(db, task_id, action, response)
+                await self._save_action_to_db(task_id, action, response)
             
             # Notify action completed
             if notify and task_id:
-                await notify_desktop_action(
-                    task_id=str(task_id),
-                    action_data={
-                        "action_id": str(action.id),
-                        "type": action.type.value,
+                self._notify_action(
+                    task_id,
+                    {
+                        "action_id": action.id,
+                        "type": action.type_value,
                         "status": "completed" if response.success else "failed",
                         "success": response.success,
                         "message": response.message,
                         "error": response.error,
                         "execution_time": response.execution_time,
-                        "timestamp": response.timestamp.isoformat(),
+                        "timestamp": response.timestamp,
                     },
                 )
             
@@ -105,14 +215,14 @@ class DesktopService:
             
             # Notify error
             if notify and task_id:
-                await notify_desktop_action(
-                    task_id=str(task_id),
-                    action_data={
-                        "action_id": str(action.id),
-                        "type": action.type.value,
+                self._notify_action(
+                    task_id,
+                    {
+                        "action_id": action.id,
+                        "type": action.type_value,
                         "status": "error",
                         "error": str(e),
-                        "timestamp": datetime.utcnow().isoformat(),
+                        "timestamp": action.iso_timestamp,
                     },
                 )
             
@@ -125,13 +235,55 @@ class DesktopService:
         stop_on_error: bool = True,
         delay_between_actions: float = 0.1,
         db: Optional[AsyncSession] = None,
+        pacing: Literal["rate", "gap"] = "rate",
+        concurrency: int = 1,
     ) -> List[DesktopResponse]:
-        """Execute a sequence of desktop actions."""
+        """Execute a sequence of desktop actions.
+        
+        With ``pacing="rate"`` action ``i + 1`` is scheduled at
+        ``t0 + (i + 1) * delay_between_actions`` on the loop's monotonic clock,
+        so slow actions eat into the delay instead of accumulating drift.
+        ``pacing="gap"`` waits the full delay after each action completes.
+        
+        A ``concurrency`` greater than 1 runs the actions at most
+        ``concurrency`` at a time. Concurrent actions are neither paced nor
+        stopped early, and input sent at once to one display could arrive in
+        any order, so this requires ``stop_on_error=False``, no
+        ``delay_between_actions`` and only ``READ_ONLY_ACTION_TYPES``.
+        
+        Raises:
+            ValueError: If the options are invalid or conflict
+        """
+        if pacing not in ("rate", "gap"):
+            raise ValueError(f"Invalid pacing mode: {pacing}")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        
+        if concurrency > 1:
+            if stop_on_error:
+                raise ValueError("concurrency above 1 requires stop_on_error to be False")
+            if delay_between_actions > 0:
+                raise ValueError("concurrency above 1 cannot be combined with delay_between_actions")
+            
+            ordered_types = sorted({
+                action.type_value for action in actions
+                if action.type not in READ_ONLY_ACTION_TYPES
+            })
+            if ordered_types:
+                raise ValueError(
+                    f"Only read-only actions can run concurrently, got: {', '.join(ordered_types)}"
+                )
+            
+            return await self._execute_actions_concurrently(actions, task_id, concurrency, db)
+        
         responses = []
         
         try:
             logger.info(f"Executing desktop action sequence: {len(actions)} actions")
             
+            loop = asyncio.get_running_loop()
+            start_time = loop.time()
+            
             for i, action in enumerate(actions):
                 logger.info(f"Executing action {i + 1}/{len(actions)}: {action.type}")
                 
@@ -149,9 +301,16 @@ class DesktopService:
                     logger.warning(f"Stopping action sequence due to error: {response.error}")
                     break
                 
-                # Delay between actions
+                # Wait until the next action's deadline
                 if delay_between_actions > 0 and i < len(actions) - 1:
-                    await asyncio.sleep(delay_between_actions)
+                    now = loop.time()
+                    if pacing == "rate":
+                        deadline = start_time + (i + 1) * delay_between_actions
+                    else:
+                        deadline = now + delay_between_actions
+                    
+                    if now < deadline:
+                        await asyncio.sleep(deadline - now)
             
             successful_actions = sum(1 for r in responses if r.success)
             logger.info(
@@ -164,6 +323,46 @@ class DesktopService:
             logger.error(f"Desktop action sequence failed: {e}")
             raise
     
+    async def _execute_actions_concurrently(
+        self,
+        actions: List[DesktopAction],
+        task_id: Optional[UUID],
+        concurrency: int,
+        db: Optional[AsyncSession],
+    ) -> List[DesktopResponse]:
+        """Execute independent actions with bounded concurrency, preserving order."""
+        logger.info(
+            f"Executing desktop action sequence: {len(actions)} actions "
+            f"(concurrency {concurrency})"
+        )
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def run(action: DesktopAction) -> DesktopResponse:
+            async with semaphore:
+                return await self.execute_action(
+                    action=action,
+                    task_id=task_id,
+                    notify=True,
+                    db=db,
+                )
+        
+        results = await asyncio.gather(*(run(action) for action in actions), return_exceptions=True)
+        
+        responses = [
+            result
+            if not isinstance(result, BaseException)
+            else DesktopResponse.error_response(action_id=action.id, error=str(result))
+            for action, result in zip(actions, results)
+        ]
+        
+        successful_actions = sum(1 for r in responses if r.success)
+        logger.info(
+            f"Desktop action sequence completed: {successful_actions}/{len(actions)} successful"
+        )
+        
+        return responses
+    
     # High-level action methods
     
     async def click_at_position(
@@ -371,16 +570,37 @@ class DesktopService:
         self,
         recording_id: Optional[UUID] = None,
         task_id: Optional[UUID] = None,
+        max_frames: int = DEFAULT_RECORDING_MAX_FRAMES,
+        frame_size: Optional[Tuple[int, int]] = None,
+        min_frame_diff: float = 0.0,
     ) -> UUID:
-        """Start screen recording."""
+        """Start screen recording.
+        
+        Frames are written in place into a preallocated ``(max_frames, H, W, 4)``
+        uint8 ring buffer. If ``frame_size`` (width, height) is not given, the
+        buffer is allocated from the shape of the first appended frame.
+        Frames whose mean RGB difference from the previous kept frame is below
+        ``min_frame_diff`` (0-255) are dropped.
+        """
         if recording_id is None:
             recording_id = uuid4()
         
-        # TODO: Implement actual screen recording
+        if max_frames <= 0:
+            raise ValueError("max_frames must be positive")
+        
+        buffer = None
+        if frame_size is not None:
+            width, height = frame_size
+            buffer = np.empty((max_frames, height, width, 4), dtype=np.uint8)
+        
         self.active_recordings[recording_id] = {
             "task_id": task_id,
             "start_time": datetime.utcnow(),
-            "frames": [],
+            "max_frames": max_frames,
+            "buffer": buffer,
+            "write_idx": 0,
+            "min_frame_diff": min_frame_diff,
+            "dropped_frames": 0,
         }
         
         logger.info(f"Started screen recording: {recording_id}")
@@ -397,6 +617,58 @@ class DesktopService:
         
         return recording_id
     
+    def append_frame(self, recording_id: UUID, frame: np.ndarray) -> Optional[int]:
+        """Copy an RGBA frame into the recording's ring buffer.
+        
+        Returns the slot index the frame was written to, or None if the frame
+        was dropped as too similar to the previous one. Once the buffer is
+        full the oldest frame is overwritten.
+        """
+        recording = self.active_recordings.get(recording_id)
+        if recording is None:
+            raise ValueError(f"Screen recording '{recording_id}' not found")
+        
+        buffer = recording["buffer"]
+        if buffer is None:
+            buffer = np.empty((recording["max_frames"], *frame.shape), dtype=np.uint8)
+            recording["buffer"] = buffer
+        
+        if frame.shape != buffer.shape[1:]:
+            raise ValueError(
+                f"Frame shape {frame.shape} does not match recording shape {buffer.shape[1:]}"
+            )
+        
+        write_idx = recording["write_idx"]
+        capacity = buffer.shape[0]
+        
+        if recording["min_frame_diff"] > 0 and write_idx > 0:
+            previous = buffer[(write_idx - 1) % capacity]
+            if frame_diff_score(previous, frame) < recording["min_frame_diff"]:
+                recording["dropped_frames"] += 1
+                return None
+        
+        slot = write_idx % capacity
+        np.copyto(buffer[slot], frame, casting="no")
+        recording["write_idx"] += 1
+        
+        return slot
+    
+    @staticmethod
+    def _ordered_frames(recording: Dict[str, Any]) -> Optional[np.ndarray]:
+        """Return recorded frames oldest-first."""
+        buffer = recording["buffer"]
+        if buffer is None:
+            return None
+        
+        write_idx = recording["write_idx"]
+        capacity = buffer.shape[0]
+        if write_idx <= capacity:
+            return buffer[:write_idx]
+        
+        # Buffer has wrapped: the oldest frame sits at the next write slot
+        start = write_idx % capacity
+        return np.concatenate((buffer[start:], buffer[:start]))
+    
     async def stop_screen_recording(
         self,
         recording_id: UUID,
@@ -410,6 +682,11 @@ class DesktopService:
         recording_data["duration"] = (
             recording_data["end_time"] - recording_data["start_time"]
         ).total_seconds()
+        recording_data["frames"] = self._ordered_frames(recording_data)
+        recording_data["frame_count"] = min(
+            recording_data["write_idx"], recording_data["max_frames"]
+        )
+        del recording_data["buffer"]
         
         logger.info(f"Stopped screen recording: {recording_id}")
         
@@ -420,6 +697,8 @@ class DesktopService:
                     "type": "screen_recording_stopped",
                     "recording_id": str(recording_id),
                     "duration": recording_data["duration"],
+                    "frame_count": recording_data["frame_count"],
+                    "dropped_frames": recording_data["dropped_frames"],
                     "timestamp": datetime.utcnow().isoformat(),
                 },
             )
@@ -436,6 +715,11 @@ class DesktopService:
         """Emit a desktop event."""
         self.event_history.append(event)
         
+        # Connection state is event-driven so status polling never has to probe it
+        if event.type is DesktopEventType.CONNECTION_LOST:
+            self.client.is_connected = False
+            self.client.invalidate_capabilities()
+        
         if task_id:
             await notify_desktop_event(
                 task_id=str(task_id),
@@ -453,34 +737,101 @@ class DesktopService:
     
     async def _save_action_to_db(
         self,
-        db: AsyncSession,
         task_id: UUID,
         action: DesktopAction,
         response: DesktopResponse,
     ):
-        """Save desktop action to database."""
+        """Queue a desktop action for the next bulk insert.
+        
+        Rows are buffered and written with a single executemany INSERT once
+        ``DB_FLUSH_BATCH_SIZE`` rows are queued or ``DB_FLUSH_INTERVAL`` seconds
+        have passed. The flush runs in its own session, since the caller's
+        request-scoped session may be closed by then.
+        """
         try:
-            # TODO: Create desktop action table and model
-            # For now, we'll store as task metadata or in a generic log table
+            # Serialize straight to JSON strings so the log table stores them
+            # as-is, without building intermediate dicts first
+            self._db_flush_buffer.append({
+                "task_id": task_id,
+                "action_id": action.id,
+                "action_type": action.type_value,
+                "parameters_json": action.model_dump_json(),
+                "response_json": response.model_dump_json(include=_RESPONSE_LOG_FIELDS),
+                "executed_at": action.timestamp,
+            })
             
-            action_data = {
-                "action_id": str(action.id),
-                "type": action.type.value,
-                "parameters": action.dict(),
-                "response": {
-                    "success": response.success,
-                    "message": response.message,
-                    "error": response.error,
-                    "execution_time": response.execution_time,
-                },
-                "timestamp": action.timestamp.isoformat(),
-            }
+            if len(self._db_flush_buffer) >= DB_FLUSH_BATCH_SIZE:
+                await self.flush_action_log()
+            elif self._db_flush_task is None or self._db_flush_task.done():
+                self._db_flush_task = asyncio.create_task(self._flush_action_log_later())
             
-            logger.debug(f"Desktop action saved to database: {action.id}")
+            logger.debug(f"Desktop action queued for database: {action.id}")
         
         except Exception as e:
             logger.error(f"Failed to save desktop action to database: {e}")
     
+    async def _flush_action_log_later(self, delay: float = DB_FLUSH_INTERVAL):
+        """Flush the desktop action log after the given delay."""
+        await asyncio.sleep(delay)
+        await self.flush_action_log()
+    
+    async def flush_action_log(self):
+        """Write all buffered desktop actions in one bulk insert.
+        
+        If a row violates a constraint (e.g. its task was deleted meanwhile)
+        the batch is retried row by row and only the offending rows are
+        dropped. Any other failure puts the batch back in front of the buffer
+        and schedules a retry after ``DB_FLUSH_RETRY_DELAY`` seconds.
+        """
+        async with self._db_flush_lock:
+            if not self._db_flush_buffer:
+                return
+            
+            rows, self._db_flush_buffer = self._db_flush_buffer, []
+            
+            try:
+                try:
+                    async with db_manager.get_session() as session:
+                        await session.execute(insert(DesktopActionLog), rows)
+                    saved = len(rows)
+                except IntegrityError:
+                    saved = await self._insert_action_log_rows(rows)
+                
+                logger.debug(f"Saved {saved} desktop actions to database")
+            
+            except Exception as e:
+                logger.error(f"Failed to save {len(rows)} desktop actions to database: {e}")
+                self._requeue_action_log(rows)
+    
+    async def _insert_action_log_rows(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert rows one savepoint at a time, skipping rows that are rejected."""
+        saved = 0
+        async with db_manager.get_session() as session:
+            for row in rows:
+                try:
+                    async with session.begin_nested():
+                        await session.execute(insert(DesktopActionLog), [row])
+                    saved += 1
+                except IntegrityError as e:
+                    logger.warning(
+                        f"Dropping desktop action {row['action_id']} from the log: {e.orig}"
+                    )
+        return saved
+    
+    def _requeue_action_log(self, rows: List[Dict[str, Any]]) -> None:
+        """Put unsaved rows back ahead of newer ones and schedule a retry."""
+        self._db_flush_buffer[:0] = rows
+        overflow = len(self._db_flush_buffer) - DB_FLUSH_MAX_BUFFERED
+        if overflow > 0:
+            del self._db_flush_buffer[:overflow]
+            logger.warning(f"Desktop action log buffer full, dropped {overflow} oldest actions")
+        
+        pending = self._db_flush_task
+        if pending is None or pending.done() or pending is asyncio.current_task():
+            self._db_flush_task = asyncio.create_task(
+                self._flush_action_log_later(DB_FLUSH_RETRY_DELAY)
+            )
+    
     # Statistics and monitoring
     
     async def get_action_statistics(
@@ -490,28 +841,16 @@ class DesktopService:
         end_date: Optional[datetime] = None,
     ) -> Dict[str, Any]:
         """Get desktop action statistics."""
-        # Filter actions by criteria
-        filtered_actions = self.action_history
-        
-        if start_date:
-            filtered_actions = [
-                action for action in filtered_actions
-                if action.timestamp >= start_date
-            ]
-        
-        if end_date:
-            filtered_actions = [
-                action for action in filtered_actions
-                if action.timestamp <= end_date
-            ]
+        # History is sorted by timestamp, so the date window is found by bisection
+        timestamps = self._action_timestamps
+        lo = bisect_left(timestamps, start_date) if start_date else 0
+        hi = bisect_right(timestamps, end_date) if end_date else len(timestamps)
         
         # Calculate statistics
-        total_actions = len(filtered_actions)
-        actions_by_type = {}
-        
-        for action in filtered_actions:
-            action_type = action.type.value
-            actions_by_type[action_type] = actions_by_type.get(action_type, 0) + 1
+        total_actions = max(hi - lo, 0)
+        actions_by_type = dict(
+            Counter(action.type_value for action in self.action_history[lo:hi])
+        )
         
         return {
             "total_actions": total_actions,
@@ -540,14 +879,15 @@ class DesktopService:
     
     async def cleanup_old_history(self, max_age_hours: int = 24):
         """Clean up old action and event history."""
+        await self.flush_notifications()
+        
         cutoff_time = datetime.utcnow() - timedelta(hours=max_age_hours)
         
-        # Clean action history
+        # Clean action history (sorted by timestamp, so drop a prefix)
         old_action_count = len(self.action_history)
-        self.action_history = [
-            action for action in self.action_history
-            if action.timestamp > cutoff_time
-        ]
+        cutoff_index = bisect_right(self._action_timestamps, cutoff_time)
+        del self.action_history[:cutoff_index]
+        del self._action_timestamps[:cutoff_index]
         
         # Clean event history
         old_event_count = len(self.event_history)
@@ -578,6 +918,24 @@ class DesktopService:
             await self.stop_screen_recording(recording_id)
         
         logger.info(f"Stopped {len(recording_ids)} active recordings")
+        
+        await self.flush_notifications()
+        await self.flush_action_log()
+    
+    async def close(self):
+        """Deliver pending notifications and write out the action log buffer."""
+        await self.flush_notifications()
+        await self.flush_action_log()
+        
+        # Nothing is left for a scheduled flush or retry to write
+        pending = self._db_flush_task
+        if pending is not None and not pending.done():
+            pending.cancel()
+        
+        if self._db_flush_buffer:
+            logger.error(
+                f"Shutting down with {len(self._db_flush_buffer)} desktop actions not saved"
+            )
 
 
 # Global desktop service instance
@@ -7,10 +7,12 @@ from .base import Base
 from .task import Task
 from .message import Message
 from .summary import Summary
+from .desktop_action import DesktopActionLog
 
 __all__ = [
     "Base",
     "Task",
     "Message", 
     "Summary",
+    "DesktopActionLog",
 ]
\ No newline at end of file
@@ -1,9 +1,11 @@
 """Base model class with common fields and methods."""
 
-from datetime import datetime
-from typing import Any, Dict, Optional
+import uuid
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, ClassVar, Dict, Mapping, Optional, Type
 
-from sqlalchemy import DateTime, String, func
+from sqlalchemy import DateTime, SmallInteger, TypeDecorator, Uuid, func, inspect
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -11,6 +13,24 @@ from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 class Base(DeclarativeBase):
     """Base class for all database models."""
     
+    # Fetch server-generated values (updated_at, generated columns) with
+    # INSERT/UPDATE ... RETURNING so flushed objects never need a refresh
+    __mapper_args__ = {"eager_defaults": True}
+    
+    # Column shown by __repr__, resolved once per mapped class
+    _repr_attr: ClassVar[Optional[str]] = None
+    
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Pick the identifying column for __repr__ once the class is mapped."""
+        super().__init_subclass__(**kwargs)
+        
+        table = cls.__dict__.get("__table__")
+        if table is not None:
+            cls._repr_attr = next(
+                (attr for attr in ('id', 'uuid', 'name', 'title') if attr in table.c),
+                None,
+            )
+    
     # Generate table name automatically from class name
     @declared_attr
     def __tablename__(cls) -> str:
@@ -35,9 +55,11 @@ class Base(DeclarativeBase):
         for column in self.__table__.columns:
             if column.name not in exclude:
                 value = getattr(self, column.name)
-                # Convert datetime objects to ISO format strings
+                # Convert datetime and UUID objects to strings
                 if isinstance(value, datetime):
                     value = value.isoformat()
+                elif isinstance(value, uuid.UUID):
+                    value = str(value)
                 result[column.name] = value
         
         return result
@@ -58,20 +80,58 @@ class Base(DeclarativeBase):
     def __repr__(self) -> str:
         """String representation of the model."""
         class_name = self.__class__.__name__
+        repr_attr = self._repr_attr
+        
+        if repr_attr is None:
+            return f"<{class_name}>"
         
-        # Try to get an ID field for representation
-        id_value = None
-        for attr in ['id', 'uuid', 'name', 'title']:
-            if hasattr(self, attr):
-                id_value = getattr(self, attr)
-                break
+        # Don't trigger a lazy load (or a DetachedInstanceError) just to render a repr
+        state = inspect(self)
+        if state.has_identity and repr_attr in state.unloaded:
+            return f"<{class_name}({repr_attr}=?)>"
         
+        id_value = getattr(self, repr_attr)
         if id_value is not None:
             return f"<{class_name}({id_value})>"
         else:
             return f"<{class_name}>"
 
 
+class SmallIntEnum(TypeDecorator):
+    """Enum column stored as a SMALLINT code.
+    
+    Translation is a plain dict lookup in each direction, using the stable
+    code tables from ``shared.task_types``.
+    """
+    
+    impl = SmallInteger
+    cache_ok = True
+    
+    def __init__(self, enum_class: Type[Enum], codes: Mapping[Enum, int]):
+        """Initialize the type.
+        
+        Args:
+            enum_class: Python enum stored in the column
+            codes: Integer code for every member of ``enum_class``
+        """
+        super().__init__()
+        self.enum_class = enum_class
+        self._to_code = dict(codes)
+        self._from_code = {code: member for member, code in codes.items()}
+    
+    def process_bind_param(self, value: Any, dialect: Any) -> Optional[int]:
+        """Convert an enum member (or its value) to its code."""
+        if value is None:
+            return None
+        return self._to_code[value]
+    
+    def process_result_value(self, value: Optional[int], dialect: Any) -> Optional[Enum]:
+        """Convert a stored code back to its enum member."""
+        if value is None:
+            return None
+        return self._from_code[value]
+
+
 class TimestampMixin:
     """Mixin for models that need created_at and updated_at timestamps."""
     
@@ -108,7 +168,7 @@ class SoftDeleteMixin:
     
     def soft_delete(self) -> None:
         """Mark the record as soft deleted."""
-        self.deleted_at = datetime.utcnow()
+        self.deleted_at = datetime.now(timezone.utc)
     
     def restore(self) -> None:
         """Restore a soft deleted record."""
@@ -116,17 +176,15 @@ class SoftDeleteMixin:
 
 
 class UUIDMixin:
-    """Mixin for models that use UUID as primary key."""
+    """Mixin for models that use UUID as primary key.
+    
+    Uses the native ``UUID`` type on PostgreSQL and a 32-character hex string
+    elsewhere (e.g. SQLite).
+    """
     
-    id: Mapped[str] = mapped_column(
-        String(36),
+    id: Mapped[uuid.UUID] = mapped_column(
+        Uuid,
         primary_key=True,
+        default=uuid.uuid4,
         doc="UUID primary key"
-    )
-    
-    def __init__(self, **kwargs):
-        """Initialize with UUID if not provided."""
-        if 'id' not in kwargs:
-            import uuid
-            kwargs['id'] = str(uuid.uuid4())
-        super().__init__(**kwargs)
\ No newline at end of file
+    )
\ No newline at end of file
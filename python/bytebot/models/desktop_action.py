@@ -0,0 +1,61 @@
+"""Desktop action log model for database operations."""
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import DateTime, ForeignKey, String, Text, Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base, TimestampMixin, UUIDMixin
+
+
+class DesktopActionLog(Base, UUIDMixin, TimestampMixin):
+    """Log entry for a desktop action executed on behalf of a task.
+    
+    Rows are written in batches by the desktop service, so the model carries
+    no relationships and stores its payloads as pre-serialized JSON text.
+    """
+    
+    action_id: Mapped[UUID] = mapped_column(
+        Uuid,
+        nullable=False,
+        index=True,
+        doc="ID of the executed desktop action"
+    )
+    
+    action_type: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False,
+        doc="Desktop action type"
+    )
+    
+    parameters_json: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+        doc="Serialized action parameters"
+    )
+    
+    response_json: Mapped[Optional[str]] = mapped_column(
+        Text,
+        nullable=True,
+        doc="Serialized action response summary"
+    )
+    
+    executed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        doc="Timestamp when the action was issued"
+    )
+    
+    task_id: Mapped[UUID] = mapped_column(
+        Uuid,
+        ForeignKey("task.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+        doc="ID of the associated task"
+    )
+    
+    def __repr__(self) -> str:
+        """String representation of the desktop action log entry."""
+        return f"<DesktopActionLog({self.id}): {self.action_type}>"
\ No newline at end of file
@@ -1,32 +1,199 @@
-"""Message model for database operations."""
+"""Message model for database operations.
 
-from typing import List, Optional
+Bulk ingest relies on the engine's ``insertmanyvalues`` batching (configured
+in ``core.database``): ORM flushes of many messages and ``insert(Message)``
+with a list of rows are sent as multi-row INSERT statements.
+"""
 
-from sqlalchemy import JSON, String, Text, ForeignKey, Enum as SQLEnum
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from datetime import datetime, timezone
+from itertools import islice
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID, uuid4
 
-from ..shared.task_types import Role
+import orjson
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Computed,
+    Integer,
+    String,
+    Text,
+    ForeignKey,
+    Index,
+    DDL,
+    Uuid,
+    cast,
+    event,
+    insert,
+    literal,
+    select,
+    text,
+    update,
+    type_coerce,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
+from sqlalchemy.sql.expression import ColumnElement
+from sqlalchemy.sql.visitors import InternalTraversal
+
+from ..shared.task_types import ROLE_CODES, Role
 from ..shared.message_content import MessageContentBlock
-from .base import Base, TimestampMixin, UUIDMixin
+from .base import Base, SmallIntEnum, TimestampMixin, UUIDMixin
+
+
+# String values of Role, looked up instead of reading .value
+_ROLE_STRINGS = {role: role.value for role in Role}
+
+# Rows per executemany batch for bulk inserts
+BULK_INSERT_PAGE_SIZE = 10_000
+
+# Columns written by the PostgreSQL COPY import path
+COPY_COLUMNS = (
+    "id",
+    "task_id",
+    "parent_message_id",
+    "role",
+    "content",
+    "message_metadata",
+    "is_processed",
+    "created_at",
+    "updated_at",
+)
+
+
+class _ContentHasBlock(ColumnElement):
+    """Generation expression testing ``content`` for a block type.
+    
+    Only PostgreSQL can evaluate it inside a stored generated column; other
+    dialects store NULL and the model falls back to scanning in Python.
+    """
+    
+    inherit_cache = True
+    
+    def __init__(self, block_type: str):
+        self.block_type = block_type
+        self.type = Boolean()
+
+
+@compiles(_ContentHasBlock)
+def _compile_content_has_block(element, compiler, **kw):
+    return "NULL"
+
+
+@compiles(_ContentHasBlock, "postgresql")
+def _compile_content_has_block_postgresql(element, compiler, **kw):
+    return f"jsonb_path_exists(content, '$[*] ? (@.type == \"{element.block_type}\")')"
+
+
+# Block type -> generated flag attribute, filled on PostgreSQL only
+_BLOCK_FLAG_COLUMNS = {
+    "tool_use": "_has_tool_use",
+    "image": "_has_images",
+}
+
+
+class _ContentContainsBlock(ColumnElement):
+    """Query-time predicate testing ``content`` for a block type.
+    
+    PostgreSQL reads the generated flag column where there is one and uses
+    JSONB containment, served by the content GIN index, otherwise; SQLite
+    walks the array with ``json_each``.
+    """
+    
+    inherit_cache = True
+    _traverse_internals = [("block_type", InternalTraversal.dp_string)]
+    
+    def __init__(self, block_type: str):
+        self.block_type = block_type
+        self.type = Boolean()
+
+
+@compiles(_ContentContainsBlock)
+def _compile_content_contains_block(element, compiler, **kw):
+    # Block types with a stored flag column read the flag instead
+    flag = _BLOCK_FLAG_COLUMNS.get(element.block_type)
+    if flag is not None:
+        return compiler.process(getattr(Message, flag), **kw)
+    return compiler.process(
+        type_coerce(Message.content, JSONB).contains([{"type": element.block_type}]),
+        **kw,
+    )
+
+
+@compiles(_ContentContainsBlock, "sqlite")
+def _compile_content_contains_block_sqlite(element, compiler, **kw):
+    content = compiler.process(Message.content, **kw)
+    block_type = compiler.process(literal(element.block_type), **kw)
+    return (
+        f"EXISTS (SELECT 1 FROM json_each({content}) "
+        f"WHERE json_extract(json_each.value, '$.type') = {block_type})"
+    )
 
 
 class Message(Base, UUIDMixin, TimestampMixin):
     """Message model representing a message in a conversation."""
     
+    __table_args__ = (
+        # Chronological pagination of a task's conversation; the leading
+        # task_id column also serves plain task_id lookups
+        Index("ix_message_task_created", "task_id", "created_at"),
+        # Per-model usage and performance aggregates over a time window
+        Index("ix_message_model_created", "model", "created_at"),
+        # Containment lookups on content blocks, e.g. content @> '[{"type": "tool_use"}]'
+        Index(
+            "ix_message_content_gin",
+            "content",
+            postgresql_using="gin",
+            postgresql_ops={"content": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # Partial indexes on the generated flags; only the rare true rows are indexed
+        Index(
+            "ix_message_has_tool_use",
+            "has_tool_use",
+            postgresql_where=text("has_tool_use"),
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_message_has_images",
+            "has_images",
+            postgresql_where=text("has_images"),
+        ).ddl_if(dialect="postgresql"),
+    )
+    
     # Message role (user, assistant, system, tool)
     role: Mapped[Role] = mapped_column(
-        SQLEnum(Role),
+        SmallIntEnum(Role, ROLE_CODES),
         nullable=False,
         doc="Role of the message sender"
     )
     
-    # Message content as JSON array of content blocks
+    # Message content as JSON array of content blocks (JSONB on PostgreSQL)
     content: Mapped[List[dict]] = mapped_column(
-        JSON,
+        JSON().with_variant(JSONB(), "postgresql"),
         nullable=False,
         doc="Message content blocks as JSON array"
     )
     
+    # Content flags computed by the database; read through has_tool_use/has_images
+    _has_tool_use: Mapped[Optional[bool]] = mapped_column(
+        "has_tool_use",
+        Boolean,
+        Computed(_ContentHasBlock("tool_use"), persisted=True),
+        nullable=True,
+        doc="Whether content contains a tool use block (PostgreSQL only)"
+    )
+    
+    _has_images: Mapped[Optional[bool]] = mapped_column(
+        "has_images",
+        Boolean,
+        Computed(_ContentHasBlock("image"), persisted=True),
+        nullable=True,
+        doc="Whether content contains an image block (PostgreSQL only)"
+    )
+    
     # Optional message metadata
     message_metadata: Mapped[Optional[dict]] = mapped_column(
         JSON,
@@ -45,6 +212,15 @@ class Message(Base, UUIDMixin, TimestampMixin):
         doc="Number of output tokens generated"
     )
     
+    # Stored sum of the token columns; read through total_tokens
+    _total_tokens: Mapped[Optional[int]] = mapped_column(
+        "total_tokens",
+        Integer,
+        Computed("input_tokens + output_tokens", persisted=True),
+        nullable=True,
+        doc="Total token count (input + output)"
+    )
+    
     # Model information
     model: Mapped[Optional[str]] = mapped_column(
         String(100),
@@ -72,8 +248,8 @@ class Message(Base, UUIDMixin, TimestampMixin):
     )
     
     # Relationships
-    task_id: Mapped[str] = mapped_column(
-        String(36),
+    task_id: Mapped[UUID] = mapped_column(
+        Uuid,
         ForeignKey("task.id", ondelete="CASCADE"),
         nullable=False,
         doc="ID of the associated task"
@@ -86,10 +262,11 @@ class Message(Base, UUIDMixin, TimestampMixin):
     )
     
     # Parent message for threading
-    parent_message_id: Mapped[Optional[str]] = mapped_column(
-        String(36),
+    parent_message_id: Mapped[Optional[UUID]] = mapped_column(
+        Uuid,
         ForeignKey("message.id", ondelete="SET NULL"),
         nullable=True,
+        index=True,
         doc="ID of the parent message for threading"
     )
     
@@ -97,6 +274,7 @@ class Message(Base, UUIDMixin, TimestampMixin):
         "Message",
         remote_side="Message.id",
         back_populates="child_messages",
+        lazy="selectin",
         doc="Parent message"
     )
     
@@ -111,59 +289,87 @@ class Message(Base, UUIDMixin, TimestampMixin):
         """Initialize message."""
         super().__init__(**kwargs)
     
-    @property
+    @hybrid_property
     def total_tokens(self) -> Optional[int]:
         """Get total token count (input + output)."""
+        total = self.__dict__.get("_total_tokens")
+        if total is not None:
+            return total
         if self.input_tokens is not None and self.output_tokens is not None:
             return self.input_tokens + self.output_tokens
         return None
     
+    @total_tokens.inplace.expression
+    @classmethod
+    def _total_tokens_expression(cls):
+        return cls._total_tokens
+    
+    def _blocks_by_type(self) -> Dict[Any, List[dict]]:
+        """Group the content blocks by ``type`` in one pass and memoize it.
+        
+        The cache is tied to the current ``content`` list object, so assigning
+        new content (or a refresh from the database) invalidates it. Callers
+        read groups with ``.get`` so the mapping is never extended.
+        """
+        content = self.content
+        cached = self.__dict__.get("_content_groups")
+        if cached is not None and cached[0] is content:
+            return cached[1]
+        
+        groups = defaultdict(list)
+        
+        # Blocks decoded from JSON are always plain dicts
+        dict_type = dict
+        for block in content or ():
+            if type(block) is dict_type:
+                groups[block.get("type")].append(block)
+        
+        self.__dict__["_content_groups"] = (content, groups)
+        return groups
+    
     @property
     def text_content(self) -> str:
         """Extract plain text content from message content blocks."""
-        text_parts = []
-        
-        for block in self.content:
-            if isinstance(block, dict) and block.get("type") == "text":
-                text_parts.append(block.get("text", ""))
-        
-        return "\n".join(text_parts)
+        return "\n".join(
+            block.get("text", "") for block in self._blocks_by_type().get("text", ())
+        )
     
     @property
     def has_tool_use(self) -> bool:
         """Check if message contains tool use content."""
-        for block in self.content:
-            if isinstance(block, dict) and block.get("type") == "tool_use":
-                return True
-        return False
+        flag = self.__dict__.get("_has_tool_use")
+        if flag is not None:
+            return flag
+        return "tool_use" in self._blocks_by_type()
     
     @property
     def has_images(self) -> bool:
         """Check if message contains image content."""
-        for block in self.content:
-            if isinstance(block, dict) and block.get("type") == "image":
-                return True
-        return False
+        flag = self.__dict__.get("_has_images")
+        if flag is not None:
+            return flag
+        return "image" in self._blocks_by_type()
+    
+    @validates("content")
+    def _invalidate_content_flags(self, key: str, content: List[dict]) -> List[dict]:
+        """Drop database-computed flags that no longer match new content."""
+        self.__dict__.pop("_has_tool_use", None)
+        self.__dict__.pop("_has_images", None)
+        return content
+    
+    @validates("input_tokens", "output_tokens")
+    def _invalidate_total_tokens(self, key: str, tokens: Optional[int]) -> Optional[int]:
+        """Drop the database-computed total once a token count changes."""
+        self.__dict__.pop("_total_tokens", None)
+        return tokens
     
     def get_tool_uses(self) -> List[dict]:
         """Get all tool use content blocks."""
-        tool_uses = []
-        
-        for block in self.content:
-            if isinstance(block, dict) and block.get("type") == "tool_use":
-                tool_uses.append(block)
-        
-        return tool_uses
+        return list(self._blocks_by_type().get("tool_use", ()))
     
     def get_images(self) -> List[dict]:
         """Get all image content blocks."""
-        images = []
-        
-        for block in self.content:
-            if isinstance(block, dict) and block.get("type") == "image":
-                images.append(block)
-        
-        return images
+        return list(self._blocks_by_type().get("image", ()))
     
     def add_content_block(self, content_block: dict) -> None:
         """Add a content block to the message.
@@ -171,10 +377,9 @@ class Message(Base, UUIDMixin, TimestampMixin):
         Args:
             content_block: Content block to add
         """
-        if not isinstance(self.content, list):
-            self.content = []
-        
-        self.content.append(content_block)
+        # Assign a new list: the JSON column does not track in-place appends
+        content = self.content if isinstance(self.content, list) else []
+        self.content = [*content, content_block]
     
     def mark_processed(self) -> None:
         """Mark message as processed."""
@@ -204,20 +409,18 @@ class Message(Base, UUIDMixin, TimestampMixin):
         """Convert message to dictionary with additional computed fields."""
         result = super().to_dict(exclude=exclude)
         
-        # Add computed fields
-        result.update({
-            "total_tokens": self.total_tokens,
-            "text_content": self.text_content,
-            "has_tool_use": self.has_tool_use,
-            "has_images": self.has_images,
-        })
+        if "role" in result:
+            result["role"] = _ROLE_STRINGS.get(result["role"])
+        
+        # has_tool_use/has_images/total_tokens are columns and already read above
+        result["text_content"] = self.text_content
         
         return result
     
     @classmethod
     def create_text_message(
         cls,
-        task_id: str,
+        task_id: UUID,
         role: Role,
         text: str,
         **kwargs
@@ -245,7 +448,7 @@ class Message(Base, UUIDMixin, TimestampMixin):
     @classmethod
     def create_tool_use_message(
         cls,
-        task_id: str,
+        task_id: UUID,
         tool_id: str,
         tool_name: str,
         tool_input: dict,
@@ -280,7 +483,7 @@ class Message(Base, UUIDMixin, TimestampMixin):
     @classmethod
     def create_tool_result_message(
         cls,
-        task_id: str,
+        task_id: UUID,
         tool_use_id: str,
         result_content: str,
         is_error: bool = False,
@@ -312,7 +515,244 @@ class Message(Base, UUIDMixin, TimestampMixin):
             **kwargs
         )
     
+    @classmethod
+    def contains_block_type(cls, block_type: str) -> ColumnElement:
+        """SQL predicate matching messages with a content block of a type.
+        
+        On PostgreSQL tool use and image blocks are matched through their
+        generated flag columns and other types through a JSONB containment
+        test served by the content GIN index; SQLite scans with ``json_each``.
+        
+        Args:
+            block_type: Content block type, e.g. ``"tool_use"`` or ``"image"``
+        
+        Returns:
+            Boolean SQL expression
+        """
+        return _ContentContainsBlock(block_type)
+    
+    @classmethod
+    def content_text_matches(cls, search: str) -> ColumnElement:
+        """SQL predicate matching messages whose serialized content contains text.
+        
+        The ``CAST(content AS TEXT)`` expression is the one indexed by
+        ``ix_message_content_trgm``, so on PostgreSQL the ILIKE is served by
+        the trigram index instead of a sequential scan.
+        
+        Args:
+            search: Case-insensitive substring to look for
+        
+        Returns:
+            Boolean SQL expression
+        """
+        return cast(cls.content, Text).ilike(f"%{search}%")
+    
+    @classmethod
+    async def query_with_tool_use(cls, session: AsyncSession, task_id: UUID) -> List["Message"]:
+        """Get a task's messages that contain tool use blocks, oldest first.
+        
+        On PostgreSQL the match is a JSONB containment test served by the
+        content GIN index; other dialects filter the task's messages in Python.
+        
+        Args:
+            session: Database session
+            task_id: ID of the associated task
+        
+        Returns:
+            Messages with at least one tool use block
+        """
+        query = (
+            select(cls)
+            .where(cls.task_id == task_id)
+            .order_by(cls.created_at)
+        )
+        
+        connection = await session.connection()
+        if connection.dialect.name != "postgresql":
+            result = await session.execute(query)
+            return [message for message in result.scalars() if message.has_tool_use]
+        
+        query = query.where(cls.contains_block_type("tool_use"))
+        result = await session.execute(query)
+        return list(result.scalars())
+    
+    @classmethod
+    async def bulk_create_text_messages(
+        cls,
+        session: AsyncSession,
+        task_id: UUID,
+        role: Role,
+        texts: Iterable[str],
+    ) -> List[UUID]:
+        """Insert many text messages with batched Core INSERT statements.
+        
+        Unlike the single-message factories this bypasses the unit of work:
+        rows are sent in pages of ``BULK_INSERT_PAGE_SIZE`` and no ORM
+        instances are created. The caller is responsible for committing.
+        
+        Args:
+            session: Database session
+            task_id: ID of the associated task
+            role: Role shared by all messages
+            texts: Text content of each message, in order
+        
+        Returns:
+            IDs of the inserted messages, in input order
+        """
+        rows = (
+            {
+                "id": uuid4(),
+                "task_id": task_id,
+                "role": role,
+                "content": [{"type": "text", "text": text}],
+            }
+            for text in texts
+        )
+        return await cls._insert_pages(session, rows)
+    
+    @classmethod
+    async def copy_from_records(
+        cls,
+        session: AsyncSession,
+        rows: Iterable[dict],
+    ) -> List[UUID]:
+        """Import messages with PostgreSQL COPY.
+        
+        Each row needs ``task_id``, ``role`` and ``content`` and may carry
+        ``id``, ``parent_message_id``, ``message_metadata`` and
+        ``created_at``. On asyncpg the rows are streamed through
+        ``copy_records_to_table`` on the session's connection; other dialects
+        fall back to the batched INSERT path.
+        
+        Args:
+            session: Database session
+            rows: Message column values, one dict per message
+        
+        Returns:
+            IDs of the imported messages, in input order
+        """
+        now = datetime.now(timezone.utc)
+        rows = (cls._import_row(row, now) for row in rows)
+        
+        connection = await session.connection()
+        if connection.dialect.name != "postgresql" or connection.dialect.driver != "asyncpg":
+            return await cls._insert_pages(session, rows)
+        
+        raw_connection = await connection.get_raw_connection()
+        message_ids: List[UUID] = []
+        
+        def records():
+            for row in rows:
+                message_ids.append(row["id"])
+                metadata = row["message_metadata"]
+                yield (
+                    row["id"],
+                    row["task_id"],
+                    row["parent_message_id"],
+                    ROLE_CODES[row["role"]],
+                    orjson.dumps(row["content"]).decode(),
+                    orjson.dumps(metadata).decode() if metadata is not None else None,
+                    row["is_processed"],
+                    row["created_at"],
+                    row["updated_at"],
+                )
+        
+        await raw_connection.driver_connection.copy_records_to_table(
+            cls.__tablename__,
+            records=records(),
+            columns=COPY_COLUMNS,
+        )
+        return message_ids
+    
+    @classmethod
+    async def bulk_mark_processed(cls, session: AsyncSession, message_ids: Iterable[UUID]) -> int:
+        """Mark many messages as processed with a single UPDATE.
+        
+        Args:
+            session: Database session
+            message_ids: IDs of the messages to mark
+        
+        Returns:
+            Number of updated rows
+        """
+        message_ids = list(message_ids)
+        if not message_ids:
+            return 0
+        
+        result = await session.execute(
+            update(cls)
+            .where(cls.id.in_(message_ids))
+            .values(is_processed=True, processing_error=None)
+        )
+        return result.rowcount
+    
+    @staticmethod
+    def _import_row(row: dict, now: datetime) -> dict:
+        """Fill in every ``COPY_COLUMNS`` value for an imported message row."""
+        created_at = row.get("created_at") or now
+        return {
+            "id": row.get("id") or uuid4(),
+            "task_id": row["task_id"],
+            "parent_message_id": row.get("parent_message_id"),
+            "role": Role(row["role"]),
+            "content": row["content"],
+            "message_metadata": row.get("message_metadata"),
+            "is_processed": False,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+    
+    @classmethod
+    async def _insert_pages(cls, session: AsyncSession, rows: Iterable[dict]) -> List[UUID]:
+        """Execute ``insert(Message)`` over rows in ``BULK_INSERT_PAGE_SIZE`` pages."""
+        stmt = insert(cls)
+        rows = iter(rows)
+        message_ids: List[UUID] = []
+        
+        while True:
+            page = list(islice(rows, BULK_INSERT_PAGE_SIZE))
+            if not page:
+                break
+            
+            await session.execute(stmt, page)
+            message_ids.extend(row["id"] for row in page)
+        
+        return message_ids
+    
     def __repr__(self) -> str:
-        """String representation of the message."""
-        text_preview = self.text_content[:50] + "..." if len(self.text_content) > 50 else self.text_content
-        return f"<Message({self.id}): {self.role.value} - {text_preview}>"
\ No newline at end of file
+        """String representation of the message.
+        
+        Only the first 51 characters of text are collected, and a deferred or
+        unloaded ``content`` column renders as an empty preview.
+        """
+        parts = []
+        size = 0
+        for block in self.__dict__.get("content") or ():
+            if type(block) is dict and block.get("type") == "text":
+                if parts:
+                    parts.append("\n")
+                    size += 1
+                text = block.get("text", "")[:51 - size]
+                parts.append(text)
+                size += len(text)
+                if size > 50:
+                    break
+        
+        text_preview = "".join(parts)
+        if size > 50:
+            text_preview = text_preview[:50] + "..."
+        return f"<Message({self.id}): {_ROLE_STRINGS.get(self.role)} - {text_preview}>"
+
+
+# Trigram index behind Message.content_text_matches; pg_trgm must exist first
+event.listen(
+    Message.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+Index(
+    "ix_message_content_trgm",
+    cast(Message.content, Text).label("content_text"),
+    postgresql_using="gin",
+    postgresql_ops={"content_text": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
\ No newline at end of file
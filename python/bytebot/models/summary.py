@@ -1,9 +1,11 @@
 """Summary model for database operations."""
 
 from typing import Optional
+from uuid import UUID
 
-from sqlalchemy import JSON, String, Text, ForeignKey, Integer
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import JSON, Computed, String, Text, ForeignKey, Index, Integer, Uuid
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from .base import Base, TimestampMixin, UUIDMixin
 
@@ -11,6 +13,11 @@ from .base import Base, TimestampMixin, UUIDMixin
 class Summary(Base, UUIDMixin, TimestampMixin):
     """Summary model representing a task execution summary."""
     
+    __table_args__ = (
+        # Per-model usage and performance aggregates over a time window
+        Index("ix_summary_model_created", "model", "created_at"),
+    )
+    
     # Summary title
     title: Mapped[str] = mapped_column(
         String(255),
@@ -51,6 +58,15 @@ class Summary(Base, UUIDMixin, TimestampMixin):
         doc="Number of output tokens generated for summary"
     )
     
+    # Stored sum of the token columns; read through total_tokens
+    _total_tokens: Mapped[Optional[int]] = mapped_column(
+        "total_tokens",
+        Integer,
+        Computed("input_tokens + output_tokens", persisted=True),
+        nullable=True,
+        doc="Total token count for summary generation (input + output)"
+    )
+    
     # Model information
     model: Mapped[Optional[str]] = mapped_column(
         String(100),
@@ -100,10 +116,11 @@ class Summary(Base, UUIDMixin, TimestampMixin):
     )
     
     # Relationships
-    task_id: Mapped[str] = mapped_column(
-        String(36),
+    task_id: Mapped[UUID] = mapped_column(
+        Uuid,
         ForeignKey("task.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
         doc="ID of the associated task"
     )
     
@@ -114,10 +131,11 @@ class Summary(Base, UUIDMixin, TimestampMixin):
     )
     
     # Parent summary for hierarchical summaries
-    parent_summary_id: Mapped[Optional[str]] = mapped_column(
-        String(36),
+    parent_summary_id: Mapped[Optional[UUID]] = mapped_column(
+        Uuid,
         ForeignKey("summary.id", ondelete="SET NULL"),
         nullable=True,
+        index=True,
         doc="ID of the parent summary for hierarchical summaries"
     )
     
@@ -139,13 +157,27 @@ class Summary(Base, UUIDMixin, TimestampMixin):
         """Initialize summary."""
         super().__init__(**kwargs)
     
-    @property
+    @hybrid_property
     def total_tokens(self) -> Optional[int]:
         """Get total token count (input + output)."""
+        total = self.__dict__.get("_total_tokens")
+        if total is not None:
+            return total
         if self.input_tokens is not None and self.output_tokens is not None:
             return self.input_tokens + self.output_tokens
         return None
     
+    @total_tokens.inplace.expression
+    @classmethod
+    def _total_tokens_expression(cls):
+        return cls._total_tokens
+    
+    @validates("input_tokens", "output_tokens")
+    def _invalidate_total_tokens(self, key: str, tokens: Optional[int]) -> Optional[int]:
+        """Drop the database-computed total once a token count changes."""
+        self.__dict__.pop("_total_tokens", None)
+        return tokens
+    
     @property
     def content_length(self) -> int:
         """Get the length of the summary content."""
@@ -225,20 +257,18 @@ class Summary(Base, UUIDMixin, TimestampMixin):
         """Convert summary to dictionary with additional computed fields."""
         result = super().to_dict(exclude=exclude)
         
-        # Add computed fields
-        result.update({
-            "total_tokens": self.total_tokens,
-            "content_length": self.content_length,
-            "word_count": self.word_count,
-            "is_high_quality": self.is_high_quality,
-        })
+        # Add computed fields in place rather than through a temporary dict;
+        # total_tokens is a column and already read above
+        result["content_length"] = self.content_length
+        result["word_count"] = self.word_count
+        result["is_high_quality"] = self.is_high_quality
         
         return result
     
     @classmethod
     def create_execution_summary(
         cls,
-        task_id: str,
+        task_id: UUID,
         title: str,
         content: str,
         message_count: Optional[int] = None,
@@ -268,7 +298,7 @@ class Summary(Base, UUIDMixin, TimestampMixin):
     @classmethod
     def create_error_summary(
         cls,
-        task_id: str,
+        task_id: UUID,
         title: str,
         content: str,
         error_metadata: Optional[dict] = None,
@@ -286,21 +316,19 @@ class Summary(Base, UUIDMixin, TimestampMixin):
         Returns:
             New summary instance
         """
-        metadata = error_metadata or {}
-        
         return cls(
             task_id=task_id,
             title=title,
             content=content,
             summary_type="error",
-            metadata=metadata,
+            summary_metadata=error_metadata or {},
             **kwargs
         )
     
     @classmethod
     def create_completion_summary(
         cls,
-        task_id: str,
+        task_id: UUID,
         title: str,
         content: str,
         **kwargs
@@ -326,5 +354,6 @@ class Summary(Base, UUIDMixin, TimestampMixin):
     
     def __repr__(self) -> str:
         """String representation of the summary."""
-        title_preview = self.title[:30] + "..." if len(self.title) > 30 else self.title
+        title = self.title
+        title_preview = title[:30] + "..." if len(title) > 30 else title
         return f"<Summary({self.id}): {self.summary_type} - {title_preview}>"
\ No newline at end of file
@@ -1,18 +1,79 @@
 """Task model for database operations."""
 
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from uuid import UUID
 
-from sqlalchemy import JSON, String, Text, Enum as SQLEnum
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import DDL, JSON, Computed, DateTime, Float, Index, String, Text, event, false, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
+from sqlalchemy.sql.expression import ColumnElement
 
-from ..shared.task_types import TaskStatus, TaskPriority, TaskType
-from .base import Base, TimestampMixin, UUIDMixin
+from ..shared.task_types import (
+    TASK_PRIORITY_CODES,
+    TASK_STATUS_CODES,
+    TASK_TYPE_CODES,
+    TaskStatus,
+    TaskPriority,
+    TaskType,
+)
+from .base import Base, SmallIntEnum, TimestampMixin, UUIDMixin
+
+
+# NOTIFY channel carrying the id of every inserted auto-start task
+TASK_INSERT_CHANNEL = "tasks_new"
+
+# Terminal task states
+_COMPLETED_STATES = frozenset((TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED))
+
+# String values of the enum columns, looked up instead of reading .value
+_ENUM_STRINGS = {
+    "status": {status: status.value for status in TaskStatus},
+    "priority": {priority: priority.value for priority in TaskPriority},
+    "task_type": {task_type: task_type.value for task_type in TaskType},
+}
+
+
+class _CompletedDuration(ColumnElement):
+    """Generation expression for the seconds between start and completion.
+    
+    PostgreSQL and SQLite have deterministic expressions for timestamp
+    differences; other dialects store NULL and the model computes the
+    duration in Python.
+    """
+    
+    inherit_cache = True
+    
+    def __init__(self):
+        self.type = Float()
+
+
+@compiles(_CompletedDuration)
+def _compile_completed_duration(element, compiler, **kw):
+    return "NULL"
+
+
+@compiles(_CompletedDuration, "postgresql")
+def _compile_completed_duration_postgresql(element, compiler, **kw):
+    return "EXTRACT(EPOCH FROM completed_at - started_at)"
+
+
+@compiles(_CompletedDuration, "sqlite")
+def _compile_completed_duration_sqlite(element, compiler, **kw):
+    # Rounded to milliseconds to hide julianday's floating point error
+    return "round((julianday(completed_at) - julianday(started_at)) * 86400.0, 3)"
 
 
 class Task(Base, UUIDMixin, TimestampMixin):
     """Task model representing a task in the system."""
     
+    __table_args__ = (
+        # Leading status column also serves status-only filters
+        Index("ix_task_status_priority", "status", "priority"),
+    )
+    
     # Basic task information
     title: Mapped[str] = mapped_column(
         String(255),
@@ -28,26 +89,34 @@ class Task(Base, UUIDMixin, TimestampMixin):
     
     # Task status and priority
     status: Mapped[TaskStatus] = mapped_column(
-        SQLEnum(TaskStatus),
+        SmallIntEnum(TaskStatus, TASK_STATUS_CODES),
         nullable=False,
         default=TaskStatus.PENDING,
         doc="Current task status"
     )
     
     priority: Mapped[TaskPriority] = mapped_column(
-        SQLEnum(TaskPriority),
+        SmallIntEnum(TaskPriority, TASK_PRIORITY_CODES),
         nullable=False,
         default=TaskPriority.MEDIUM,
         doc="Task priority level"
     )
     
     task_type: Mapped[TaskType] = mapped_column(
-        SQLEnum(TaskType),
+        SmallIntEnum(TaskType, TASK_TYPE_CODES),
         nullable=False,
         default=TaskType.COMPUTER_USE,
         doc="Type of task"
     )
     
+    # Whether the agent picks the task up as soon as it is created
+    auto_start: Mapped[bool] = mapped_column(
+        nullable=False,
+        default=False,
+        server_default=false(),
+        doc="Start processing automatically after creation"
+    )
+    
     # Task execution details
     input_data: Mapped[Optional[dict]] = mapped_column(
         JSON,
@@ -69,15 +138,26 @@ class Task(Base, UUIDMixin, TimestampMixin):
     
     # Task timing
     started_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
         nullable=True,
         doc="Timestamp when task execution started"
     )
     
     completed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
         nullable=True,
         doc="Timestamp when task execution completed"
     )
     
+    # Stored run time of finished tasks; read through duration_seconds
+    _duration_seconds: Mapped[Optional[float]] = mapped_column(
+        "duration_seconds",
+        Float,
+        Computed(_CompletedDuration(), persisted=True),
+        nullable=True,
+        doc="Seconds between start and completion (PostgreSQL and SQLite)"
+    )
+    
     # Task metadata
     task_metadata: Mapped[Optional[dict]] = mapped_column(
         JSON,
@@ -97,6 +177,7 @@ class Task(Base, UUIDMixin, TimestampMixin):
         "Message",
         back_populates="task",
         cascade="all, delete-orphan",
+        lazy="selectin",
         doc="Messages associated with this task"
     )
     
@@ -104,6 +185,7 @@ class Task(Base, UUIDMixin, TimestampMixin):
         "Summary",
         back_populates="task",
         cascade="all, delete-orphan",
+        lazy="selectin",
         doc="Summaries associated with this task"
     )
     
@@ -119,46 +201,71 @@ class Task(Base, UUIDMixin, TimestampMixin):
     @property
     def is_completed(self) -> bool:
         """Check if task is completed (successfully or failed)."""
-        return self.status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED]
+        return self.status in _COMPLETED_STATES
     
     @property
     def is_pending(self) -> bool:
         """Check if task is pending execution."""
         return self.status == TaskStatus.PENDING
     
-    @property
+    @hybrid_property
     def duration_seconds(self) -> Optional[float]:
         """Get task duration in seconds if completed."""
+        duration = self.__dict__.get("_duration_seconds")
+        if duration is not None:
+            return duration
         if self.started_at and self.completed_at:
             return (self.completed_at - self.started_at).total_seconds()
         return None
     
-    def start(self) -> None:
-        """Mark task as started."""
+    @duration_seconds.inplace.expression
+    @classmethod
+    def _duration_seconds_expression(cls):
+        return cls._duration_seconds
+    
+    @validates("started_at", "completed_at")
+    def _invalidate_duration(self, key: str, value: Optional[datetime]) -> Optional[datetime]:
+        """Drop the database-computed duration once a timestamp changes."""
+        self.__dict__.pop("_duration_seconds", None)
+        return value
+    
+    def start(self, *, now: Optional[datetime] = None) -> None:
+        """Mark task as started.
+        
+        Args:
+            now: Timestamp to record; callers updating many tasks pass one
+                shared value
+        """
         self.status = TaskStatus.RUNNING
-        self.started_at = datetime.utcnow()
+        self.started_at = now or datetime.now(timezone.utc)
         self.progress_percentage = 0
     
-    def complete(self, output_data: Optional[dict] = None) -> None:
+    def complete(self, output_data: Optional[dict] = None, *, now: Optional[datetime] = None) -> None:
         """Mark task as completed successfully."""
         self.status = TaskStatus.COMPLETED
-        self.completed_at = datetime.utcnow()
+        self.completed_at = now or datetime.now(timezone.utc)
         self.progress_percentage = 100
         if output_data is not None:
             self.output_data = output_data
     
-    def fail(self, error_message: str, output_data: Optional[dict] = None) -> None:
+    def fail(
+        self,
+        error_message: str,
+        output_data: Optional[dict] = None,
+        *,
+        now: Optional[datetime] = None,
+    ) -> None:
         """Mark task as failed."""
         self.status = TaskStatus.FAILED
-        self.completed_at = datetime.utcnow()
+        self.completed_at = now or datetime.now(timezone.utc)
         self.error_message = error_message
         if output_data is not None:
             self.output_data = output_data
     
-    def cancel(self) -> None:
+    def cancel(self, *, now: Optional[datetime] = None) -> None:
         """Mark task as cancelled."""
         self.status = TaskStatus.CANCELLED
-        self.completed_at = datetime.utcnow()
+        self.completed_at = now or datetime.now(timezone.utc)
     
     def pause(self) -> None:
         """Mark task as paused."""
@@ -181,20 +288,62 @@ class Task(Base, UUIDMixin, TimestampMixin):
         else:
             raise ValueError("Progress percentage must be between 0 and 100")
     
+    @classmethod
+    async def bulk_update_progress(cls, session: AsyncSession, updates: Dict[UUID, int]) -> None:
+        """Update the progress of many tasks in one batched UPDATE.
+        
+        Uses an ORM bulk UPDATE by primary key, so the rows are sent as a
+        single executemany instead of one flush per task.
+        
+        Args:
+            session: Database session
+            updates: Progress percentage (0-100) keyed by task ID
+        """
+        if not updates:
+            return
+        
+        if not all(0 <= percentage <= 100 for percentage in updates.values()):
+            raise ValueError("Progress percentage must be between 0 and 100")
+        
+        await session.execute(
+            update(cls),
+            [
+                {"id": task_id, "progress_percentage": percentage}
+                for task_id, percentage in updates.items()
+            ],
+        )
+    
     def to_dict(self, exclude: Optional[set] = None) -> dict:
         """Convert task to dictionary with additional computed fields."""
         result = super().to_dict(exclude=exclude)
         
-        # Add computed fields
-        result.update({
-            "is_running": self.is_running,
-            "is_completed": self.is_completed,
-            "is_pending": self.is_pending,
-            "duration_seconds": self.duration_seconds,
-        })
+        for key, strings in _ENUM_STRINGS.items():
+            if key in result:
+                result[key] = strings.get(result[key])
+        
+        # Add computed fields in place rather than through a temporary dict
+        result["is_running"] = self.is_running
+        result["is_completed"] = self.is_completed
+        result["is_pending"] = self.is_pending
         
         return result
     
     def __repr__(self) -> str:
         """String representation of the task."""
-        return f"<Task({self.id}): {self.title} - {self.status.value}>"
\ No newline at end of file
+        return f"<Task({self.id}): {self.title} - {_ENUM_STRINGS['status'].get(self.status)}>"
+
+
+# Announce inserted auto-start tasks so a listening agent can pick them up
+# without polling
+for statement in (
+    "CREATE OR REPLACE FUNCTION notify_task_inserted() RETURNS trigger AS $$ "
+    f"BEGIN PERFORM pg_notify('{TASK_INSERT_CHANNEL}', NEW.id::text); RETURN NEW; END; "
+    "$$ LANGUAGE plpgsql",
+    "CREATE TRIGGER task_inserted_notify AFTER INSERT ON task "
+    "FOR EACH ROW WHEN (NEW.auto_start) EXECUTE FUNCTION notify_task_inserted()",
+):
+    event.listen(
+        Task.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql"),
+    )
\ No newline at end of file
@@ -0,0 +1,55 @@
+"""Validation-free JSON encoding of list responses built from ORM rows.
+
+Rows loaded from the database already conform to the response schemas, so
+list endpoints can read the schema's fields straight off each row and encode
+the result with orjson instead of constructing and dumping a Pydantic model
+per row. The Pydantic schemas remain the response models for OpenAPI.
+"""
+
+from typing import Any, Dict, Iterable, List
+
+import orjson
+
+from ._rows import RowReader
+from .message import MessageResponse
+from .summary import SummaryResponse
+from .task import TaskResponse
+
+
+_MESSAGE_ROWS = RowReader(MessageResponse)
+_SUMMARY_ROWS = RowReader(SummaryResponse)
+_TASK_ROWS = TaskResponse._row_reader()
+
+
+def _encode_page(
+    key: str,
+    reader: RowReader,
+    rows: Iterable[Any],
+    total: int,
+    skip: int,
+    limit: int,
+) -> bytes:
+    """Encode one page of a ``*ListResponse`` in a single orjson call."""
+    items: List[Dict[str, Any]] = [reader.row(obj) for obj in rows]
+    return orjson.dumps({
+        key: items,
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "has_more": skip + len(items) < total,
+    })
+
+
+def encode_message_list(messages: Iterable[Any], total: int, skip: int, limit: int) -> bytes:
+    """Encode a ``MessageListResponse`` body from ORM messages."""
+    return _encode_page("messages", _MESSAGE_ROWS, messages, total, skip, limit)
+
+
+def encode_summary_list(summaries: Iterable[Any], total: int, skip: int, limit: int) -> bytes:
+    """Encode a ``SummaryListResponse`` body from ORM summaries."""
+    return _encode_page("summaries", _SUMMARY_ROWS, summaries, total, skip, limit)
+
+
+def encode_task_list(tasks: Iterable[Any], total: int, skip: int, limit: int) -> bytes:
+    """Encode a ``TaskListResponse`` body from ORM tasks."""
+    return _encode_page("tasks", _TASK_ROWS, tasks, total, skip, limit)
\ No newline at end of file
@@ -0,0 +1,13 @@
+"""JSON encoding of response schemas straight through pydantic-core."""
+
+
+class FastJsonMixin:
+    """Adds ``to_json_bytes`` to response schemas.
+    
+    Routes return the bytes in a ``Response`` so FastAPI neither re-validates
+    the model against ``response_model`` nor encodes it a second time.
+    """
+    
+    def to_json_bytes(self) -> bytes:
+        """Serialize the model, nested lists included, in a single call."""
+        return type(self).__pydantic_serializer__.to_json(self, by_alias=True)
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""Page arithmetic shared by the paginated list responses."""
+
+from functools import cached_property
+from typing import Tuple
+
+
+class PaginationMixin:
+    """Adds ``page`` and ``total_pages`` to schemas with total/skip/limit fields."""
+    
+    @cached_property
+    def _pages(self) -> Tuple[int, int]:
+        """Compute the current page (1-based) and page count together."""
+        if self.limit <= 0:
+            return 1, 1
+        return (self.skip // self.limit) + 1, (self.total + self.limit - 1) // self.limit
+    
+    @property
+    def page(self) -> int:
+        """Calculate current page number (1-based)."""
+        return self._pages[0]
+    
+    @property
+    def total_pages(self) -> int:
+        """Calculate total number of pages."""
+        return self._pages[1]
\ No newline at end of file
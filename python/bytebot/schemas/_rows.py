@@ -0,0 +1,92 @@
+"""Reading response schema fields from trusted ORM rows."""
+
+from typing import Any, Callable, ClassVar, Dict, Optional, Tuple, Type
+
+from pydantic import BaseModel, SkipValidation
+from pydantic_core import PydanticUndefined
+
+
+_MISSING = object()
+
+# JSON object payloads of database rows, already decoded by the driver. Their
+# contents are opaque to the schemas, so validation does not copy them.
+OpaqueJSON = SkipValidation[Optional[Dict[str, Any]]]
+
+
+class RowReader:
+    """Reads a response schema's fields from ORM rows into plain dicts."""
+    
+    def __init__(self, schema: Type[BaseModel]):
+        # (field name, static default, default factory) resolved once per schema
+        self._fields: Tuple[Tuple[str, Any, Optional[Callable[[], Any]]], ...] = tuple(
+            (
+                name,
+                None if field.default is PydanticUndefined else field.default,
+                field.default_factory,
+            )
+            for name, field in schema.model_fields.items()
+        )
+    
+    def row(self, obj: Any) -> Dict[str, Any]:
+        """Build the field dict for one ORM row."""
+        data = {}
+        for name, default, default_factory in self._fields:
+            value = getattr(obj, name, _MISSING)
+            if value is _MISSING:
+                # Same fallback as model_validate for attributes the row lacks
+                value = default_factory() if default_factory is not None else default
+            data[name] = value
+        return data
+
+
+def _has_validators(schema: Type[BaseModel]) -> bool:
+    """Check whether a schema declares validators that construction would skip."""
+    decorators = schema.__pydantic_decorators__
+    return bool(
+        decorators.validators
+        or decorators.field_validators
+        or decorators.root_validators
+        or decorators.model_validators
+    )
+
+
+class FromRowMixin:
+    """Builds response schemas from database rows without re-validating them.
+    
+    Rows loaded through the ORM already conform to the schema, so ``from_row``
+    copies their fields into ``model_construct``. Schemas that declare their
+    own validators still go through ``model_validate``.
+    """
+    
+    # Reader type used for this schema; subclasses may fill in derived fields
+    _row_reader_type: ClassVar[Type[RowReader]] = RowReader
+    
+    @classmethod
+    def _row_reader(cls) -> Optional[RowReader]:
+        """Get the cached row reader, or None when rows must be validated."""
+        # Looked up in the class's own namespace so subclasses get their own reader
+        try:
+            return cls.__dict__["_row_reader_cache"]
+        except KeyError:
+            reader = None if _has_validators(cls) else cls._row_reader_type(cls)
+            cls._row_reader_cache = reader
+            return reader
+    
+    @classmethod
+    def _row_data(cls, obj: Any) -> Dict[str, Any]:
+        """Read the schema fields from a row; subclasses convert nested rows."""
+        return cls._row_reader().row(obj)
+    
+    @classmethod
+    def from_row(cls, obj: Any):
+        """Build the schema from a trusted ORM row.
+        
+        Args:
+            obj: ORM instance whose attributes match the schema fields
+        
+        Returns:
+            Schema instance built without per-field validation
+        """
+        if cls._row_reader() is None:
+            return cls.model_validate(obj)
+        return cls.model_construct(**cls._row_data(obj))
\ No newline at end of file
@@ -1,20 +1,53 @@
 """Message-related Pydantic schemas."""
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import cached_property
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple, get_args
 from uuid import UUID
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
 
 from ..shared.task_types import Role
 from ..shared.message_content import MessageContentBlock
+from ._json import FastJsonMixin
+from ._pagination import PaginationMixin
+from ._rows import FromRowMixin, OpaqueJSON
+
+
+_CONTENT_BLOCKS = TypeAdapter(List[MessageContentBlock])
+
+# Content index tags, looked up by block ``type`` value
+_TEXT, _TOOL_USE, _IMAGE, _OTHER = range(4)
+_TYPE_TAGS = {"text": _TEXT, "tool_use": _TOOL_USE, "image": _IMAGE}
+
+# Tags keyed by block class, so validated blocks are tagged by a type() lookup
+_BLOCK_TAGS = {
+    block_class: _TYPE_TAGS.get(block_class.model_fields["type"].default, _OTHER)
+    for block_class in get_args(MessageContentBlock)
+}
+
+
+def _untyped_block(block: Any) -> Tuple[int, Optional[str]]:
+    """Get the tag and text of a block outside the content union, e.g. a dict."""
+    if type(block) is dict:
+        tag = _TYPE_TAGS.get(block.get("type"), _OTHER)
+        return tag, block.get("text", "") if tag == _TEXT else None
+    tag = _TYPE_TAGS.get(getattr(block, "type", None), _OTHER)
+    return tag, block.text if tag == _TEXT else None
+
+
+class _ContentIndex(NamedTuple):
+    """Message content summarized in a single pass."""
+    text: str
+    has_tool_use: bool
+    has_images: bool
 
 
 class MessageBase(BaseModel):
     """Base message schema with common fields."""
     role: Role = Field(..., description="Message role (user, assistant, system, tool)")
     content: List[MessageContentBlock] = Field(..., description="Message content blocks")
-    message_metadata: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Additional metadata")
+    message_metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
 
 
 class MessageCreate(MessageBase):
@@ -40,13 +73,14 @@ class MessageUpdate(BaseModel):
     processing_error: Optional[str] = None
 
 
-class MessageResponse(MessageBase):
+class MessageResponse(FromRowMixin, FastJsonMixin, MessageBase):
     """Schema for message responses."""
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="forbid")
     
     id: UUID
     task_id: UUID
     parent_message_id: Optional[UUID] = None
+    message_metadata: OpaqueJSON = Field(None, description="Additional metadata")
     
     # AI model information
     model_name: Optional[str] = None
@@ -56,6 +90,7 @@ class MessageResponse(MessageBase):
     # Token usage
     input_tokens: Optional[int] = None
     output_tokens: Optional[int] = None
+    total_tokens: Optional[int] = None
     
     # Processing information
     processing_time_ms: Optional[int] = None
@@ -67,46 +102,68 @@ class MessageResponse(MessageBase):
     updated_at: datetime
     processed_at: Optional[datetime] = None
     
+    @classmethod
+    def _row_data(cls, obj: Any) -> Dict[str, Any]:
+        """Read the message fields, parsing stored content into block models."""
+        data = super()._row_data(obj)
+        # The JSON column holds plain dicts, which the block serializers reject
+        data["content"] = _CONTENT_BLOCKS.validate_python(data["content"])
+        return data
+    
     # Computed properties
-    @property
-    def total_tokens(self) -> int:
-        """Calculate total tokens used."""
-        input_tokens = self.input_tokens or 0
-        output_tokens = self.output_tokens or 0
-        return input_tokens + output_tokens
+    @cached_property
+    def _content_index(self) -> _ContentIndex:
+        """Walk the content blocks once for the text and block-type properties.
+        
+        Blocks are tagged by class; plain dicts are accepted too.
+        """
+        block_tags = _BLOCK_TAGS
+        text_parts = []
+        tags = bytearray()
+        
+        for block in self.content:
+            tag = block_tags.get(type(block))
+            if tag is None:
+                tag, text = _untyped_block(block)
+                if text is not None:
+                    text_parts.append(text)
+            elif tag == _TEXT:
+                text_parts.append(block.text)
+            tags.append(tag)
+        
+        return _ContentIndex(
+            text="\n".join(text_parts),
+            has_tool_use=_TOOL_USE in tags,
+            has_images=_IMAGE in tags,
+        )
     
     @property
     def text_content(self) -> str:
         """Extract plain text content from message blocks."""
-        text_parts = []
-        for block in self.content:
-            if isinstance(block, dict) and block.get("type") == "text":
-                text_parts.append(block.get("text", ""))
-        return "\n".join(text_parts)
+        return self._content_index.text
     
     @property
     def has_tool_use(self) -> bool:
         """Check if message contains tool use blocks."""
-        return any(
-            isinstance(block, dict) and block.get("type") == "tool_use"
-            for block in self.content
-        )
+        return self._content_index.has_tool_use
     
     @property
     def has_images(self) -> bool:
         """Check if message contains image blocks."""
-        return any(
-            isinstance(block, dict) and block.get("type") == "image"
-            for block in self.content
-        )
+        return self._content_index.has_images
     
-    @property
+    @cached_property
     def word_count(self) -> int:
         """Calculate word count of text content."""
-        return len(self.text_content.split()) if self.text_content else 0
+        # Joining with newlines adds no words; str.split outruns regex counting
+        return len(self._content_index.text.split())
+
+
 
+# Shared adapter for bare lists of messages, e.g. serializing a page at once
+MESSAGE_LIST_ADAPTER = TypeAdapter(List[MessageResponse])
 
-class MessageListResponse(BaseModel):
+class MessageListResponse(PaginationMixin, FastJsonMixin, BaseModel):
     """Schema for paginated message list responses."""
     messages: List[MessageResponse]
     total: int = Field(..., ge=0, description="Total number of messages")
@@ -114,21 +171,33 @@ class MessageListResponse(BaseModel):
     limit: int = Field(..., ge=1, description="Number of messages returned")
     has_more: bool = Field(..., description="Whether there are more messages available")
     
-    @property
-    def page(self) -> int:
-        """Calculate current page number (1-based)."""
-        return (self.skip // self.limit) + 1 if self.limit > 0 else 1
-    
-    @property
-    def total_pages(self) -> int:
-        """Calculate total number of pages."""
-        return (self.total + self.limit - 1) // self.limit if self.limit > 0 else 1
+    @classmethod
+    def build(cls, rows: Iterable[Any], total: int, skip: int, limit: int) -> "MessageListResponse":
+        """Build a page from ORM messages without re-validating them.
+        
+        Args:
+            rows: ORM messages on this page
+            total: Total number of matching messages
+            skip: Number of messages skipped
+            limit: Requested page size
+            
+        Returns:
+            List response with ``has_more`` filled in
+        """
+        messages = [MessageResponse.from_row(row) for row in rows]
+        return cls.model_construct(
+            messages=messages,
+            total=total,
+            skip=skip,
+            limit=limit,
+            has_more=skip + len(messages) < total,
+        )
 
 
-class MessageStats(BaseModel):
+class MessageStats(FastJsonMixin, BaseModel):
     """Schema for message statistics."""
     total_messages: int = 0
-    messages_by_role: Dict[str, int] = Field(default_factory=dict)
+    messages_by_role: Dict[Role, int] = Field(default_factory=dict)
     messages_by_task: Dict[str, int] = Field(default_factory=dict)
     
     total_tokens: int = 0
@@ -141,6 +210,30 @@ class MessageStats(BaseModel):
     processed_messages: int = 0
     failed_messages: int = 0
     
+    @classmethod
+    def from_query_results(
+        cls,
+        role_counts: Mapping[Role, int],
+        task_counts: Mapping[UUID, int],
+        **fields: Any,
+    ) -> "MessageStats":
+        """Build stats from counts already grouped by the database.
+        
+        Args:
+            role_counts: Message count per role
+            task_counts: Message count per task
+            **fields: Remaining statistics fields
+            
+        Returns:
+            Message statistics with the histograms and total filled in
+        """
+        return cls(
+            total_messages=sum(role_counts.values()),
+            messages_by_role=dict(role_counts),
+            messages_by_task={str(task_id): count for task_id, count in task_counts.items()},
+            **fields,
+        )
+    
     @property
     def processing_success_rate(self) -> float:
         """Calculate processing success rate."""
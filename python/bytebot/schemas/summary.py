@@ -1,10 +1,15 @@
 """Summary-related Pydantic schemas."""
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import cached_property
+from typing import Any, Dict, Iterable, List, Mapping, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, computed_field
+
+from ._json import FastJsonMixin
+from ._pagination import PaginationMixin
+from ._rows import FromRowMixin, OpaqueJSON
 
 
 class SummaryBase(BaseModel):
@@ -12,7 +17,7 @@ class SummaryBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=255, description="Summary title")
     content: str = Field(..., min_length=1, description="Summary content")
     summary_type: str = Field(..., max_length=50, description="Type of summary")
-    summary_metadata: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Additional metadata")
+    summary_metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
 
 
 class SummaryCreate(SummaryBase):
@@ -46,13 +51,14 @@ class SummaryUpdate(BaseModel):
     is_archived: Optional[bool] = None
 
 
-class SummaryResponse(SummaryBase):
+class SummaryResponse(FromRowMixin, FastJsonMixin, SummaryBase):
     """Schema for summary responses."""
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="forbid")
     
     id: UUID
     task_id: UUID
     parent_summary_id: Optional[UUID] = None
+    summary_metadata: OpaqueJSON = Field(None, description="Additional metadata")
     
     # AI model information
     model_name: Optional[str] = None
@@ -62,6 +68,7 @@ class SummaryResponse(SummaryBase):
     # Token usage
     input_tokens: Optional[int] = None
     output_tokens: Optional[int] = None
+    total_tokens: Optional[int] = None
     
     # Generation information
     generation_time_ms: Optional[int] = None
@@ -87,19 +94,12 @@ class SummaryResponse(SummaryBase):
     archived_at: Optional[datetime] = None
     
     # Computed properties
-    @property
-    def total_tokens(self) -> int:
-        """Calculate total tokens used."""
-        input_tokens = self.input_tokens or 0
-        output_tokens = self.output_tokens or 0
-        return input_tokens + output_tokens
-    
     @property
     def content_length(self) -> int:
         """Get content length in characters."""
         return len(self.content)
     
-    @property
+    @cached_property
     def word_count(self) -> int:
         """Calculate word count of content."""
         return len(self.content.split()) if self.content else 0
@@ -111,11 +111,16 @@ class SummaryResponse(SummaryBase):
             return False
         return self.quality_score >= 0.8
     
-    @property
+    @cached_property
     def average_score(self) -> Optional[float]:
         """Calculate average of all quality scores."""
-        scores = [s for s in [self.quality_score, self.relevance_score, self.coherence_score] if s is not None]
-        return sum(scores) / len(scores) if scores else None
+        total = 0.0
+        count = 0
+        for score in (self.quality_score, self.relevance_score, self.coherence_score):
+            if score is not None:
+                total += score
+                count += 1
+        return total / count if count else None
     
     @property
     def engagement_score(self) -> float:
@@ -123,7 +128,7 @@ class SummaryResponse(SummaryBase):
         return (self.view_count * 0.1) + (self.like_count * 1.0) + (self.share_count * 2.0)
 
 
-class SummaryListResponse(BaseModel):
+class SummaryListResponse(PaginationMixin, FastJsonMixin, BaseModel):
     """Schema for paginated summary list responses."""
     summaries: List[SummaryResponse]
     total: int = Field(..., ge=0, description="Total number of summaries")
@@ -131,18 +136,30 @@ class SummaryListResponse(BaseModel):
     limit: int = Field(..., ge=1, description="Number of summaries returned")
     has_more: bool = Field(..., description="Whether there are more summaries available")
     
-    @property
-    def page(self) -> int:
-        """Calculate current page number (1-based)."""
-        return (self.skip // self.limit) + 1 if self.limit > 0 else 1
-    
-    @property
-    def total_pages(self) -> int:
-        """Calculate total number of pages."""
-        return (self.total + self.limit - 1) // self.limit if self.limit > 0 else 1
+    @classmethod
+    def build(cls, rows: Iterable[Any], total: int, skip: int, limit: int) -> "SummaryListResponse":
+        """Build a page from ORM summaries without re-validating them.
+        
+        Args:
+            rows: ORM summaries on this page
+            total: Total number of matching summaries
+            skip: Number of summaries skipped
+            limit: Requested page size
+            
+        Returns:
+            List response with ``has_more`` filled in
+        """
+        summaries = [SummaryResponse.from_row(row) for row in rows]
+        return cls.model_construct(
+            summaries=summaries,
+            total=total,
+            skip=skip,
+            limit=limit,
+            has_more=skip + len(summaries) < total,
+        )
 
 
-class SummaryStats(BaseModel):
+class SummaryStats(FastJsonMixin, BaseModel):
     """Schema for summary statistics."""
     total_summaries: int = 0
     summaries_by_type: Dict[str, int] = Field(default_factory=dict)
@@ -165,6 +182,30 @@ class SummaryStats(BaseModel):
     total_likes: int = 0
     total_shares: int = 0
     
+    @classmethod
+    def from_query_results(
+        cls,
+        type_counts: Mapping[str, int],
+        task_counts: Mapping[UUID, int],
+        **fields: Any,
+    ) -> "SummaryStats":
+        """Build stats from counts already grouped by the database.
+        
+        Args:
+            type_counts: Summary count per summary type
+            task_counts: Summary count per task
+            **fields: Remaining statistics fields
+            
+        Returns:
+            Summary statistics with the histograms and total filled in
+        """
+        return cls(
+            total_summaries=sum(type_counts.values()),
+            summaries_by_type=dict(type_counts),
+            summaries_by_task={str(task_id): count for task_id, count in task_counts.items()},
+            **fields,
+        )
+    
     @property
     def approval_rate(self) -> float:
         """Calculate approval rate."""
@@ -211,7 +252,12 @@ class SummaryCompressionInfo(BaseModel):
     original_length: int = Field(..., gt=0, description="Original content length")
     summary_length: int = Field(..., gt=0, description="Summary content length")
     compression_ratio: float = Field(..., gt=0.0, le=1.0, description="Compression ratio")
-    compression_percentage: str = Field(..., description="Compression percentage as string")
+    
+    @computed_field(description="Compression percentage as string")
+    @property
+    def compression_percentage(self) -> str:
+        """Format the share of the original content saved, only when serialized."""
+        return f"{(1 - self.compression_ratio) * 100:.1f}%"
     
     @property
     def space_saved(self) -> int:
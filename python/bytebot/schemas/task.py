@@ -1,12 +1,62 @@
 """Task-related Pydantic schemas."""
 
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Literal, Mapping, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field, ConfigDict
 
 from ..shared.task_types import TaskStatus, TaskPriority, TaskType
+from ._json import FastJsonMixin
+from ._pagination import PaginationMixin
+from ._rows import FromRowMixin, OpaqueJSON, RowReader
+from .message import MessageResponse
+
+
+# Status groups for the TaskResponse state checks
+_ACTIVE_STATES = frozenset((TaskStatus.PENDING, TaskStatus.RUNNING, TaskStatus.PAUSED))
+_COMPLETED_STATES = frozenset((TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED))
+
+
+# Request time shared by every task serialized while handling one request
+_NOW: ContextVar[Optional[datetime]] = ContextVar("task_response_now", default=None)
+
+
+def set_response_time(now: Optional[datetime] = None) -> datetime:
+    """Fix the time used for elapsed durations in the current request.
+    
+    Args:
+        now: Timestamp to use; defaults to the current UTC time
+        
+    Returns:
+        The timestamp now in effect
+    """
+    now = now or datetime.now(timezone.utc)
+    _NOW.set(now)
+    return now
+
+
+def _elapsed_seconds(started_at: datetime) -> float:
+    """Get the seconds a still unfinished task has been running."""
+    if started_at.tzinfo is None:
+        # SQLite returns naive values for the UTC timestamps
+        started_at = started_at.replace(tzinfo=timezone.utc)
+    now = _NOW.get() or datetime.now(timezone.utc)
+    return (now - started_at).total_seconds()
+
+
+class _TaskRowReader(RowReader):
+    """Reads task rows, reporting the elapsed time of unfinished tasks."""
+    
+    def row(self, obj: Any) -> Dict[str, Any]:
+        """Build the field dict for one task row."""
+        data = super().row(obj)
+        # The stored duration only covers finished (completed, failed or
+        # cancelled) tasks
+        if data["duration_seconds"] is None and data["started_at"] is not None:
+            data["duration_seconds"] = _elapsed_seconds(data["started_at"])
+        return data
 
 
 class TaskBase(BaseModel):
@@ -15,8 +65,8 @@ class TaskBase(BaseModel):
     description: Optional[str] = Field(None, max_length=2000, description="Task description")
     task_type: TaskType = Field(default=TaskType.CUSTOM, description="Type of task")
     priority: TaskPriority = Field(default=TaskPriority.MEDIUM, description="Task priority")
-    task_metadata: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Additional metadata")
-    tags: Optional[List[str]] = Field(default_factory=list, description="Task tags")
+    task_metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
+    tags: Optional[List[str]] = Field(None, description="Task tags")
     estimated_duration_minutes: Optional[int] = Field(None, ge=1, description="Estimated duration in minutes")
     max_retries: int = Field(default=3, ge=0, le=10, description="Maximum retry attempts")
     timeout_seconds: Optional[int] = Field(None, ge=1, description="Task timeout in seconds")
@@ -24,8 +74,9 @@ class TaskBase(BaseModel):
 
 class TaskCreate(TaskBase):
     """Schema for creating a new task."""
-    input_data: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Input data for the task")
+    input_data: Optional[Dict[str, Any]] = Field(None, description="Input data for the task")
     parent_task_id: Optional[UUID] = Field(None, description="Parent task ID for subtasks")
+    auto_start: bool = Field(default=False, description="Start processing as soon as the task is created")
 
 
 class TaskUpdate(BaseModel):
@@ -47,14 +98,16 @@ class TaskUpdate(BaseModel):
     total_steps: Optional[int] = Field(None, ge=1)
 
 
-class TaskResponse(TaskBase):
+class TaskResponse(FromRowMixin, FastJsonMixin, TaskBase):
     """Schema for task responses."""
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="forbid")
+    _row_reader_type = _TaskRowReader
     
     id: UUID
     status: TaskStatus
-    input_data: Optional[Dict[str, Any]] = None
-    output_data: Optional[Dict[str, Any]] = None
+    task_metadata: OpaqueJSON = Field(None, description="Additional metadata")
+    input_data: OpaqueJSON = None
+    output_data: OpaqueJSON = None
     error_message: Optional[str] = None
     retry_count: int = 0
     progress_percentage: float = 0.0
@@ -70,31 +123,26 @@ class TaskResponse(TaskBase):
     cancelled_at: Optional[datetime] = None
     paused_at: Optional[datetime] = None
     resumed_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = Field(
+        None, description="Run time of finished tasks, or time elapsed since start"
+    )
     
     # Relationships
     parent_task_id: Optional[UUID] = None
     
     # Computed properties
-    @property
-    def duration_seconds(self) -> Optional[float]:
-        """Calculate task duration in seconds."""
-        if self.started_at:
-            end_time = self.completed_at or self.failed_at or self.cancelled_at or datetime.utcnow()
-            return (end_time - self.started_at).total_seconds()
-        return None
-    
     @property
     def is_active(self) -> bool:
         """Check if task is currently active."""
-        return self.status in [TaskStatus.PENDING, TaskStatus.RUNNING, TaskStatus.PAUSED]
+        return self.status in _ACTIVE_STATES
     
     @property
     def is_completed(self) -> bool:
         """Check if task is completed (success or failure)."""
-        return self.status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED]
+        return self.status in _COMPLETED_STATES
 
 
-class TaskListResponse(BaseModel):
+class TaskListResponse(PaginationMixin, FastJsonMixin, BaseModel):
     """Schema for paginated task list responses."""
     tasks: List[TaskResponse]
     total: int = Field(..., ge=0, description="Total number of tasks")
@@ -102,18 +150,30 @@ class TaskListResponse(BaseModel):
     limit: int = Field(..., ge=1, description="Number of tasks returned")
     has_more: bool = Field(..., description="Whether there are more tasks available")
     
-    @property
-    def page(self) -> int:
-        """Calculate current page number (1-based)."""
-        return (self.skip // self.limit) + 1 if self.limit > 0 else 1
-    
-    @property
-    def total_pages(self) -> int:
-        """Calculate total number of pages."""
-        return (self.total + self.limit - 1) // self.limit if self.limit > 0 else 1
+    @classmethod
+    def build(cls, rows: Iterable[Any], total: int, skip: int, limit: int) -> "TaskListResponse":
+        """Build a page from ORM tasks without re-validating them.
+        
+        Args:
+            rows: ORM tasks on this page
+            total: Total number of matching tasks
+            skip: Number of tasks skipped
+            limit: Requested page size
+            
+        Returns:
+            List response with ``has_more`` filled in
+        """
+        tasks = [TaskResponse.from_row(row) for row in rows]
+        return cls.model_construct(
+            tasks=tasks,
+            total=total,
+            skip=skip,
+            limit=limit,
+            has_more=skip + len(tasks) < total,
+        )
 
 
-class TaskStats(BaseModel):
+class TaskStats(FastJsonMixin, BaseModel):
     """Schema for task statistics."""
     total_tasks: int = 0
     pending_tasks: int = 0
@@ -126,8 +186,40 @@ class TaskStats(BaseModel):
     average_duration_seconds: Optional[float] = None
     success_rate: float = Field(0.0, ge=0.0, le=1.0)
     
-    tasks_by_type: Dict[str, int] = Field(default_factory=dict)
-    tasks_by_priority: Dict[str, int] = Field(default_factory=dict)
+    tasks_by_type: Dict[TaskType, int] = Field(default_factory=dict)
+    tasks_by_priority: Dict[TaskPriority, int] = Field(default_factory=dict)
+    
+    @classmethod
+    def from_query_results(
+        cls,
+        status_counts: Mapping[TaskStatus, int],
+        type_counts: Mapping[TaskType, int],
+        priority_counts: Mapping[TaskPriority, int],
+        **fields: Any,
+    ) -> "TaskStats":
+        """Build stats from counts already grouped by the database.
+        
+        Args:
+            status_counts: Task count per status
+            type_counts: Task count per task type
+            priority_counts: Task count per priority
+            **fields: Remaining statistics fields
+            
+        Returns:
+            Task statistics with the per-status counts and histograms filled in
+        """
+        return cls(
+            total_tasks=sum(status_counts.values()),
+            pending_tasks=status_counts.get(TaskStatus.PENDING, 0),
+            running_tasks=status_counts.get(TaskStatus.RUNNING, 0),
+            completed_tasks=status_counts.get(TaskStatus.COMPLETED, 0),
+            failed_tasks=status_counts.get(TaskStatus.FAILED, 0),
+            cancelled_tasks=status_counts.get(TaskStatus.CANCELLED, 0),
+            paused_tasks=status_counts.get(TaskStatus.PAUSED, 0),
+            tasks_by_type=dict(type_counts),
+            tasks_by_priority=dict(priority_counts),
+            **fields,
+        )
     
     @property
     def completion_rate(self) -> float:
@@ -142,9 +234,9 @@ class TaskStats(BaseModel):
 
 class TaskAction(BaseModel):
     """Schema for task actions (start, pause, resume, cancel)."""
-    action: str = Field(..., pattern=r"^(start|pause|resume|cancel)$")
+    action: Literal["start", "pause", "resume", "cancel"]
     reason: Optional[str] = Field(None, max_length=500, description="Reason for the action")
-    metadata: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    metadata: Optional[Dict[str, Any]] = None
 
 
 class TaskProgress(BaseModel):
@@ -153,9 +245,31 @@ class TaskProgress(BaseModel):
     current_step: Optional[str] = Field(None, max_length=255)
     total_steps: Optional[int] = Field(None, ge=1)
     message: Optional[str] = Field(None, max_length=500)
-    metadata: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    metadata: Optional[Dict[str, Any]] = None
 
 
 class TaskWithMessages(TaskResponse):
     """Schema for task responses that include messages."""
-    messages: List["MessageResponse"] = Field(default_factory=list, description="Task messages")
\ No newline at end of file
+    messages: List[MessageResponse] = Field(default_factory=list, description="Task messages")
+    
+    @classmethod
+    def _row_data(cls, obj: Any) -> Dict[str, Any]:
+        """Read the task fields and convert its preloaded messages."""
+        data = super()._row_data(obj)
+        data["messages"] = [MessageResponse.from_row(message) for message in data["messages"]]
+        return data
+    
+    @classmethod
+    def from_task_row(cls, obj: Any) -> "TaskWithMessages":
+        """Build the response with an empty message list.
+        
+        Used when messages were not requested; ``obj.messages`` is never read,
+        so rows loaded with deferred message columns are safe.
+        
+        Args:
+            obj: ORM task
+        
+        Returns:
+            Task response whose ``messages`` list is empty
+        """
+        return cls.model_construct(**TaskResponse._row_data(obj), messages=[])
\ No newline at end of file
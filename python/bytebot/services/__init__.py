@@ -1,10 +1,20 @@
-"""Business logic services for the Bytebot application."""
+"""Business logic services for the Bytebot application.
 
-from .task_service import TaskService
-from .message_service import MessageService
-from .summary_service import SummaryService
-from .model_service import ModelService
-from .agent_service import AgentService
+Services are imported on first access, so importing one service module
+does not load the others and their schemas.
+"""
+
+import importlib
+from typing import Any
+
+# Exported name -> submodule defining it
+_LAZY_IMPORTS = {
+    "TaskService": ".task_service",
+    "MessageService": ".message_service",
+    "SummaryService": ".summary_service",
+    "ModelService": ".model_service",
+    "AgentService": ".agent_service",
+}
 
 __all__ = [
     "TaskService",
@@ -12,4 +22,19 @@ __all__ = [
     "SummaryService",
     "ModelService",
     "AgentService",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str) -> Any:
+    """Import an exported service on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List the exported services alongside the loaded module globals."""
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
@@ -0,0 +1,30 @@
+"""Aggregate queries shared by the service statistics methods."""
+
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+
+async def grouped_counts(
+    db: AsyncSession,
+    column: ColumnElement,
+    *,
+    limit: Optional[int] = None,
+) -> Dict[Any, int]:
+    """Count rows per value of ``column`` with a single GROUP BY query.
+    
+    Args:
+        db: Database session
+        column: Mapped column to group by
+        limit: Keep only the most frequent values
+    
+    Returns:
+        Mapping of column value to row count
+    """
+    query = select(column, func.count()).group_by(column)
+    if limit is not None:
+        query = query.order_by(func.count().desc()).limit(limit)
+    result = await db.execute(query)
+    return dict(result.tuples().all())
\ No newline at end of file
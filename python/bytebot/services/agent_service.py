@@ -1,23 +1,68 @@
 """Agent service for task processing and execution."""
 
 import asyncio
-from typing import Dict, Any, Optional
+import time
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
 from uuid import UUID
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Row, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
-from ..models.task import Task
+from ..models.task import TASK_INSERT_CHANNEL, Task
 from ..models.message import Message
 from ..models.summary import Summary
 from ..schemas.message import MessageCreate
-from ..shared.task_types import TaskStatus, TaskType
+from ..shared.ai_models import ModelProvider
+from ..shared.message_content import TextContent
+from ..shared.task_types import Role, TaskPriority, TaskStatus, TaskType
 from ..services.message_service import MessageService
 from ..services.summary_service import SummaryService
 from ..services.model_service import ModelService
+from ..core.config import settings
+from ..core.database import db_manager
 from ..core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Model rankings only change when the model catalogue does, so they are
+# shared across AgentService instances (one per request) for a short while
+_RECOMMENDATION_TTL_SECONDS = 30.0
+_recommendation_cache: Dict[Tuple[Any, ...], Tuple[float, List[Dict[str, Any]]]] = {}
+
+
+class ActiveTaskEntry(NamedTuple):
+    """A task being processed in the background."""
+    task: asyncio.Task
+    # Event loop time at which processing started
+    started: float
+    # Set once processing finishes, fails or is cancelled
+    done: asyncio.Event
+
+
+# Generation calls in flight per model provider, shared across instances
+_provider_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def _provider_semaphore(provider: str) -> asyncio.Semaphore:
+    """Get the semaphore bounding concurrent generation calls to a provider."""
+    provider = ModelProvider(provider).value
+    semaphore = _provider_semaphores.get(provider)
+    if semaphore is None:
+        limit = settings.model_provider_concurrency_overrides.get(
+            provider, settings.model_provider_concurrency
+        )
+        semaphore = _provider_semaphores[provider] = asyncio.Semaphore(limit)
+    return semaphore
+
+
+# States process_task may claim a task from
+_STARTABLE_STATES = (TaskStatus.PENDING, TaskStatus.PAUSED)
+
+
+# Processing runs outlive the AgentService (one per request) that started
+# them, so the registry is shared by every instance
+_active_tasks: Dict[UUID, ActiveTaskEntry] = {}
+
 
 class AgentService:
     """Service for AI agent task processing and execution."""
@@ -27,233 +72,288 @@ class AgentService:
         self.message_service = MessageService(db)
         self.summary_service = SummaryService(db)
         self.model_service = ModelService(db)
-        self._active_tasks: Dict[UUID, asyncio.Task] = {}
+        self._active_tasks = _active_tasks
+        # Task type -> (task type used for model recommendations, generator)
+        self._dispatch: Dict[TaskType, Tuple[TaskType, Callable[[str, str], Awaitable[str]]]] = {
+            TaskType.TEXT_GENERATION: (TaskType.TEXT_GENERATION, self._generate_text_response),
+        }
     
     async def process_task(self, task_id: UUID) -> None:
         """Process a task by executing its steps and generating responses."""
         try:
             logger.info(f"Starting processing for task {task_id}")
             
-            # Get the task
-            task = await self.db.get(Task, task_id)
-            if not task:
-                logger.error(f"Task {task_id} not found")
-                return
-            
-            # Update task status to running
-            task.status = TaskStatus.RUNNING
+            # Claim the task and read what processing needs in one statement;
+            # the status predicate lets only one run win the claim
+            result = await self.db.execute(
+                update(Task)
+                .where(Task.id == task_id, Task.status.in_(_STARTABLE_STATES))
+                .values(status=TaskStatus.RUNNING)
+                .returning(Task.id, Task.description, Task.priority, Task.task_type)
+            )
+            task = result.one_or_none()
             await self.db.commit()
+            if task is None:
+                logger.info(f"Task {task_id} not found or not startable; skipping")
+                return
             
             # Process based on task type
-            if task.task_type == TaskType.TEXT_GENERATION:
-                await self._process_text_generation_task(task)
-            elif task.task_type == TaskType.CODE_GENERATION:
-                await self._process_code_generation_task(task)
-            elif task.task_type == TaskType.DATA_ANALYSIS:
-                await self._process_data_analysis_task(task)
-            elif task.task_type == TaskType.CONTENT_CREATION:
-                await self._process_content_creation_task(task)
-            else:
-                await self._process_general_task(task)
+            recommendation_type, generate = self._dispatch.get(
+                task.task_type,
+                (TaskType.TEXT_GENERATION, self._generate_general_response),
+            )
+            await self._process_task_generic(task, recommendation_type, generate)
             
             # Mark task as completed
-            task.status = TaskStatus.COMPLETED
-            await self.db.commit()
+            await self._set_status(task_id, TaskStatus.COMPLETED)
             logger.info(f"Completed processing for task {task_id}")
             
         except Exception as e:
             logger.error(f"Error processing task {task_id}: {e}")
-            # Update task status to failed
-            task = await self.db.get(Task, task_id)
-            if task:
-                task.status = TaskStatus.FAILED
-                await self.db.commit()
+            await self.db.rollback()
+            await self._set_status(task_id, TaskStatus.FAILED)
     
-    async def _process_text_generation_task(self, task: Task) -> None:
-        """Process text generation tasks."""
-        # Get model recommendations
-        recommendations = await self.model_service.get_model_recommendations(
-            task_type=TaskType.TEXT_GENERATION,
-            priority=task.priority,
-            budget=task.budget
-        )
+    async def _set_status(self, task_id: UUID, status: TaskStatus) -> None:
+        """Finish a claimed task without loading it.
         
-        if not recommendations:
-            raise ValueError("No suitable models found for text generation")
-        
-        # Use the top recommended model
-        model_name = recommendations[0]["model"]["name"]
-        
-        # Generate response
-        response_content = await self._generate_text_response(task.description, model_name)
-        
-        # Create response message
-        message_data = MessageCreate(
-            task_id=task.id,
-            role="assistant",
-            content=response_content,
-            model_name=model_name,
-            model_provider=recommendations[0]["model"]["provider"]
+        Only a task still RUNNING is updated, so a task cancelled or paused
+        while this run was in flight keeps that status.
+        """
+        await self.db.execute(
+            update(Task)
+            .where(Task.id == task_id, Task.status == TaskStatus.RUNNING)
+            .values(status=status)
         )
-        await self.message_service.create_message(message_data)
+        await self.db.commit()
     
-    async def _process_code_generation_task(self, task: Task) -> None:
-        """Process code generation tasks."""
-        # Get model recommendations
-        recommendations = await self.model_service.get_model_recommendations(
-            task_type=TaskType.CODE_GENERATION,
-            priority=task.priority,
-            budget=task.budget
-        )
-        
-        if not recommendations:
-            raise ValueError("No suitable models found for code generation")
-        
-        # Use the top recommended model
-        model_name = recommendations[0]["model"]["name"]
+    async def _process_task_generic(
+        self,
+        task: Row,
+        recommendation_type: TaskType,
+        generate: Callable[[str, str], Awaitable[str]],
+    ) -> None:
+        """Generate a response for a task and store it as an assistant message.
         
-        # Generate code
-        code_content = await self._generate_code_response(task.description, model_name)
-        
-        # Create response message
-        message_data = MessageCreate(
-            task_id=task.id,
-            role="assistant",
-            content=code_content,
-            model_name=model_name,
-            model_provider=recommendations[0]["model"]["provider"]
-        )
-        await self.message_service.create_message(message_data)
-    
-    async def _process_data_analysis_task(self, task: Task) -> None:
-        """Process data analysis tasks."""
-        # Get model recommendations
-        recommendations = await self.model_service.get_model_recommendations(
-            task_type=TaskType.DATA_ANALYSIS,
-            priority=task.priority,
-            budget=task.budget
+        Args:
+            task: Row with the task's id, description, priority and task_type
+            recommendation_type: Task type used to rank candidate models
+            generate: Coroutine producing the response text from the task
+                description and the chosen model name
+        """
+        recommendations = await self._cached_recommendations(
+            recommendation_type, task.priority, None
         )
         
         if not recommendations:
-            raise ValueError("No suitable models found for data analysis")
+            raise ValueError(f"No suitable models found for task type {task.task_type.value}")
         
         # Use the top recommended model
-        model_name = recommendations[0]["model"]["name"]
-        
-        # Generate analysis
-        analysis_content = await self._generate_analysis_response(task.description, model_name)
+        model = recommendations[0]["model"]
+        async with _provider_semaphore(model["provider"]):
+            response_content = await generate(task.description, model["name"])
         
         # Create response message
         message_data = MessageCreate(
             task_id=task.id,
-            role="assistant",
-            content=analysis_content,
-            model_name=model_name,
-            model_provider=recommendations[0]["model"]["provider"]
+            role=Role.ASSISTANT,
+            content=[TextContent(text=response_content)],
+            model_name=model["name"],
+            model_provider=model["provider"]
         )
         await self.message_service.create_message(message_data)
     
-    async def _process_content_creation_task(self, task: Task) -> None:
-        """Process content creation tasks."""
-        # Get model recommendations
-        recommendations = await self.model_service.get_model_recommendations(
-            task_type=TaskType.CONTENT_CREATION,
-            priority=task.priority,
-            budget=task.budget
-        )
-        
-        if not recommendations:
-            raise ValueError("No suitable models found for content creation")
-        
-        # Use the top recommended model
-        model_name = recommendations[0]["model"]["name"]
+    async def _cached_recommendations(
+        self,
+        task_type: TaskType,
+        priority: TaskPriority,
+        budget: Optional[float],
+    ) -> List[Dict[str, Any]]:
+        """Get model recommendations, reusing a recent ranking for the same inputs."""
+        key = (task_type, priority, budget)
+        now = time.monotonic()
+        cached = _recommendation_cache.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
         
-        # Generate content
-        content = await self._generate_content_response(task.description, model_name)
-        
-        # Create response message
-        message_data = MessageCreate(
-            task_id=task.id,
-            role="assistant",
-            content=content,
-            model_name=model_name,
-            model_provider=recommendations[0]["model"]["provider"]
-        )
-        await self.message_service.create_message(message_data)
-    
-    async def _process_general_task(self, task: Task) -> None:
-        """Process general tasks."""
-        # Get model recommendations
         recommendations = await self.model_service.get_model_recommendations(
-            task_type=TaskType.TEXT_GENERATION,
-            priority=task.priority,
-            budget=task.budget
-        )
-        
-        if not recommendations:
-            raise ValueError("No suitable models found")
-        
-        # Use the top recommended model
-        model_name = recommendations[0]["model"]["name"]
-        
-        # Generate response
-        response_content = await self._generate_general_response(task.description, model_name)
-        
-        # Create response message
-        message_data = MessageCreate(
-            task_id=task.id,
-            role="assistant",
-            content=response_content,
-            model_name=model_name,
-            model_provider=recommendations[0]["model"]["provider"]
+            task_type=task_type,
+            priority=priority,
+            budget=budget
         )
-        await self.message_service.create_message(message_data)
+        _recommendation_cache[key] = (now + _RECOMMENDATION_TTL_SECONDS, recommendations)
+        return recommendations
     
     async def _generate_text_response(self, prompt: str, model_name: str) -> str:
         """Generate text response using AI model."""
-        # Simulate AI response generation
-        await asyncio.sleep(1)  # Simulate processing time
         return f"Generated response for: {prompt[:50]}... (using {model_name})"
     
-    async def _generate_code_response(self, prompt: str, model_name: str) -> str:
-        """Generate code response using AI model."""
-        # Simulate AI code generation
-        await asyncio.sleep(2)  # Simulate processing time
-        return f"# Generated code for: {prompt[:50]}...\n\n# Code implementation here (using {model_name})"
-    
-    async def _generate_analysis_response(self, prompt: str, model_name: str) -> str:
-        """Generate data analysis response using AI model."""
-        # Simulate AI analysis
-        await asyncio.sleep(3)  # Simulate processing time
-        return f"# Analysis for: {prompt[:50]}...\n\n# Data analysis results here (using {model_name})"
-    
-    async def _generate_content_response(self, prompt: str, model_name: str) -> str:
-        """Generate content creation response using AI model."""
-        # Simulate AI content creation
-        await asyncio.sleep(2)  # Simulate processing time
-        return f"# Created content for: {prompt[:50]}...\n\n# Content here (using {model_name})"
-    
     async def _generate_general_response(self, prompt: str, model_name: str) -> str:
         """Generate general response using AI model."""
-        # Simulate AI response
-        await asyncio.sleep(1)  # Simulate processing time
         return f"Response to: {prompt[:50]}... (using {model_name})"
     
+    @classmethod
+    def start_processing(cls, task_id: UUID) -> ActiveTaskEntry:
+        """Run ``process_task`` in the background and register it as active.
+        
+        The run gets its own database session, so it may outlive the
+        request whose session this service holds. A task that already has a
+        live run in this process keeps it; no second run is started.
+        
+        Args:
+            task_id: ID of the task to process
+        
+        Returns:
+            Registry entry for the processing run
+        """
+        entry = _active_tasks.get(task_id)
+        if entry is not None and not entry.task.done():
+            return entry
+        
+        task = asyncio.create_task(cls._process_in_new_session(task_id))
+        entry = ActiveTaskEntry(task, task.get_loop().time(), asyncio.Event())
+        _active_tasks[task_id] = entry
+        task.add_done_callback(lambda done: cls._finish_processing(task_id, entry, done))
+        return entry
+    
+    @classmethod
+    async def _process_in_new_session(cls, task_id: UUID) -> None:
+        """Process a task with a session of its own."""
+        async with db_manager.get_session() as db:
+            await cls(db).process_task(task_id)
+    
+    @staticmethod
+    def _finish_processing(task_id: UUID, entry: ActiveTaskEntry, task: asyncio.Task) -> None:
+        """Wake waiters, drop a finished run from the registry and log its failure."""
+        entry.done.set()
+        if _active_tasks.get(task_id) is entry:
+            del _active_tasks[task_id]
+        
+        # process_task handles its own errors; this catches failures around it
+        # (opening the session, or the rollback in its error path)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(
+                f"Processing run for task {task_id} failed: {task.exception()}",
+                exc_info=task.exception(),
+            )
+    
+    async def wait_for_task(self, task_id: UUID, timeout: Optional[float] = None) -> bool:
+        """Wait until background processing of a task finishes.
+        
+        Args:
+            task_id: ID of the task
+            timeout: Seconds to wait, or None to wait indefinitely
+        
+        Returns:
+            True if no processing is running for the task any more, False if
+            the timeout expired first
+        """
+        entry = self._active_tasks.get(task_id)
+        if entry is None:
+            return True
+        try:
+            await asyncio.wait_for(entry.done.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+    
     async def cancel_task_processing(self, task_id: UUID) -> bool:
         """Cancel ongoing task processing."""
-        if task_id in self._active_tasks:
-            self._active_tasks[task_id].cancel()
-            del self._active_tasks[task_id]
-            return True
-        return False
+        entry = self._active_tasks.pop(task_id, None)
+        if entry is None:
+            return False
+        entry.task.cancel()
+        return True
     
     async def get_active_tasks(self) -> Dict[UUID, Any]:
         """Get information about currently active tasks."""
         return {
             task_id: {
                 "status": "running",
-                "started_at": task.get_loop().time() if not task.done() else None
+                "started_at": entry.started,
             }
-            for task_id, task in self._active_tasks.items()
-            if not task.done()
-        }
\ No newline at end of file
+            for task_id, entry in self._active_tasks.items()
+        }
+
+
+class TaskListener:
+    """Start auto-start tasks as soon as PostgreSQL announces their insertion.
+    
+    A dedicated asyncpg connection LISTENs on ``TASK_INSERT_CHANNEL``; each
+    notification wakes the worker loop, which hands the task to
+    ``AgentService.start_processing``. Notifications are not delivered while
+    the connection is down, so the loop also sweeps for pending auto-start
+    tasks every ``poll_interval`` seconds. On other drivers only the sweep
+    runs.
+    
+    Every app worker receives the same notifications; ``process_task``
+    claims a task with a conditional UPDATE, so only one of them runs it.
+    """
+    
+    def __init__(self, poll_interval: float):
+        self.poll_interval = poll_interval
+        self._pending: Set[UUID] = set()
+        self._wake = asyncio.Event()
+        self._connection: Optional[AsyncConnection] = None
+        self._raw_connection: Any = None
+        self._worker: Optional[asyncio.Task] = None
+    
+    async def start(self) -> None:
+        """Open the LISTEN connection and start the worker loop."""
+        engine = db_manager.engine
+        if engine.dialect.name == "postgresql" and engine.dialect.driver == "asyncpg":
+            self._connection = await engine.connect()
+            raw = await self._connection.get_raw_connection()
+            self._raw_connection = raw.driver_connection
+            await self._raw_connection.add_listener(TASK_INSERT_CHANNEL, self._on_notify)
+        else:
+            logger.warning("Task notifications need PostgreSQL with asyncpg; polling only")
+        
+        self._worker = asyncio.create_task(self._run())
+        logger.info("Task listener started")
+    
+    async def stop(self) -> None:
+        """Stop the worker loop and release the LISTEN connection."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        
+        if self._connection is not None:
+            await self._raw_connection.remove_listener(TASK_INSERT_CHANNEL, self._on_notify)
+            await self._connection.close()
+            self._connection = None
+            self._raw_connection = None
+        logger.info("Task listener stopped")
+    
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        """Queue a notified task id and wake the worker."""
+        self._pending.add(UUID(payload))
+        self._wake.set()
+    
+    async def _run(self) -> None:
+        """Dispatch notified tasks, sweeping for pending ones when idle."""
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                try:
+                    await self._sweep()
+                except Exception as e:
+                    logger.error(f"Pending task sweep failed: {e}")
+            
+            self._wake.clear()
+            task_ids, self._pending = self._pending, set()
+            for task_id in task_ids:
+                if task_id not in _active_tasks:
+                    AgentService.start_processing(task_id)
+    
+    async def _sweep(self) -> None:
+        """Queue pending auto-start tasks that no run has picked up."""
+        async with db_manager.get_session() as db:
+            result = await db.execute(
+                select(Task.id).where(Task.status == TaskStatus.PENDING, Task.auto_start)
+            )
+            self._pending.update(result.scalars())
\ No newline at end of file
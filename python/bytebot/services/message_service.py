@@ -4,10 +4,11 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import and_, desc, func, or_
+from sqlalchemy import Row, Select, and_, bindparam, desc, func, not_, or_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload, selectinload
 
 from ..core.exceptions import (
     BytebotNotFoundException,
@@ -20,9 +21,84 @@ from ..models.task import Task
 from ..schemas.message import MessageCreate, MessageUpdate
 from ..shared.task_types import Role
 from ..shared.message_content import MessageContentBlock
+from ._stats import grouped_counts
 
 logger = get_logger(__name__)
 
+# SQLSTATE foreign_key_violation
+_FOREIGN_KEY_VIOLATION = "23503"
+
+
+def _is_foreign_key_violation(error: IntegrityError) -> bool:
+    """Check whether an IntegrityError was raised by a foreign key constraint."""
+    orig = error.orig
+    if getattr(orig, "sqlstate", None) == _FOREIGN_KEY_VIOLATION:
+        return True
+    # SQLite reports no SQLSTATE
+    return "FOREIGN KEY constraint failed" in str(orig)
+
+
+def _violated_constraint(error: IntegrityError) -> Optional[str]:
+    """Name of the constraint behind an IntegrityError, if the driver reports it."""
+    orig = error.orig
+    # asyncpg keeps it on the wrapped exception, psycopg on its diagnostics
+    for source in (orig, getattr(orig, "__cause__", None), getattr(orig, "diag", None)):
+        name = getattr(source, "constraint_name", None)
+        if name:
+            return name
+    return None
+
+
+# Fixed-shape statements built once at import; per-call values are bound
+# parameters, so each call only binds values and hits the compiled cache
+_GET_MESSAGE = (
+    select(Message)
+    .options(
+        selectinload(Message.task)
+        .load_only(Task.title, Task.status)
+        .raiseload("*"),
+        selectinload(Message.child_messages).defer(Message.content),
+    )
+    .where(Message.id == bindparam("message_id"))
+)
+
+
+def _conversation_query(*entities: Any, include_system: bool) -> Select:
+    """Build the statement selecting a task's conversation, oldest first."""
+    query = select(*entities).where(Message.task_id == bindparam("task_id"))
+    if not include_system:
+        query = query.where(Message.role != Role.SYSTEM)
+    return query.order_by(Message.created_at).limit(bindparam("limit"))
+
+
+# Columns returned by get_conversation_history_rows
+_HISTORY_COLUMNS = (Message.role, Message.content, Message.created_at)
+
+# (plain rows, include_system) -> statement
+_CONVERSATION_QUERIES = {
+    (rows, include_system): _conversation_query(
+        *(_HISTORY_COLUMNS if rows else (Message,)), include_system=include_system
+    )
+    for rows in (False, True)
+    for include_system in (True, False)
+}
+
+_HAS_TOKENS = and_(
+    Message.input_tokens.is_not(None),
+    Message.output_tokens.is_not(None),
+)
+# Role counts ride along with the token and processing totals in one
+# aggregate pass
+_MESSAGE_TOTALS = select(
+    func.sum(Message.input_tokens).filter(_HAS_TOKENS),
+    func.sum(Message.output_tokens).filter(_HAS_TOKENS),
+    func.avg(Message.input_tokens).filter(_HAS_TOKENS),
+    func.avg(Message.output_tokens).filter(_HAS_TOKENS),
+    func.count().filter(Message.is_processed.is_(True)),
+    func.count().filter(Message.processing_error.is_not(None)),
+    *(func.count().filter(Message.role == role) for role in Role),
+)
+
 
 class MessageService:
     """Service for message-related operations."""
@@ -34,51 +110,94 @@ class MessageService:
         """Create a new message."""
         logger.info(f"Creating new message for task {message_data.task_id}")
         
-        # Validate task exists
-        task_result = await self.db.execute(
-            select(Task).where(Task.id == message_data.task_id)
+        # The task and parent message foreign keys stand in for lookups
+        message = self._build_message(message_data)
+        self.db.add(message)
+        try:
+            # Server defaults come back through INSERT ... RETURNING, so there
+            # is nothing to refresh
+            await self.db.commit()
+        except IntegrityError as e:
+            await self.db.rollback()
+            if not _is_foreign_key_violation(e):
+                raise
+            if message_data.parent_message_id and await self._parent_was_missing(e, message_data):
+                raise BytebotNotFoundException(
+                    f"Parent message {message_data.parent_message_id} not found"
+                ) from e
+            raise BytebotNotFoundException(f"Task {message_data.task_id} not found") from e
+        
+        logger.info(f"Created message {message.id} successfully")
+        return message
+    
+    async def _parent_was_missing(self, error: IntegrityError, message_data: MessageCreate) -> bool:
+        """Tell whether a foreign key violation came from the parent message.
+        
+        PostgreSQL names the violated constraint; SQLite does not, so the
+        task is looked up instead, and a present task blames the parent.
+        """
+        constraint = _violated_constraint(error)
+        if constraint is not None:
+            return "parent_message_id" in constraint
+        
+        task_exists = await self.db.scalar(
+            select(Task.id).where(Task.id == message_data.task_id)
         )
-        task = task_result.scalar_one_or_none()
-        if not task:
-            raise BytebotNotFoundException(f"Task {message_data.task_id} not found")
-        
-        # Validate parent message if specified
-        if message_data.parent_message_id:
-            parent_message = await self.get_message(message_data.parent_message_id)
-            if not parent_message:
-                raise BytebotNotFoundException(f"Parent message {message_data.parent_message_id} not found")
-        
-        # Create message instance
-        message = Message(
+        return task_exists is not None
+    
+    async def create_messages_bulk(self, messages_data: List[MessageCreate]) -> List[Message]:
+        """Create several messages with one flush and one commit.
+        
+        A dangling task or parent message reference fails the whole batch
+        on its foreign key.
+        
+        Args:
+            messages_data: Messages to create, in order
+        
+        Returns:
+            Created messages, in input order
+        """
+        messages = [self._build_message(message_data) for message_data in messages_data]
+        if not messages:
+            return messages
+        
+        logger.info(f"Creating {len(messages)} messages")
+        
+        self.db.add_all(messages)
+        await self.db.commit()
+        return messages
+    
+    @staticmethod
+    def _build_message(message_data: MessageCreate) -> Message:
+        """Create a ``Message`` instance from a create schema."""
+        return Message(
             task_id=message_data.task_id,
             role=message_data.role,
-            content=message_data.content,
-            metadata=message_data.metadata,
+            content=[block.model_dump(mode="json") for block in message_data.content],
+            message_metadata=message_data.message_metadata,
             parent_message_id=message_data.parent_message_id,
-            model_name=message_data.model_name,
-            model_provider=message_data.model_provider,
-            model_version=message_data.model_version,
+            model=message_data.model_name,
+            provider=message_data.model_provider,
         )
-        
-        self.db.add(message)
-        await self.db.commit()
-        await self.db.refresh(message)
-        
-        logger.info(f"Created message {message.id} successfully")
-        return message
     
     async def get_message(self, message_id: UUID) -> Optional[Message]:
-        """Get a message by ID."""
-        result = await self.db.execute(
-            select(Message)
-            .options(
-                selectinload(Message.task),
-                selectinload(Message.child_messages),
-            )
-            .where(Message.id == message_id)
-        )
+        """Get a message by ID.
+        
+        The related task and child messages are loaded without their large
+        columns; only the message itself is returned in full.
+        """
+        result = await self.db.execute(_GET_MESSAGE, {"message_id": message_id})
         return result.scalar_one_or_none()
     
+    async def _get_message_minimal(self, message_id: UUID) -> Optional[Message]:
+        """Get a message by ID without loading its relationships.
+        
+        Used by the write paths, which never touch the task or child
+        messages; an instance already in the session is returned without
+        a query.
+        """
+        return await self.db.get(Message, message_id, options=[raiseload("*")])
+    
     async def list_messages(
         self,
         skip: int = 0,
@@ -91,8 +210,8 @@ class MessageService:
         parent_message_id: Optional[UUID] = None,
     ) -> Tuple[List[Message], int]:
         """List messages with filtering and pagination."""
-        query = select(Message)
-        count_query = select(func.count(Message.id))
+        # The total rides along with every row as a window aggregate
+        query = select(Message, func.count().over().label("total"))
         
         # Apply filters
         conditions = []
@@ -107,45 +226,36 @@ class MessageService:
             conditions.append(Message.parent_message_id == parent_message_id)
         
         if search:
-            # Search in text content (this is a simplified search)
-            # In a real implementation, you might want to use full-text search
-            search_condition = Message.content.cast(str).ilike(f"%{search}%")
-            conditions.append(search_condition)
+            conditions.append(Message.content_text_matches(search))
         
-        # Note: has_tool_use and has_images would require more complex JSON queries
-        # For now, we'll skip these filters in the database query
-        # and filter in Python if needed
+        # Content block filters run before LIMIT so pages and totals agree
+        for block_type, wanted in (("tool_use", has_tool_use), ("image", has_images)):
+            if wanted is not None:
+                condition = Message.contains_block_type(block_type)
+                conditions.append(condition if wanted else not_(condition))
         
         if conditions:
             query = query.where(and_(*conditions))
-            count_query = count_query.where(and_(*conditions))
         
         # Apply ordering and pagination
         query = query.order_by(desc(Message.created_at)).offset(skip).limit(limit)
         
-        # Execute queries
-        result = await self.db.execute(query)
-        messages = result.scalars().all()
-        
-        # Apply Python-based filters if needed
-        if has_tool_use is not None or has_images is not None:
-            filtered_messages = []
-            for message in messages:
-                if has_tool_use is not None and message.has_tool_use != has_tool_use:
-                    continue
-                if has_images is not None and message.has_images != has_images:
-                    continue
-                filtered_messages.append(message)
-            messages = filtered_messages
-        
-        count_result = await self.db.execute(count_query)
-        total = count_result.scalar()
-        
-        return list(messages), total
+        rows = (await self.db.execute(query)).all()
+        if rows:
+            return [row[0] for row in rows], rows[0].total
+        
+        # An empty page carries no total; count separately unless nothing matched at all
+        if not skip:
+            return [], 0
+        count_query = select(func.count(Message.id))
+        if conditions:
+            count_query = count_query.where(and_(*conditions))
+        total = (await self.db.execute(count_query)).scalar()
+        return [], total
     
     async def update_message(self, message_id: UUID, message_data: MessageUpdate) -> Optional[Message]:
         """Update a message."""
-        message = await self.get_message(message_id)
+        message = await self._get_message_minimal(message_id)
         if not message:
             return None
         
@@ -156,14 +266,13 @@ class MessageService:
         message.update_from_dict(update_data)
         
         await self.db.commit()
-        await self.db.refresh(message)
         
         logger.info(f"Updated message {message_id} successfully")
         return message
     
     async def delete_message(self, message_id: UUID) -> bool:
         """Delete a message."""
-        message = await self.get_message(message_id)
+        message = await self._get_message_minimal(message_id)
         if not message:
             return False
         
@@ -178,7 +287,7 @@ class MessageService:
     
     async def add_content_block(self, message_id: UUID, content_block: MessageContentBlock) -> Optional[Message]:
         """Add a content block to a message."""
-        message = await self.get_message(message_id)
+        message = await self._get_message_minimal(message_id)
         if not message:
             return None
         
@@ -186,13 +295,12 @@ class MessageService:
         
         message.add_content_block(content_block)
         await self.db.commit()
-        await self.db.refresh(message)
         
         return message
     
     async def mark_processed(self, message_id: UUID) -> Optional[Message]:
         """Mark a message as processed."""
-        message = await self.get_message(message_id)
+        message = await self._get_message_minimal(message_id)
         if not message:
             return None
         
@@ -200,13 +308,12 @@ class MessageService:
         
         message.mark_processed()
         await self.db.commit()
-        await self.db.refresh(message)
         
         return message
     
     async def mark_processing_failed(self, message_id: UUID, error_message: str) -> Optional[Message]:
         """Mark message processing as failed."""
-        message = await self.get_message(message_id)
+        message = await self._get_message_minimal(message_id)
         if not message:
             return None
         
@@ -214,7 +321,6 @@ class MessageService:
         
         message.mark_processing_failed(error_message)
         await self.db.commit()
-        await self.db.refresh(message)
         
         return message
     
@@ -226,7 +332,7 @@ class MessageService:
         processing_time_ms: Optional[int] = None,
     ) -> Optional[Message]:
         """Update token usage for a message."""
-        message = await self.get_message(message_id)
+        message = await self._get_message_minimal(message_id)
         if not message:
             return None
         
@@ -237,7 +343,6 @@ class MessageService:
             message.processing_time_ms = processing_time_ms
         
         await self.db.commit()
-        await self.db.refresh(message)
         
         return message
     
@@ -253,7 +358,7 @@ class MessageService:
             task_id=task_id,
             role=role,
             content=[{"type": "text", "text": text}],
-            metadata=metadata or {},
+            message_metadata=metadata or {},
         )
         return await self.create_message(message_data)
     
@@ -278,7 +383,7 @@ class MessageService:
             task_id=task_id,
             role=Role.ASSISTANT,
             content=[content_block],
-            metadata=metadata or {},
+            message_metadata=metadata or {},
         )
         return await self.create_message(message_data)
     
@@ -302,7 +407,7 @@ class MessageService:
             task_id=task_id,
             role=Role.TOOL,
             content=[content_block],
-            metadata=metadata or {},
+            message_metadata=metadata or {},
         )
         return await self.create_message(message_data)
     
@@ -313,84 +418,61 @@ class MessageService:
         include_system: bool = True,
     ) -> List[Message]:
         """Get conversation history for a task."""
-        conditions = [Message.task_id == task_id]
+        result = await self.db.execute(
+            _CONVERSATION_QUERIES[False, include_system],
+            {"task_id": task_id, "limit": limit},
+        )
+        return list(result.scalars().all())
+    
+    async def get_conversation_history_rows(
+        self,
+        task_id: UUID,
+        limit: int = 50,
+        include_system: bool = True,
+    ) -> List[Row]:
+        """Get conversation history for a task as plain rows.
         
-        if not include_system:
-            conditions.append(Message.role != Role.SYSTEM)
+        Skips ORM hydration and the identity map for callers that only
+        replay the conversation.
         
-        query = (
-            select(Message)
-            .where(and_(*conditions))
-            .order_by(Message.created_at)
-            .limit(limit)
-        )
+        Args:
+            task_id: ID of the task
+            limit: Maximum number of messages to return
+            include_system: Whether to include system messages
         
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
+        Returns:
+            ``(role, content, created_at)`` rows, oldest first
+        """
+        result = await self.db.execute(
+            _CONVERSATION_QUERIES[True, include_system],
+            {"task_id": task_id, "limit": limit},
+        )
+        return list(result.all())
     
     async def get_message_stats(self) -> Dict[str, Any]:
         """Get message statistics."""
-        # Count messages by role
-        role_query = (
-            select(Message.role, func.count(Message.id))
-            .group_by(Message.role)
-        )
-        role_result = await self.db.execute(role_query)
-        role_counts = dict(role_result.fetchall())
-        
-        # Count messages by task
-        task_query = (
-            select(Message.task_id, func.count(Message.id))
-            .group_by(Message.task_id)
-            .limit(10)  # Top 10 tasks by message count
-        )
-        task_result = await self.db.execute(task_query)
-        task_counts = dict(task_result.fetchall())
-        
-        # Calculate token statistics
-        token_query = (
-            select(
-                func.sum(Message.input_tokens),
-                func.sum(Message.output_tokens),
-                func.avg(Message.input_tokens),
-                func.avg(Message.output_tokens),
-            )
-            .where(
-                and_(
-                    Message.input_tokens.is_not(None),
-                    Message.output_tokens.is_not(None),
-                )
-            )
-        )
-        token_result = await self.db.execute(token_query)
-        token_stats = token_result.fetchone()
-        
-        # Calculate processing statistics
-        processing_query = (
-            select(
-                func.count(Message.id).filter(Message.is_processed == True),
-                func.count(Message.id).filter(Message.processing_error.is_not(None)),
-                func.avg(Message.processing_time_ms),
-            )
-        )
-        processing_result = await self.db.execute(processing_query)
-        processing_stats = processing_result.fetchone()
-        
-        total_messages = sum(role_counts.values())
+        # Only the top 10 tasks need their own GROUP BY
+        (
+            input_tokens, output_tokens, avg_input, avg_output,
+            processed, failed, *per_role,
+        ) = (await self.db.execute(_MESSAGE_TOTALS)).one()
+        role_counts = {role: count for role, count in zip(Role, per_role) if count}
+        task_counts = await grouped_counts(self.db, Message.task_id, limit=10)
         
         return {
-            "total_messages": total_messages,
-            "role_counts": {str(k): v for k, v in role_counts.items()},
+            "total_messages": sum(role_counts.values()),
+            "role_counts": role_counts,
             "top_tasks_by_messages": {str(k): v for k, v in task_counts.items()},
             "token_stats": {
-                "total_input_tokens": int(token_stats[0]) if token_stats[0] else 0,
-                "total_output_tokens": int(token_stats[1]) if token_stats[1] else 0,
-                "avg_input_tokens": float(token_stats[2]) if token_stats[2] else 0.0,
-                "avg_output_tokens": float(token_stats[3]) if token_stats[3] else 0.0,
+                "total_input_tokens": int(input_tokens or 0),
+                "total_output_tokens": int(output_tokens or 0),
+                "avg_input_tokens": float(avg_input or 0.0),
+                "avg_output_tokens": float(avg_output or 0.0),
             },
             "processing_stats": {
-                "processed_messages": int(processing_stats[0]) if processing_stats[0] else 0,
-                "failed_messages": int(processing_stats[1]) if processing_stats[1] else 0,
-                "avg_processing_time_ms": float(processing_stats[2]) if processing_stats[2] else 0.0,
+                "processed_messages": processed,
+                "failed_messages": failed,
+                # Messages do not record processing time
+                "avg_processing_time_ms": None,
             },
         }
\ No newline at end of file
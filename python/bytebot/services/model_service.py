@@ -1,10 +1,15 @@
 """Model service for AI model management and operations."""
 
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+import heapq
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, List, Mapping, NamedTuple, Optional, Tuple, Union
 from uuid import UUID
 
-from sqlalchemy import and_, desc, func, or_
+from sqlalchemy import ColumnElement, Select, and_, case, desc, func, literal, or_, true, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -17,184 +22,397 @@ from ..core.logging import get_logger
 from ..models.message import Message
 from ..models.summary import Summary
 from ..models.task import Task
-from ..shared.ai_models import AIModel, ModelProvider, ModelCapability
+from ..shared.ai_models import AIModel, ModelProvider, ModelCapability, capability_mask
 from ..shared.task_types import TaskType, TaskPriority
 
 logger = get_logger(__name__)
 
 
+def _build_models() -> Mapping[str, AIModel]:
+    """Build the read-only catalog of available AI models.
+    
+    The entries are known-good literals, so they skip Pydantic validation.
+    """
+    models = {
+        # Claude models
+        "claude-3-5-sonnet-20241022": AIModel.model_construct(
+            name="claude-3-5-sonnet-20241022",
+            provider=ModelProvider.ANTHROPIC,
+            version="20241022",
+            display_name="Claude 3.5 Sonnet",
+            description="Most intelligent model with excellent reasoning and coding capabilities",
+            max_tokens=200000,
+            context_window=200000,
+            input_cost_per_token=0.000003,
+            output_cost_per_token=0.000015,
+            capabilities=[
+                ModelCapability.TEXT_GENERATION,
+                ModelCapability.CODE_GENERATION,
+                ModelCapability.REASONING,
+                ModelCapability.TOOL_USE,
+                ModelCapability.IMAGE_ANALYSIS,
+            ],
+            supports_streaming=True,
+            supports_function_calling=True,
+            supports_vision=True,
+            rate_limit_rpm=4000,
+            rate_limit_tpm=400000,
+        ),
+        "claude-3-haiku-20240307": AIModel.model_construct(
+            name="claude-3-haiku-20240307",
+            provider=ModelProvider.ANTHROPIC,
+            version="20240307",
+            display_name="Claude 3 Haiku",
+            description="Fastest model for simple tasks and quick responses",
+            max_tokens=200000,
+            context_window=200000,
+            input_cost_per_token=0.00000025,
+            output_cost_per_token=0.00000125,
+            capabilities=[
+                ModelCapability.TEXT_GENERATION,
+                ModelCapability.CODE_GENERATION,
+                ModelCapability.TOOL_USE,
+                ModelCapability.IMAGE_ANALYSIS,
+            ],
+            supports_streaming=True,
+            supports_function_calling=True,
+            supports_vision=True,
+            rate_limit_rpm=4000,
+            rate_limit_tpm=400000,
+        ),
+        # OpenAI models
+        "gpt-4o": AIModel.model_construct(
+            name="gpt-4o",
+            provider=ModelProvider.OPENAI,
+            version="2024-08-06",
+            display_name="GPT-4o",
+            description="High-intelligence flagship model for complex, multi-step tasks",
+            max_tokens=128000,
+            context_window=128000,
+            input_cost_per_token=0.0000025,
+            output_cost_per_token=0.00001,
+            capabilities=[
+                ModelCapability.TEXT_GENERATION,
+                ModelCapability.CODE_GENERATION,
+                ModelCapability.REASONING,
+                ModelCapability.TOOL_USE,
+                ModelCapability.IMAGE_ANALYSIS,
+            ],
+            supports_streaming=True,
+            supports_function_calling=True,
+            supports_vision=True,
+            rate_limit_rpm=10000,
+            rate_limit_tpm=2000000,
+        ),
+        "gpt-4o-mini": AIModel.model_construct(
+            name="gpt-4o-mini",
+            provider=ModelProvider.OPENAI,
+            version="2024-07-18",
+            display_name="GPT-4o Mini",
+            description="Affordable and intelligent small model for fast, lightweight tasks",
+            max_tokens=128000,
+            context_window=128000,
+            input_cost_per_token=0.00000015,
+            output_cost_per_token=0.0000006,
+            capabilities=[
+                ModelCapability.TEXT_GENERATION,
+                ModelCapability.CODE_GENERATION,
+                ModelCapability.TOOL_USE,
+                ModelCapability.IMAGE_ANALYSIS,
+            ],
+            supports_streaming=True,
+            supports_function_calling=True,
+            supports_vision=True,
+            rate_limit_rpm=30000,
+            rate_limit_tpm=10000000,
+        ),
+        # Google models
+        "gemini-1.5-pro": AIModel.model_construct(
+            name="gemini-1.5-pro",
+            provider=ModelProvider.GOOGLE,
+            version="001",
+            display_name="Gemini 1.5 Pro",
+            description="Mid-size multimodal model that supports up to 1 million tokens",
+            max_tokens=1000000,
+            context_window=1000000,
+            input_cost_per_token=0.00000125,
+            output_cost_per_token=0.000005,
+            capabilities=[
+                ModelCapability.TEXT_GENERATION,
+                ModelCapability.CODE_GENERATION,
+                ModelCapability.REASONING,
+                ModelCapability.TOOL_USE,
+                ModelCapability.IMAGE_ANALYSIS,
+            ],
+            supports_streaming=True,
+            supports_function_calling=True,
+            supports_vision=True,
+            rate_limit_rpm=2000,
+            rate_limit_tpm=32000,
+        ),
+        "gemini-1.5-flash": AIModel.model_construct(
+            name="gemini-1.5-flash",
+            provider=ModelProvider.GOOGLE,
+            version="001",
+            display_name="Gemini 1.5 Flash",
+            description="Fast and versatile multimodal model for scaling across diverse tasks",
+            max_tokens=1000000,
+            context_window=1000000,
+            input_cost_per_token=0.000000075,
+            output_cost_per_token=0.0000003,
+            capabilities=[
+                ModelCapability.TEXT_GENERATION,
+                ModelCapability.CODE_GENERATION,
+                ModelCapability.TOOL_USE,
+                ModelCapability.IMAGE_ANALYSIS,
+            ],
+            supports_streaming=True,
+            supports_function_calling=True,
+            supports_vision=True,
+            rate_limit_rpm=15000,
+            rate_limit_tpm=1000000,
+        ),
+    }
+    return MappingProxyType(models)
+
+
+def _index_models(
+    models: Mapping[str, AIModel],
+) -> Tuple[Mapping[ModelProvider, Tuple[AIModel, ...]], Mapping[ModelCapability, Tuple[AIModel, ...]]]:
+    """Group models by provider and by capability in a single pass."""
+    by_provider: Dict[ModelProvider, List[AIModel]] = {}
+    by_capability: Dict[ModelCapability, List[AIModel]] = {}
+    for model in models.values():
+        by_provider.setdefault(model.provider, []).append(model)
+        for capability in model.capability_set:
+            by_capability.setdefault(capability, []).append(model)
+    
+    return (
+        MappingProxyType({provider: tuple(group) for provider, group in by_provider.items()}),
+        MappingProxyType({capability: tuple(group) for capability, group in by_capability.items()}),
+    )
+
+
+def _token_rate(model_column: Any, rate: str) -> ColumnElement:
+    """Map a model name column to one of the catalog's per-token rates.
+    
+    Args:
+        model_column: Column holding the model name
+        rate: AIModel attribute with the per-token cost
+    
+    Returns:
+        CASE expression yielding the rate, or 0 for models not in the catalog
+    """
+    return case(
+        {name: getattr(model, rate) for name, model in _AVAILABLE_MODELS.items()},
+        value=model_column,
+        else_=0.0,
+    )
+
+
+def _new_usage_row() -> Dict[str, Any]:
+    """Create an empty per-model entry for get_usage_statistics."""
+    return {
+        "model_name": None,
+        "model_provider": None,
+        "message_count": 0,
+        "summary_count": 0,
+        "total_input_tokens": 0,
+        "total_output_tokens": 0,
+        # Neither table records processing time
+        "avg_processing_time_ms": None,
+        "estimated_cost": 0,
+    }
+
+
+def _usage_by_model(
+    entity: Any,
+    source: str,
+    since_date: datetime,
+    model_name: Optional[str],
+) -> Select:
+    """Build the per-model token usage aggregate for messages or summaries.
+    
+    Args:
+        entity: Mapped class with model, provider and token columns
+        source: Tag identifying the table in the combined result
+        since_date: Earliest creation time to include
+        model_name: Optional model to restrict the aggregate to
+    
+    Returns:
+        Grouped select over the entity's table
+    """
+    stmt = (
+        select(
+            entity.model.label("model_name"),
+            entity.provider.label("model_provider"),
+            literal(source).label("source"),
+            func.count().label("count"),
+            func.sum(entity.input_tokens).label("total_input_tokens"),
+            func.sum(entity.output_tokens).label("total_output_tokens"),
+            (
+                func.coalesce(func.sum(entity.input_tokens), 0)
+                * _token_rate(entity.model, "input_cost_per_token")
+                + func.coalesce(func.sum(entity.output_tokens), 0)
+                * _token_rate(entity.model, "output_cost_per_token")
+            ).label("estimated_cost"),
+        )
+        .where(entity.created_at >= since_date)
+        .group_by(entity.model, entity.provider)
+    )
+    if model_name:
+        stmt = stmt.where(entity.model == model_name)
+    return stmt
+
+
+_AVAILABLE_MODELS = _build_models()
+_MODELS_BY_PROVIDER, _MODELS_BY_CAPABILITY = _index_models(_AVAILABLE_MODELS)
+
+# Input and output prices per 1,000 tokens
+_COST_PER_1K: Mapping[str, Mapping[str, float]] = MappingProxyType({
+    name: MappingProxyType({
+        "input": model.input_cost_per_token * 1000,
+        "output": model.output_cost_per_token * 1000,
+    })
+    for name, model in _AVAILABLE_MODELS.items()
+})
+
+# Serialized catalog entries, read-only down to the capability tuples;
+# responses get a copy from _model_dump
+_MODEL_DUMPS: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+    name: MappingProxyType({**model.model_dump(), "capabilities": tuple(model.capabilities)})
+    for name, model in _AVAILABLE_MODELS.items()
+})
+
+
+def _model_dump(name: str) -> Dict[str, Any]:
+    """Copy of a serialized catalog entry that callers may modify."""
+    dump = dict(_MODEL_DUMPS[name])
+    dump["capabilities"] = list(dump["capabilities"])
+    return dump
+
+
+# Lower-cased model name fragments the scoring rules refer to
+_NAME_TAGS = ("claude", "sonnet", "gpt-4o", "haiku", "mini", "flash")
+_LARGE_CONTEXT = "large_context"
+_HIGH_RATE_LIMIT = "high_rate_limit"
+
+
+_BY_SCORE = itemgetter("score")
+
+
+class _ScoringRule(NamedTuple):
+    """Points awarded when a model has any of the listed traits."""
+    traits: FrozenSet[Union[ModelCapability, str]]
+    points: int
+    reason: str
+
+
+_TASK_TYPE_RULES: Mapping[TaskType, Tuple[_ScoringRule, ...]] = MappingProxyType({
+    TaskType.TEXT_GENERATION: (
+        _ScoringRule(frozenset({ModelCapability.TEXT_GENERATION}), 25, "Excellent text generation"),
+    ),
+})
+
+_PRIORITY_RULES: Mapping[TaskPriority, Tuple[_ScoringRule, ...]] = MappingProxyType({
+    TaskPriority.HIGH: (
+        _ScoringRule(frozenset({"sonnet", "gpt-4o"}), 20, "High-performance model"),
+    ),
+    TaskPriority.LOW: (
+        _ScoringRule(frozenset({"haiku", "mini", "flash"}), 15, "Cost-effective option"),
+    ),
+})
+
+_GENERAL_RULES: Tuple[_ScoringRule, ...] = (
+    _ScoringRule(frozenset({_LARGE_CONTEXT}), 10, "Large context window"),
+    _ScoringRule(frozenset({_HIGH_RATE_LIMIT}), 5, "High rate limits"),
+)
+
+
+def _model_traits(model: AIModel) -> FrozenSet[Union[ModelCapability, str]]:
+    """Collect the capabilities and name tags the scoring rules match on."""
+    name = model.name.lower()
+    traits = set(model.capability_set)
+    traits.update(tag for tag in _NAME_TAGS if tag in name)
+    if model.context_window > 100000:
+        traits.add(_LARGE_CONTEXT)
+    if model.rate_limit_rpm > 10000:
+        traits.add(_HIGH_RATE_LIMIT)
+    return frozenset(traits)
+
+
+_MODEL_TRAITS: Mapping[str, FrozenSet[Union[ModelCapability, str]]] = MappingProxyType({
+    name: _model_traits(model) for name, model in _AVAILABLE_MODELS.items()
+})
+
+
+@lru_cache(maxsize=1024)
+def _check_model_config(
+    model_name: str,
+    max_tokens: Optional[int],
+    temperature: Optional[float],
+) -> Tuple[bool, Tuple[str, ...], Tuple[str, ...]]:
+    """Validate a configuration for a catalog model.
+    
+    The catalog is static, so results are cached per argument triple.
+    
+    Args:
+        model_name: Name of a model in the catalog
+        max_tokens: Requested maximum tokens, if any
+        temperature: Requested sampling temperature, if any
+    
+    Returns:
+        Tuple of (valid, errors, warnings)
+    """
+    model = _AVAILABLE_MODELS[model_name]
+    errors = []
+    warnings = []
+    
+    # Validate max_tokens
+    if max_tokens is not None:
+        if max_tokens > model.max_tokens:
+            errors.append(
+                f"max_tokens ({max_tokens}) exceeds model limit ({model.max_tokens})"
+            )
+        elif max_tokens < 1:
+            errors.append("max_tokens must be at least 1")
+    
+    # Validate temperature
+    if temperature is not None:
+        if temperature < 0 or temperature > 2:
+            errors.append("temperature must be between 0 and 2")
+        elif temperature > 1:
+            warnings.append("temperature > 1 may produce less coherent outputs")
+    
+    return not errors, tuple(errors), tuple(warnings)
+
+
 class ModelService:
     """Service for AI model-related operations."""
     
+    # The catalog is static, so every instance shares the module-level copy
+    _available_models: Mapping[str, AIModel] = _AVAILABLE_MODELS
+    _by_provider: Mapping[ModelProvider, Tuple[AIModel, ...]] = _MODELS_BY_PROVIDER
+    _by_capability: Mapping[ModelCapability, Tuple[AIModel, ...]] = _MODELS_BY_CAPABILITY
+    
     def __init__(self, db: AsyncSession):
         self.db = db
-        self._available_models = self._initialize_models()
     
-    def _initialize_models(self) -> Dict[str, AIModel]:
-        """Initialize available AI models."""
-        models = {
-            # Claude models
-            "claude-3-5-sonnet-20241022": AIModel(
-                name="claude-3-5-sonnet-20241022",
-                provider=ModelProvider.ANTHROPIC,
-                version="20241022",
-                display_name="Claude 3.5 Sonnet",
-                description="Most intelligent model with excellent reasoning and coding capabilities",
-                max_tokens=200000,
-                context_window=200000,
-                input_cost_per_token=0.000003,
-                output_cost_per_token=0.000015,
-                capabilities=[
-                    ModelCapability.TEXT_GENERATION,
-                    ModelCapability.CODE_GENERATION,
-                    ModelCapability.REASONING,
-                    ModelCapability.TOOL_USE,
-                    ModelCapability.IMAGE_ANALYSIS,
-                ],
-                supports_streaming=True,
-                supports_function_calling=True,
-                supports_vision=True,
-                rate_limit_rpm=4000,
-                rate_limit_tpm=400000,
-            ),
-            "claude-3-haiku-20240307": AIModel(
-                name="claude-3-haiku-20240307",
-                provider=ModelProvider.ANTHROPIC,
-                version="20240307",
-                display_name="Claude 3 Haiku",
-                description="Fastest model for simple tasks and quick responses",
-                max_tokens=200000,
-                context_window=200000,
-                input_cost_per_token=0.00000025,
-                output_cost_per_token=0.00000125,
-                capabilities=[
-                    ModelCapability.TEXT_GENERATION,
-                    ModelCapability.CODE_GENERATION,
-                    ModelCapability.TOOL_USE,
-                    ModelCapability.IMAGE_ANALYSIS,
-                ],
-                supports_streaming=True,
-                supports_function_calling=True,
-                supports_vision=True,
-                rate_limit_rpm=4000,
-                rate_limit_tpm=400000,
-            ),
-            # OpenAI models
-            "gpt-4o": AIModel(
-                name="gpt-4o",
-                provider=ModelProvider.OPENAI,
-                version="2024-08-06",
-                display_name="GPT-4o",
-                description="High-intelligence flagship model for complex, multi-step tasks",
-                max_tokens=128000,
-                context_window=128000,
-                input_cost_per_token=0.0000025,
-                output_cost_per_token=0.00001,
-                capabilities=[
-                    ModelCapability.TEXT_GENERATION,
-                    ModelCapability.CODE_GENERATION,
-                    ModelCapability.REASONING,
-                    ModelCapability.TOOL_USE,
-                    ModelCapability.IMAGE_ANALYSIS,
-                ],
-                supports_streaming=True,
-                supports_function_calling=True,
-                supports_vision=True,
-                rate_limit_rpm=10000,
-                rate_limit_tpm=2000000,
-            ),
-            "gpt-4o-mini": AIModel(
-                name="gpt-4o-mini",
-                provider=ModelProvider.OPENAI,
-                version="2024-07-18",
-                display_name="GPT-4o Mini",
-                description="Affordable and intelligent small model for fast, lightweight tasks",
-                max_tokens=128000,
-                context_window=128000,
-                input_cost_per_token=0.00000015,
-                output_cost_per_token=0.0000006,
-                capabilities=[
-                    ModelCapability.TEXT_GENERATION,
-                    ModelCapability.CODE_GENERATION,
-                    ModelCapability.TOOL_USE,
-                    ModelCapability.IMAGE_ANALYSIS,
-                ],
-                supports_streaming=True,
-                supports_function_calling=True,
-                supports_vision=True,
-                rate_limit_rpm=30000,
-                rate_limit_tpm=10000000,
-            ),
-            # Google models
-            "gemini-1.5-pro": AIModel(
-                name="gemini-1.5-pro",
-                provider=ModelProvider.GOOGLE,
-                version="001",
-                display_name="Gemini 1.5 Pro",
-                description="Mid-size multimodal model that supports up to 1 million tokens",
-                max_tokens=1000000,
-                context_window=1000000,
-                input_cost_per_token=0.00000125,
-                output_cost_per_token=0.000005,
-                capabilities=[
-                    ModelCapability.TEXT_GENERATION,
-                    ModelCapability.CODE_GENERATION,
-                    ModelCapability.REASONING,
-                    ModelCapability.TOOL_USE,
-                    ModelCapability.IMAGE_ANALYSIS,
-                ],
-                supports_streaming=True,
-                supports_function_calling=True,
-                supports_vision=True,
-                rate_limit_rpm=2000,
-                rate_limit_tpm=32000,
-            ),
-            "gemini-1.5-flash": AIModel(
-                name="gemini-1.5-flash",
-                provider=ModelProvider.GOOGLE,
-                version="001",
-                display_name="Gemini 1.5 Flash",
-                description="Fast and versatile multimodal model for scaling across diverse tasks",
-                max_tokens=1000000,
-                context_window=1000000,
-                input_cost_per_token=0.000000075,
-                output_cost_per_token=0.0000003,
-                capabilities=[
-                    ModelCapability.TEXT_GENERATION,
-                    ModelCapability.CODE_GENERATION,
-                    ModelCapability.TOOL_USE,
-                    ModelCapability.IMAGE_ANALYSIS,
-                ],
-                supports_streaming=True,
-                supports_function_calling=True,
-                supports_vision=True,
-                rate_limit_rpm=15000,
-                rate_limit_tpm=1000000,
-            ),
-        }
-        return models
-    
-    async def get_available_models(self) -> List[AIModel]:
+    def get_available_models(self) -> List[AIModel]:
         """Get all available AI models."""
         return list(self._available_models.values())
     
-    async def get_model(self, model_name: str) -> Optional[AIModel]:
+    def get_model(self, model_name: str) -> Optional[AIModel]:
         """Get a specific model by name."""
         return self._available_models.get(model_name)
     
-    async def get_models_by_provider(self, provider: ModelProvider) -> List[AIModel]:
+    def get_models_by_provider(self, provider: ModelProvider) -> List[AIModel]:
         """Get models by provider."""
-        return [
-            model for model in self._available_models.values()
-            if model.provider == provider
-        ]
+        return list(self._by_provider.get(provider, ()))
     
-    async def get_models_by_capability(self, capability: ModelCapability) -> List[AIModel]:
+    def get_models_by_capability(self, capability: ModelCapability) -> List[AIModel]:
         """Get models that support a specific capability."""
-        return [
-            model for model in self._available_models.values()
-            if capability in model.capabilities
-        ]
+        return list(self._by_capability.get(capability, ()))
     
     async def validate_model_config(
         self,
@@ -203,37 +421,19 @@ class ModelService:
         temperature: Optional[float] = None,
     ) -> Dict[str, Any]:
         """Validate model configuration."""
-        model = await self.get_model(model_name)
+        model = self._available_models.get(model_name)
         if not model:
             return {
                 "valid": False,
                 "errors": [f"Model '{model_name}' not found"],
             }
         
-        errors = []
-        warnings = []
-        
-        # Validate max_tokens
-        if max_tokens is not None:
-            if max_tokens > model.max_tokens:
-                errors.append(
-                    f"max_tokens ({max_tokens}) exceeds model limit ({model.max_tokens})"
-                )
-            elif max_tokens < 1:
-                errors.append("max_tokens must be at least 1")
-        
-        # Validate temperature
-        if temperature is not None:
-            if temperature < 0 or temperature > 2:
-                errors.append("temperature must be between 0 and 2")
-            elif temperature > 1:
-                warnings.append("temperature > 1 may produce less coherent outputs")
-        
+        valid, errors, warnings = _check_model_config(model_name, max_tokens, temperature)
         return {
-            "valid": len(errors) == 0,
-            "errors": errors,
-            "warnings": warnings,
-            "model": model.model_dump() if model else None,
+            "valid": valid,
+            "errors": list(errors),
+            "warnings": list(warnings),
+            "model": _model_dump(model.name),
         }
     
     async def test_model(
@@ -244,7 +444,7 @@ class ModelService:
         temperature: float = 0.7,
     ) -> Dict[str, Any]:
         """Test a model with a simple prompt."""
-        model = await self.get_model(model_name)
+        model = self._available_models.get(model_name)
         if not model:
             return {
                 "success": False,
@@ -264,20 +464,24 @@ class ModelService:
         
         # In a real implementation, you would make an actual API call here
         # For now, we'll return a mock response
+        input_tokens = len(prompt.split())
+        output_tokens = 10
+        input_cost = input_tokens * model.input_cost_per_token
+        output_cost = output_tokens * model.output_cost_per_token
         return {
             "success": True,
             "model_name": model_name,
             "prompt": prompt,
             "response": f"Test response from {model.display_name}",
             "tokens_used": {
-                "input": len(prompt.split()),
-                "output": 10,
-                "total": len(prompt.split()) + 10,
+                "input": input_tokens,
+                "output": output_tokens,
+                "total": input_tokens + output_tokens,
             },
             "cost_estimate": {
-                "input_cost": len(prompt.split()) * model.input_cost_per_token,
-                "output_cost": 10 * model.output_cost_per_token,
-                "total_cost": (len(prompt.split()) * model.input_cost_per_token) + (10 * model.output_cost_per_token),
+                "input_cost": input_cost,
+                "output_cost": output_cost,
+                "total_cost": input_cost + output_cost,
             },
         }
     
@@ -289,48 +493,35 @@ class ModelService:
         required_capabilities: Optional[List[ModelCapability]] = None,
     ) -> List[Dict[str, Any]]:
         """Get model recommendations based on task requirements."""
-        models = await self.get_available_models()
+        required = capability_mask(required_capabilities or ())
+        if required_capabilities:
+            # Start from the smallest capability bucket; the mask check covers the rest
+            models = min(
+                (self._by_capability.get(capability, ()) for capability in required_capabilities),
+                key=len,
+            )
+        else:
+            models = self._available_models.values()
         recommendations = []
         
         for model in models:
             # Check required capabilities
-            if required_capabilities:
-                if not all(cap in model.capabilities for cap in required_capabilities):
-                    continue
+            if model.capability_mask & required != required:
+                continue
             
             # Calculate suitability score
+            traits = _MODEL_TRAITS[model.name]
             score = 0.0
             reasons = []
             
-            # Task type scoring
-            if task_type == TaskType.CODE_GENERATION:
-                if ModelCapability.CODE_GENERATION in model.capabilities:
-                    score += 30
-                    reasons.append("Supports code generation")
-                if "claude" in model.name.lower():
-                    score += 20
-                    reasons.append("Excellent for coding tasks")
-            elif task_type == TaskType.DATA_ANALYSIS:
-                if ModelCapability.REASONING in model.capabilities:
-                    score += 25
-                    reasons.append("Strong reasoning capabilities")
-                if model.context_window > 100000:
-                    score += 15
-                    reasons.append("Large context window for data analysis")
-            elif task_type == TaskType.CONTENT_CREATION:
-                if ModelCapability.TEXT_GENERATION in model.capabilities:
-                    score += 25
-                    reasons.append("Excellent text generation")
-            
-            # Priority scoring
-            if priority == TaskPriority.HIGH:
-                if "sonnet" in model.name.lower() or "gpt-4o" in model.name.lower():
-                    score += 20
-                    reasons.append("High-performance model")
-            elif priority == TaskPriority.LOW:
-                if "haiku" in model.name.lower() or "mini" in model.name.lower() or "flash" in model.name.lower():
-                    score += 15
-                    reasons.append("Cost-effective option")
+            # Task type and priority scoring
+            for rule in (
+                *_TASK_TYPE_RULES.get(task_type, ()),
+                *_PRIORITY_RULES.get(priority, ()),
+            ):
+                if not rule.traits.isdisjoint(traits):
+                    score += rule.points
+                    reasons.append(rule.reason)
             
             # Budget scoring
             if budget is not None:
@@ -345,30 +536,21 @@ class ModelService:
                     score -= 10
                     reasons.append("Over budget")
             
-            # Context window bonus
-            if model.context_window > 100000:
-                score += 10
-                reasons.append("Large context window")
-            
-            # Rate limit considerations
-            if model.rate_limit_rpm > 10000:
-                score += 5
-                reasons.append("High rate limits")
+            # Context window and rate limit bonuses
+            for rule in _GENERAL_RULES:
+                if not rule.traits.isdisjoint(traits):
+                    score += rule.points
+                    reasons.append(rule.reason)
             
             recommendations.append({
-                "model": model.model_dump(),
+                "model": _model_dump(model.name),
                 "score": score,
                 "reasons": reasons,
-                "estimated_cost_per_1k_tokens": {
-                    "input": model.input_cost_per_token * 1000,
-                    "output": model.output_cost_per_token * 1000,
-                },
+                "estimated_cost_per_1k_tokens": dict(_COST_PER_1K[model.name]),
             })
         
-        # Sort by score (descending)
-        recommendations.sort(key=lambda x: x["score"], reverse=True)
-        
-        return recommendations[:5]  # Return top 5 recommendations
+        # Top 5 by score (descending), without sorting the rest
+        return heapq.nlargest(5, recommendations, key=_BY_SCORE)
     
     async def get_usage_statistics(
         self,
@@ -376,120 +558,48 @@ class ModelService:
         model_name: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Get model usage statistics."""
-        since_date = datetime.utcnow() - timedelta(days=days)
-        
-        # Base queries for messages and summaries
-        message_query = select(Message).where(Message.created_at >= since_date)
-        summary_query = select(Summary).where(Summary.created_at >= since_date)
-        
-        if model_name:
-            message_query = message_query.where(Message.model_name == model_name)
-            summary_query = summary_query.where(Summary.model_name == model_name)
-        
-        # Message statistics
-        message_stats_query = (
-            select(
-                Message.model_name,
-                Message.model_provider,
-                func.count(Message.id).label('count'),
-                func.sum(Message.input_tokens).label('total_input_tokens'),
-                func.sum(Message.output_tokens).label('total_output_tokens'),
-                func.avg(Message.processing_time_ms).label('avg_processing_time'),
-            )
-            .where(Message.created_at >= since_date)
-            .group_by(Message.model_name, Message.model_provider)
-        )
-        
-        if model_name:
-            message_stats_query = message_stats_query.where(Message.model_name == model_name)
-        
-        message_result = await self.db.execute(message_stats_query)
-        message_stats = message_result.fetchall()
-        
-        # Summary statistics
-        summary_stats_query = (
-            select(
-                Summary.model_name,
-                Summary.model_provider,
-                func.count(Summary.id).label('count'),
-                func.sum(Summary.input_tokens).label('total_input_tokens'),
-                func.sum(Summary.output_tokens).label('total_output_tokens'),
-                func.avg(Summary.processing_time_ms).label('avg_processing_time'),
-            )
-            .where(Summary.created_at >= since_date)
-            .group_by(Summary.model_name, Summary.model_provider)
-        )
-        
-        if model_name:
-            summary_stats_query = summary_stats_query.where(Summary.model_name == model_name)
-        
-        summary_result = await self.db.execute(summary_stats_query)
-        summary_stats = summary_result.fetchall()
-        
-        # Combine and calculate costs
-        usage_by_model = {}
-        
-        for stat in message_stats:
-            model_key = stat.model_name or "unknown"
-            if model_key not in usage_by_model:
-                usage_by_model[model_key] = {
-                    "model_name": stat.model_name,
-                    "model_provider": stat.model_provider,
-                    "message_count": 0,
-                    "summary_count": 0,
-                    "total_input_tokens": 0,
-                    "total_output_tokens": 0,
-                    "avg_processing_time_ms": 0,
-                    "estimated_cost": 0,
-                }
+        since_date = datetime.now(timezone.utc) - timedelta(days=days)
+        
+        # One round trip: per-model aggregates of both tables, tagged by source
+        usage = union_all(
+            _usage_by_model(Message, "message", since_date, model_name),
+            _usage_by_model(Summary, "summary", since_date, model_name),
+        ).subquery()
+        result = await self.db.execute(select(usage))
+        
+        # Combine; costs are computed by the database alongside the sums
+        usage_by_model: Dict[str, Dict[str, Any]] = defaultdict(_new_usage_row)
+        
+        # Totals accumulate in the same pass over the rows
+        counts_by_source = {"message": 0, "summary": 0}
+        total_input_tokens = total_output_tokens = 0
+        total_cost = 0.0
+        
+        for stat in result:
+            count = stat.count or 0
+            input_tokens = stat.total_input_tokens or 0
+            output_tokens = stat.total_output_tokens or 0
+            cost = float(stat.estimated_cost or 0)
             
-            usage_by_model[model_key]["message_count"] = stat.count or 0
-            usage_by_model[model_key]["total_input_tokens"] += stat.total_input_tokens or 0
-            usage_by_model[model_key]["total_output_tokens"] += stat.total_output_tokens or 0
-            usage_by_model[model_key]["avg_processing_time_ms"] = stat.avg_processing_time or 0
-        
-        for stat in summary_stats:
-            model_key = stat.model_name or "unknown"
-            if model_key not in usage_by_model:
-                usage_by_model[model_key] = {
-                    "model_name": stat.model_name,
-                    "model_provider": stat.model_provider,
-                    "message_count": 0,
-                    "summary_count": 0,
-                    "total_input_tokens": 0,
-                    "total_output_tokens": 0,
-                    "avg_processing_time_ms": 0,
-                    "estimated_cost": 0,
-                }
+            usage = usage_by_model[stat.model_name or "unknown"]
+            usage["model_name"] = stat.model_name
+            usage["model_provider"] = stat.model_provider
+            usage[f"{stat.source}_count"] += count
+            usage["total_input_tokens"] += input_tokens
+            usage["total_output_tokens"] += output_tokens
+            usage["estimated_cost"] += cost
             
-            usage_by_model[model_key]["summary_count"] = stat.count or 0
-            usage_by_model[model_key]["total_input_tokens"] += stat.total_input_tokens or 0
-            usage_by_model[model_key]["total_output_tokens"] += stat.total_output_tokens or 0
-            # Average processing time across messages and summaries
-            if usage_by_model[model_key]["avg_processing_time_ms"] == 0:
-                usage_by_model[model_key]["avg_processing_time_ms"] = stat.avg_processing_time or 0
-        
-        # Calculate estimated costs
-        for model_key, usage in usage_by_model.items():
-            model = await self.get_model(model_key)
-            if model:
-                input_cost = usage["total_input_tokens"] * model.input_cost_per_token
-                output_cost = usage["total_output_tokens"] * model.output_cost_per_token
-                usage["estimated_cost"] = input_cost + output_cost
-        
-        # Calculate totals
-        total_messages = sum(usage["message_count"] for usage in usage_by_model.values())
-        total_summaries = sum(usage["summary_count"] for usage in usage_by_model.values())
-        total_input_tokens = sum(usage["total_input_tokens"] for usage in usage_by_model.values())
-        total_output_tokens = sum(usage["total_output_tokens"] for usage in usage_by_model.values())
-        total_cost = sum(usage["estimated_cost"] for usage in usage_by_model.values())
+            counts_by_source[stat.source] += count
+            total_input_tokens += input_tokens
+            total_output_tokens += output_tokens
+            total_cost += cost
         
         return {
             "period_days": days,
             "model_name": model_name,
             "totals": {
-                "messages": total_messages,
-                "summaries": total_summaries,
+                "messages": counts_by_source["message"],
+                "summaries": counts_by_source["summary"],
                 "input_tokens": total_input_tokens,
                 "output_tokens": total_output_tokens,
                 "total_tokens": total_input_tokens + total_output_tokens,
@@ -506,11 +616,11 @@ class ModelService:
     ) -> Dict[str, Any]:
         """Calculate token costs for given usage."""
         if model_name:
-            models = [await self.get_model(model_name)]
+            models = [self._available_models.get(model_name)]
             if not models[0]:
                 raise BytebotNotFoundException(f"Model '{model_name}' not found")
         else:
-            models = await self.get_available_models()
+            models = self._available_models.values()
         
         costs = []
         for model in models:
@@ -527,10 +637,7 @@ class ModelService:
                 "input_cost": input_cost,
                 "output_cost": output_cost,
                 "total_cost": total_cost,
-                "cost_per_1k_tokens": {
-                    "input": model.input_cost_per_token * 1000,
-                    "output": model.output_cost_per_token * 1000,
-                },
+                "cost_per_1k_tokens": dict(_COST_PER_1K[model.name]),
             })
         
         # Sort by total cost
@@ -549,91 +656,94 @@ class ModelService:
         days: int = 7,
     ) -> Dict[str, Any]:
         """Get performance metrics for a specific model."""
-        model = await self.get_model(model_name)
+        model = self._available_models.get(model_name)
         if not model:
             raise BytebotNotFoundException(f"Model '{model_name}' not found")
         
-        since_date = datetime.utcnow() - timedelta(days=days)
+        since_date = datetime.now(timezone.utc) - timedelta(days=days)
         
         # Message performance metrics
-        message_metrics_query = (
+        message_metrics = (
             select(
-                func.count(Message.id).label('total_requests'),
-                func.count(Message.id).filter(Message.processing_error.is_(None)).label('successful_requests'),
-                func.avg(Message.processing_time_ms).label('avg_processing_time'),
-                func.min(Message.processing_time_ms).label('min_processing_time'),
-                func.max(Message.processing_time_ms).label('max_processing_time'),
+                func.count().label('total_requests'),
+                func.count().filter(Message.processing_error.is_(None)).label('successful_requests'),
                 func.avg(Message.input_tokens).label('avg_input_tokens'),
                 func.avg(Message.output_tokens).label('avg_output_tokens'),
             )
             .where(
                 and_(
-                    Message.model_name == model_name,
+                    Message.model == model_name,
                     Message.created_at >= since_date,
                 )
             )
+            .subquery()
         )
         
-        message_result = await self.db.execute(message_metrics_query)
-        message_metrics = message_result.fetchone()
-        
-        # Summary performance metrics
-        summary_metrics_query = (
+        # Summary performance metrics; summaries do not record failures
+        summary_metrics = (
             select(
-                func.count(Summary.id).label('total_requests'),
-                func.count(Summary.id).filter(Summary.status != 'failed').label('successful_requests'),
-                func.avg(Summary.processing_time_ms).label('avg_processing_time'),
+                func.count().label('total_requests'),
                 func.avg(Summary.input_tokens).label('avg_input_tokens'),
                 func.avg(Summary.output_tokens).label('avg_output_tokens'),
             )
             .where(
                 and_(
-                    Summary.model_name == model_name,
+                    Summary.model == model_name,
                     Summary.created_at >= since_date,
                 )
             )
+            .subquery()
         )
         
-        summary_result = await self.db.execute(summary_metrics_query)
-        summary_metrics = summary_result.fetchone()
+        # Both aggregates are single rows, so joining them is one round trip
+        result = await self.db.execute(
+            select(message_metrics, summary_metrics).join_from(
+                message_metrics, summary_metrics, true()
+            )
+        )
+        (
+            message_requests, message_successes, message_avg_input, message_avg_output,
+            summary_requests, summary_avg_input, summary_avg_output,
+        ) = result.one()
         
         # Calculate success rates and combined metrics
-        total_requests = (message_metrics.total_requests or 0) + (summary_metrics.total_requests or 0)
-        successful_requests = (message_metrics.successful_requests or 0) + (summary_metrics.successful_requests or 0)
+        total_requests = (message_requests or 0) + (summary_requests or 0)
+        successful_requests = (message_successes or 0) + (summary_requests or 0)
         success_rate = (successful_requests / total_requests * 100) if total_requests > 0 else 0
         
         return {
             "model_name": model_name,
             "period_days": days,
-            "model_info": model.model_dump(),
+            "model_info": _model_dump(model.name),
             "performance": {
                 "total_requests": total_requests,
                 "successful_requests": successful_requests,
                 "success_rate_percent": success_rate,
+                # Processing time is not recorded for messages or summaries
                 "avg_processing_time_ms": {
-                    "messages": float(message_metrics.avg_processing_time or 0),
-                    "summaries": float(summary_metrics.avg_processing_time or 0),
+                    "messages": None,
+                    "summaries": None,
                 },
                 "processing_time_range_ms": {
-                    "min": float(message_metrics.min_processing_time or 0),
-                    "max": float(message_metrics.max_processing_time or 0),
+                    "min": None,
+                    "max": None,
                 },
                 "avg_token_usage": {
                     "input_tokens": {
-                        "messages": float(message_metrics.avg_input_tokens or 0),
-                        "summaries": float(summary_metrics.avg_input_tokens or 0),
+                        "messages": float(message_avg_input or 0),
+                        "summaries": float(summary_avg_input or 0),
                     },
                     "output_tokens": {
-                        "messages": float(message_metrics.avg_output_tokens or 0),
-                        "summaries": float(summary_metrics.avg_output_tokens or 0),
+                        "messages": float(message_avg_output or 0),
+                        "summaries": float(summary_avg_output or 0),
                     },
                 },
             },
         }
     
-    async def get_model_limits(self, model_name: str) -> Dict[str, Any]:
+    def get_model_limits(self, model_name: str) -> Dict[str, Any]:
         """Get model limits and constraints."""
-        model = await self.get_model(model_name)
+        model = self._available_models.get(model_name)
         if not model:
             raise BytebotNotFoundException(f"Model '{model_name}' not found")
         
@@ -656,13 +766,10 @@ class ModelService:
             "pricing": {
                 "input_cost_per_token": model.input_cost_per_token,
                 "output_cost_per_token": model.output_cost_per_token,
-                "cost_per_1k_tokens": {
-                    "input": model.input_cost_per_token * 1000,
-                    "output": model.output_cost_per_token * 1000,
-                },
+                "cost_per_1k_tokens": dict(_COST_PER_1K[model.name]),
             },
         }
     
-    async def get_model_capabilities(self, capability: ModelCapability) -> List[AIModel]:
+    def get_model_capabilities(self, capability: ModelCapability) -> List[AIModel]:
         """Get models that support a specific capability."""
-        return await self.get_models_by_capability(capability)
\ No newline at end of file
+        return self.get_models_by_capability(capability)
\ No newline at end of file
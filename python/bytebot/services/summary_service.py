@@ -19,6 +19,7 @@ from ..models.summary import Summary
 from ..models.task import Task
 from ..schemas.summary import SummaryCreate, SummaryUpdate
 from ..shared.summary_types import SummaryType, SummaryStatus
+from ._stats import grouped_counts
 
 logger = get_logger(__name__)
 
@@ -35,10 +36,9 @@ class SummaryService:
         
         # Validate task exists
         task_result = await self.db.execute(
-            select(Task).where(Task.id == summary_data.task_id)
+            select(Task.id).where(Task.id == summary_data.task_id)
         )
-        task = task_result.scalar_one_or_none()
-        if not task:
+        if task_result.scalar_one_or_none() is None:
             raise BytebotNotFoundException(f"Task {summary_data.task_id} not found")
         
         # Validate parent summary if specified
@@ -68,12 +68,18 @@ class SummaryService:
         return summary
     
     async def get_summary(self, summary_id: UUID) -> Optional[Summary]:
-        """Get a summary by ID."""
+        """Get a summary by ID.
+        
+        The related task and child summaries are loaded without their large
+        columns; only the summary itself is returned in full.
+        """
         result = await self.db.execute(
             select(Summary)
             .options(
-                selectinload(Summary.task),
-                selectinload(Summary.child_summaries),
+                selectinload(Summary.task)
+                .load_only(Task.title, Task.status)
+                .raiseload("*"),
+                selectinload(Summary.child_summaries).defer(Summary.content),
             )
             .where(Summary.id == summary_id)
         )
@@ -343,12 +349,7 @@ class SummaryService:
     async def get_summary_stats(self) -> Dict[str, Any]:
         """Get summary statistics."""
         # Count summaries by type
-        type_query = (
-            select(Summary.type, func.count(Summary.id))
-            .group_by(Summary.type)
-        )
-        type_result = await self.db.execute(type_query)
-        type_counts = dict(type_result.fetchall())
+        type_counts = await grouped_counts(self.db, Summary.summary_type)
         
         # Count summaries by status
         status_query = (
@@ -358,14 +359,8 @@ class SummaryService:
         status_result = await self.db.execute(status_query)
         status_counts = dict(status_result.fetchall())
         
-        # Count summaries by task
-        task_query = (
-            select(Summary.task_id, func.count(Summary.id))
-            .group_by(Summary.task_id)
-            .limit(10)  # Top 10 tasks by summary count
-        )
-        task_result = await self.db.execute(task_query)
-        task_counts = dict(task_result.fetchall())
+        # Count summaries by task for the top 10 tasks
+        task_counts = await grouped_counts(self.db, Summary.task_id, limit=10)
         
         # Calculate token statistics
         token_query = (
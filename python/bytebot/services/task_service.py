@@ -7,7 +7,7 @@ from uuid import UUID
 from sqlalchemy import and_, desc, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload, selectinload
 
 from ..core.exceptions import (
     BytebotNotFoundException,
@@ -17,8 +17,10 @@ from ..core.exceptions import (
 from ..core.logging import get_logger
 from ..models.task import Task
 from ..models.message import Message
+from ..models.summary import Summary
 from ..schemas.task import TaskCreate, TaskUpdate
 from ..shared.task_types import TaskStatus, TaskPriority, TaskType
+from ._stats import grouped_counts
 
 logger = get_logger(__name__)
 
@@ -35,8 +37,7 @@ class TaskService:
         
         # Validate parent task if specified
         if task_data.parent_task_id:
-            parent_task = await self.get_task(task_data.parent_task_id)
-            if not parent_task:
+            if not await self._task_exists(task_data.parent_task_id):
                 raise BytebotNotFoundException(f"Parent task {task_data.parent_task_id} not found")
         
         # Create task instance
@@ -52,6 +53,7 @@ class TaskService:
             max_retries=task_data.max_retries,
             timeout_seconds=task_data.timeout_seconds,
             parent_task_id=task_data.parent_task_id,
+            auto_start=task_data.auto_start,
         )
         
         self.db.add(task)
@@ -61,17 +63,29 @@ class TaskService:
         logger.info(f"Created task {task.id} successfully")
         return task
     
-    async def get_task(self, task_id: UUID) -> Optional[Task]:
-        """Get a task by ID."""
-        result = await self.db.execute(
-            select(Task)
-            .options(
-                selectinload(Task.messages),
-                selectinload(Task.summaries),
-                selectinload(Task.subtasks),
+    async def _task_exists(self, task_id: UUID) -> bool:
+        """Check that a task exists without loading it or its relationships."""
+        result = await self.db.execute(select(Task.id).where(Task.id == task_id))
+        return result.scalar_one_or_none() is not None
+    
+    async def get_task(self, task_id: UUID, include_messages: bool = False) -> Optional[Task]:
+        """Get a task by ID.
+        
+        Messages and summaries are eager-loaded without their content, which
+        task operations never read. With ``include_messages`` only the
+        messages are loaded, in full, and any other relationship access raises
+        instead of issuing a lazy query.
+        """
+        query = select(Task).where(Task.id == task_id)
+        if include_messages:
+            query = query.options(selectinload(Task.messages), raiseload("*"))
+        else:
+            query = query.options(
+                selectinload(Task.messages).defer(Message.content),
+                selectinload(Task.summaries).defer(Summary.content),
             )
-            .where(Task.id == task_id)
-        )
+        
+        result = await self.db.execute(query)
         return result.scalar_one_or_none()
     
     async def list_tasks(
@@ -86,7 +100,8 @@ class TaskService:
         tags: Optional[List[str]] = None,
     ) -> Tuple[List[Task], int]:
         """List tasks with filtering and pagination."""
-        query = select(Task)
+        # List responses never read messages or summaries; skip the selectin loads
+        query = select(Task).options(raiseload("*"))
         count_query = select(func.count(Task.id))
         
         # Apply filters
@@ -231,7 +246,7 @@ class TaskService:
         
         logger.info(f"Cancelling task {task_id}")
         
-        if task.status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED]:
+        if task.is_completed:
             raise BytebotConflictException(f"Task {task_id} cannot be cancelled from status {task.status}")
         
         task.cancel()
@@ -327,40 +342,18 @@ class TaskService:
     
     async def get_task_stats(self) -> Dict[str, Any]:
         """Get task statistics."""
-        # Count tasks by status
-        status_query = (
-            select(Task.status, func.count(Task.id))
-            .group_by(Task.status)
-        )
-        status_result = await self.db.execute(status_query)
-        status_counts = dict(status_result.fetchall())
-        
-        # Count tasks by type
-        type_query = (
-            select(Task.task_type, func.count(Task.id))
-            .group_by(Task.task_type)
-        )
-        type_result = await self.db.execute(type_query)
-        type_counts = dict(type_result.fetchall())
-        
-        # Count tasks by priority
-        priority_query = (
-            select(Task.priority, func.count(Task.id))
-            .group_by(Task.priority)
-        )
-        priority_result = await self.db.execute(priority_query)
-        priority_counts = dict(priority_result.fetchall())
+        # Count tasks by status, type and priority
+        status_counts = await grouped_counts(self.db, Task.status)
+        type_counts = await grouped_counts(self.db, Task.task_type)
+        priority_counts = await grouped_counts(self.db, Task.priority)
         
         # Calculate average duration for completed tasks
         duration_query = (
-            select(func.avg(
-                func.extract('epoch', Task.completed_at - Task.started_at)
-            ))
+            select(func.avg(Task.duration_seconds))
             .where(
                 and_(
                     Task.status == TaskStatus.COMPLETED,
-                    Task.started_at.is_not(None),
-                    Task.completed_at.is_not(None),
+                    Task.duration_seconds.is_not(None),
                 )
             )
         )
@@ -373,9 +366,10 @@ class TaskService:
         
         return {
             "total_tasks": sum(status_counts.values()),
-            "status_counts": {str(k): v for k, v in status_counts.items()},
-            "type_counts": {str(k): v for k, v in type_counts.items()},
-            "priority_counts": {str(k): v for k, v in priority_counts.items()},
+            # Enum keys are encoded as their values in JSON responses
+            "status_counts": status_counts,
+            "type_counts": type_counts,
+            "priority_counts": priority_counts,
             "average_duration_seconds": float(avg_duration) if avg_duration else None,
             "success_rate": success_rate,
         }
\ No newline at end of file
@@ -2,7 +2,8 @@
 
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from functools import cached_property
+from typing import Dict, FrozenSet, Iterable, List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -43,6 +44,20 @@ class ModelCapability(str, Enum):
     CHAT_COMPLETION = "chat_completion"
 
 
+# One bit per capability, in declaration order
+CAPABILITY_BITS: Dict[ModelCapability, int] = {
+    capability: 1 << position for position, capability in enumerate(ModelCapability)
+}
+
+
+def capability_mask(capabilities: Iterable[ModelCapability]) -> int:
+    """Encode capabilities as a bitmask of CAPABILITY_BITS."""
+    mask = 0
+    for capability in capabilities:
+        mask |= CAPABILITY_BITS[capability]
+    return mask
+
+
 class AIModel(BaseModel):
     """AI model configuration."""
     name: str = Field(..., description="Model identifier")
@@ -61,6 +76,16 @@ class AIModel(BaseModel):
     rate_limit_rpm: int = Field(..., ge=1, description="Rate limit in requests per minute")
     rate_limit_tpm: int = Field(..., ge=1, description="Rate limit in tokens per minute")
     
+    @cached_property
+    def capability_set(self) -> FrozenSet[ModelCapability]:
+        """Supported capabilities as a set for membership checks."""
+        return frozenset(self.capabilities)
+    
+    @cached_property
+    def capability_mask(self) -> int:
+        """Supported capabilities as a CAPABILITY_BITS bitmask."""
+        return capability_mask(self.capabilities)
+    
     @property
     def total_cost_per_token(self) -> float:
         """Calculate total cost per token (input + output)."""
@@ -1,7 +1,7 @@
 """Task-related types and enums."""
 
 from enum import Enum
-from typing import Literal
+from typing import Dict, Literal
 
 
 class TaskStatus(str, Enum):
@@ -45,6 +45,42 @@ class Role(str, Enum):
     TOOL = "tool"
 
 
+# Stable integer codes used for database storage. Codes are part of the
+# schema: never renumber an existing member, give new members the next code.
+TASK_STATUS_CODES: Dict[TaskStatus, int] = {
+    TaskStatus.PENDING: 0,
+    TaskStatus.RUNNING: 1,
+    TaskStatus.COMPLETED: 2,
+    TaskStatus.FAILED: 3,
+    TaskStatus.CANCELLED: 4,
+    TaskStatus.PAUSED: 5,
+}
+
+TASK_PRIORITY_CODES: Dict[TaskPriority, int] = {
+    TaskPriority.LOW: 0,
+    TaskPriority.MEDIUM: 1,
+    TaskPriority.HIGH: 2,
+    TaskPriority.URGENT: 3,
+}
+
+TASK_TYPE_CODES: Dict[TaskType, int] = {
+    TaskType.COMPUTER_USE: 0,
+    TaskType.TEXT_GENERATION: 1,
+    TaskType.IMAGE_ANALYSIS: 2,
+    TaskType.FILE_OPERATION: 3,
+    TaskType.WEB_BROWSING: 4,
+    TaskType.AUTOMATION: 5,
+    TaskType.CUSTOM: 6,
+}
+
+ROLE_CODES: Dict[Role, int] = {
+    Role.USER: 0,
+    Role.ASSISTANT: 1,
+    Role.SYSTEM: 2,
+    Role.TOOL: 3,
+}
+
+
 # Type aliases for better type hints
 TaskStatusType = Literal[
     "PENDING",
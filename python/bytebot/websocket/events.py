@@ -160,6 +160,24 @@ class WebSocketEvent(BaseModel):
             session_id=session_id,
         )
     
+    @classmethod
+    def create_desktop_event(
+        cls,
+        event_type: WebSocketEventType,
+        data: Dict[str, Any],
+        task_id: Optional[UUID] = None,
+        user_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+    ) -> "WebSocketEvent":
+        """Create a desktop-related event."""
+        return cls(
+            type=event_type,
+            task_id=task_id,
+            data=data,
+            user_id=user_id,
+            session_id=session_id,
+        )
+    
     @classmethod
     def create_system_event(
         cls,
@@ -1,11 +1,11 @@
 """WebSocket connection manager."""
 
 import asyncio
-import json
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Set
 from uuid import UUID
 
+import orjson
 from fastapi import WebSocket, WebSocketDisconnect
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -15,6 +15,16 @@ from .events import WebSocketEvent, WebSocketEventType, WebSocketMessage, WebSoc
 logger = get_logger(__name__)
 
 
+def _dumps(payload: Dict[str, Any]) -> str:
+    """Serialize a payload for the wire.
+
+    orjson handles datetimes, UUIDs and enums natively, so callers can pass
+    raw values instead of pre-formatting them. Naive datetimes are treated
+    as UTC.
+    """
+    return orjson.dumps(payload, option=orjson.OPT_NAIVE_UTC).decode()
+
+
 class WebSocketConnection:
     """Represents a WebSocket connection."""
     
@@ -37,7 +47,7 @@ class WebSocketConnection:
     async def send_event(self, event: WebSocketEvent) -> bool:
         """Send an event to this connection."""
         try:
-            await self.websocket.send_text(json.dumps(event.to_dict()))
+            await self.websocket.send_text(_dumps(event.to_dict()))
             return True
         except Exception as e:
             logger.error(f"Failed to send event to connection {self.connection_id}: {e}")
@@ -47,7 +57,7 @@ class WebSocketConnection:
     async def send_response(self, response: WebSocketResponse) -> bool:
         """Send a response to this connection."""
         try:
-            await self.websocket.send_text(json.dumps(response.to_dict()))
+            await self.websocket.send_text(_dumps(response.to_dict()))
             return True
         except Exception as e:
             logger.error(f"Failed to send response to connection {self.connection_id}: {e}")
@@ -403,6 +403,29 @@ async def notify_desktop_action(
         await websocket_manager.broadcast_event(event)
 
 
+async def notify_desktop_event(
+    event_data: Dict[str, Any],
+    task_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+):
+    """Notify about desktop events (recordings, window changes, etc.)."""
+    from uuid import UUID
+    
+    task_uuid = UUID(task_id) if task_id else None
+    
+    event = WebSocketEvent.create_desktop_event(
+        WebSocketEventType.DESKTOP_STATUS,
+        event_data,
+        task_id=task_uuid,
+        user_id=user_id,
+    )
+    
+    if task_uuid:
+        await websocket_manager.send_to_task_subscribers(task_uuid, event)
+    else:
+        await websocket_manager.broadcast_event(event)
+
+
 async def notify_system_status(
     status_data: Dict[str, Any],
     user_id: Optional[str] = None,
@@ -8,14 +8,15 @@ import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from bytebot.api.main import create_app
 from bytebot.core.config import Settings, get_settings
-from bytebot.core.database import Base, get_db
-from bytebot.main import create_app
+from bytebot.core.database import get_db_session
+from bytebot.models import Base
 
 # Test database URL
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -44,7 +45,7 @@ def test_settings() -> Settings:
     )
 
 
-@pytest.fixture(scope="session")
+@pytest_asyncio.fixture
 async def async_engine():
     """Create async database engine for testing."""
     engine = create_async_engine(
@@ -54,6 +55,13 @@ async def async_engine():
         echo=False,
     )
     
+    # Enforce foreign keys, as the application's SQLite engine does
+    @event.listens_for(engine.sync_engine, "connect")
+    def enable_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+    
     # Create tables
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -64,7 +72,7 @@ async def async_engine():
     await engine.dispose()
 
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def async_session(async_engine) -> AsyncGenerator[AsyncSession, None]:
     """Create async database session for testing."""
     async_session_maker = sessionmaker(
@@ -120,7 +128,7 @@ def app(test_settings, async_session):
     
     app = create_app()
     app.dependency_overrides[get_settings] = get_test_settings
-    app.dependency_overrides[get_db] = get_test_db
+    app.dependency_overrides[get_db_session] = get_test_db
     
     return app
 
@@ -131,7 +139,7 @@ def client(app) -> TestClient:
     return TestClient(app)
 
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def async_client(app) -> AsyncGenerator[AsyncClient, None]:
     """Create async test client."""
     async with AsyncClient(app=app, base_url="http://test") as client:
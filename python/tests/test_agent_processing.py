@@ -0,0 +1,55 @@
+"""Tests for the background task processing registry."""
+
+import asyncio
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from bytebot.services import agent_service
+from bytebot.services.agent_service import AgentService
+
+
+class TestStartProcessing:
+    """Test registration of background processing runs."""
+
+    @pytest.mark.asyncio
+    async def test_reuses_live_run(self):
+        """Test a second start returns the run that is still active."""
+        release = asyncio.Event()
+        calls = []
+
+        async def process(task_id):
+            calls.append(task_id)
+            await release.wait()
+        
+        task_id = uuid4()
+        with patch.object(AgentService, "_process_in_new_session", process):
+            first = AgentService.start_processing(task_id)
+            second = AgentService.start_processing(task_id)
+            await asyncio.sleep(0)
+            
+            assert second is first
+            assert agent_service._active_tasks[task_id] is first
+            
+            release.set()
+            await first.task
+        
+        assert calls == [task_id]
+        assert task_id not in agent_service._active_tasks
+
+    @pytest.mark.asyncio
+    async def test_logs_run_failures(self):
+        """Test errors escaping a run are logged when it finishes."""
+        async def process(task_id):
+            raise RuntimeError("session failed")
+        
+        task_id = uuid4()
+        with patch.object(AgentService, "_process_in_new_session", process), \
+                patch.object(agent_service.logger, "error") as log_error:
+            entry = AgentService.start_processing(task_id)
+            await entry.done.wait()
+        
+        log_error.assert_called_once()
+        assert "session failed" in log_error.call_args.args[0]
+        assert task_id not in agent_service._active_tasks
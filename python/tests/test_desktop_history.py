@@ -0,0 +1,325 @@
+"""Tests for desktop recording buffers, action history, notifications and the action log."""
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import numpy as np
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from bytebot.desktop import service as service_module
+from bytebot.desktop.models import DesktopAction, DesktopActionType, DesktopResponse
+from bytebot.desktop.service import DesktopService
+from bytebot.models import DesktopActionLog, Task
+
+
+def frame(value: int, size=(2, 3)) -> np.ndarray:
+    """Solid RGBA frame of the given (height, width)."""
+    return np.full((*size, 4), value, dtype=np.uint8)
+
+
+@pytest.fixture
+def desktop_service():
+    """Desktop service without a desktop connection."""
+    return DesktopService()
+
+
+class TestRecordingRingBuffer:
+    """Test the preallocated screen recording ring buffer."""
+
+    @pytest.mark.asyncio
+    async def test_frames_in_order_before_wrap(self, desktop_service):
+        """Test frames are kept oldest-first while the buffer has room."""
+        recording_id = await desktop_service.start_screen_recording(max_frames=4)
+        
+        slots = [desktop_service.append_frame(recording_id, frame(i)) for i in range(3)]
+        recording = await desktop_service.stop_screen_recording(recording_id)
+        
+        assert slots == [0, 1, 2]
+        assert recording["frame_count"] == 3
+        assert [int(f[0, 0, 0]) for f in recording["frames"]] == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_wraps_over_oldest_frames(self, desktop_service):
+        """Test a full buffer overwrites the oldest frames."""
+        recording_id = await desktop_service.start_screen_recording(
+            max_frames=3, frame_size=(3, 2)
+        )
+        
+        slots = [desktop_service.append_frame(recording_id, frame(i)) for i in range(5)]
+        recording = await desktop_service.stop_screen_recording(recording_id)
+        
+        assert slots == [0, 1, 2, 0, 1]
+        assert recording["frame_count"] == 3
+        assert [int(f[0, 0, 0]) for f in recording["frames"]] == [2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_copies_frames(self, desktop_service):
+        """Test later changes to a source frame do not reach the buffer."""
+        recording_id = await desktop_service.start_screen_recording(max_frames=2)
+        source = frame(7)
+        
+        desktop_service.append_frame(recording_id, source)
+        source[:] = 0
+        recording = await desktop_service.stop_screen_recording(recording_id)
+        
+        assert int(recording["frames"][0, 0, 0, 0]) == 7
+
+    @pytest.mark.asyncio
+    async def test_drops_similar_frames(self, desktop_service):
+        """Test frames below the difference threshold are dropped."""
+        recording_id = await desktop_service.start_screen_recording(
+            max_frames=4, min_frame_diff=10
+        )
+        
+        kept = [desktop_service.append_frame(recording_id, frame(v)) for v in (0, 5, 50)]
+        recording = await desktop_service.stop_screen_recording(recording_id)
+        
+        assert kept == [0, None, 1]
+        assert recording["dropped_frames"] == 1
+        assert recording["frame_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_rejects_mismatched_frames(self, desktop_service):
+        """Test frames must match the recording's shape."""
+        recording_id = await desktop_service.start_screen_recording(max_frames=2)
+        desktop_service.append_frame(recording_id, frame(1))
+        
+        with pytest.raises(ValueError):
+            desktop_service.append_frame(recording_id, frame(1, size=(4, 4)))
+
+    @pytest.mark.asyncio
+    async def test_rejects_empty_buffer(self, desktop_service):
+        """Test recordings need room for at least one frame."""
+        with pytest.raises(ValueError):
+            await desktop_service.start_screen_recording(max_frames=0)
+
+
+class TestActionStatistics:
+    """Test bisected date-window statistics over the action history."""
+
+    @pytest.fixture
+    def base_time(self):
+        """Timestamp of the first recorded action."""
+        return datetime(2024, 1, 1, 12, 0)
+
+    @pytest.fixture
+    def history(self, desktop_service, base_time):
+        """Service with one action per minute, recorded out of order."""
+        types = [
+            DesktopActionType.MOUSE_CLICK,
+            DesktopActionType.MOUSE_MOVE,
+            DesktopActionType.MOUSE_CLICK,
+            DesktopActionType.MOUSE_MOVE,
+            DesktopActionType.MOUSE_CLICK,
+        ]
+        for minute in (0, 1, 4, 2, 3):
+            desktop_service._record_action(
+                DesktopAction(type=types[minute], timestamp=base_time + timedelta(minutes=minute))
+            )
+        return desktop_service
+
+    def test_history_stays_sorted(self, history):
+        """Test out-of-order actions are inserted at their timestamp."""
+        timestamps = [action.timestamp for action in history.action_history]
+        
+        assert timestamps == sorted(timestamps)
+        assert timestamps == history._action_timestamps
+
+    @pytest.mark.asyncio
+    async def test_all_actions(self, history):
+        """Test statistics without a window cover every action."""
+        stats = await history.get_action_statistics()
+        
+        assert stats["total_actions"] == 5
+        assert stats["actions_by_type"] == {"mouse_click": 3, "mouse_move": 2}
+
+    @pytest.mark.asyncio
+    async def test_window_is_inclusive(self, history, base_time):
+        """Test actions on either window bound are counted."""
+        stats = await history.get_action_statistics(
+            start_date=base_time + timedelta(minutes=1),
+            end_date=base_time + timedelta(minutes=3),
+        )
+        
+        assert stats["total_actions"] == 3
+        assert stats["actions_by_type"] == {"mouse_move": 2, "mouse_click": 1}
+
+    @pytest.mark.asyncio
+    async def test_open_ended_windows(self, history, base_time):
+        """Test windows bounded on one side only."""
+        after = await history.get_action_statistics(start_date=base_time + timedelta(minutes=3))
+        before = await history.get_action_statistics(end_date=base_time + timedelta(seconds=30))
+        
+        assert after["total_actions"] == 2
+        assert before["total_actions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_window(self, history, base_time):
+        """Test a window after every action is empty."""
+        stats = await history.get_action_statistics(start_date=base_time + timedelta(hours=1))
+        
+        assert stats["total_actions"] == 0
+        assert stats["actions_by_type"] == {}
+
+
+@pytest_asyncio.fixture
+async def log_task(async_engine, async_session, monkeypatch):
+    """Task owning logged actions, with flushes writing to the test database."""
+    session_factory = sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(service_module.db_manager, "create_session_factory", lambda: session_factory)
+    
+    task = Task(title="Logged task")
+    async_session.add(task)
+    await async_session.commit()
+    return task
+
+
+async def logged_count(async_session) -> int:
+    """Number of rows in the desktop action log."""
+    return (await async_session.execute(select(func.count(DesktopActionLog.id)))).scalar_one()
+
+
+class TestActionLogFlush:
+    """Test batched writes of the desktop action log."""
+
+    async def queue_actions(self, desktop_service, task_id, count):
+        """Queue ``count`` successful screenshot actions for the log."""
+        for _ in range(count):
+            action = DesktopAction(type=DesktopActionType.SCREENSHOT)
+            response = DesktopResponse(success=True, action_id=action.id)
+            await desktop_service._save_action_to_db(task_id, action, response)
+
+    @pytest.mark.asyncio
+    async def test_rejected_rows_are_skipped(self, desktop_service, log_task, async_session):
+        """Test one invalid row does not lose the rest of its batch."""
+        await self.queue_actions(desktop_service, log_task.id, 2)
+        bad_row = dict(desktop_service._db_flush_buffer[0], parameters_json=None)
+        desktop_service._db_flush_buffer.insert(1, bad_row)
+        
+        await desktop_service.flush_action_log()
+        
+        assert await logged_count(async_session) == 2
+        assert desktop_service._db_flush_buffer == []
+
+    @pytest.mark.asyncio
+    async def test_failed_batches_are_requeued(self, desktop_service, log_task, monkeypatch):
+        """Test a batch that could not be written is kept for a retry."""
+        await self.queue_actions(desktop_service, log_task.id, 2)
+        rows = list(desktop_service._db_flush_buffer)
+
+        def unavailable():
+            raise ConnectionError("database unavailable")
+        
+        monkeypatch.setattr(service_module.db_manager, "create_session_factory", unavailable)
+        await desktop_service.flush_action_log()
+        
+        assert desktop_service._db_flush_buffer == rows
+        retry = desktop_service._db_flush_task
+        assert retry is not None and not retry.done()
+        retry.cancel()
+
+    @pytest.mark.asyncio
+    async def test_close_writes_buffer(self, desktop_service, log_task, async_session):
+        """Test closing the service writes out queued actions."""
+        await self.queue_actions(desktop_service, log_task.id, 3)
+        
+        await desktop_service.close()
+        
+        assert await logged_count(async_session) == 3
+        assert desktop_service._db_flush_buffer == []
+
+
+class TestConcurrentSequences:
+    """Test the options accepted for concurrent action sequences."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {"stop_on_error": True, "delay_between_actions": 0},
+            {"stop_on_error": False, "delay_between_actions": 0.1},
+        ],
+    )
+    async def test_rejects_conflicting_options(self, desktop_service, options):
+        """Test options concurrent runs cannot honour are refused."""
+        actions = [DesktopAction(type=DesktopActionType.SCREENSHOT) for _ in range(2)]
+        
+        with pytest.raises(ValueError):
+            await desktop_service.execute_action_sequence(actions, concurrency=2, **options)
+
+    @pytest.mark.asyncio
+    async def test_rejects_input_actions(self, desktop_service):
+        """Test actions that change desktop state must run in order."""
+        actions = [
+            DesktopAction(type=DesktopActionType.SCREENSHOT),
+            DesktopAction(type=DesktopActionType.TYPE_TEXT, text="hello"),
+        ]
+        
+        with pytest.raises(ValueError, match="type_text"):
+            await desktop_service.execute_action_sequence(
+                actions, stop_on_error=False, delay_between_actions=0, concurrency=2
+            )
+
+    @pytest.mark.asyncio
+    async def test_runs_read_only_actions(self, desktop_service):
+        """Test read-only actions run concurrently with responses in input order."""
+        actions = [DesktopAction(type=DesktopActionType.SCREENSHOT) for _ in range(3)]
+
+        async def execute(action):
+            return DesktopResponse(success=True, action_id=action.id)
+        
+        with patch.object(desktop_service.client, "execute_action", AsyncMock(side_effect=execute)):
+            responses = await desktop_service.execute_action_sequence(
+                actions, stop_on_error=False, delay_between_actions=0, concurrency=2
+            )
+        
+        assert [response.action_id for response in responses] == [action.id for action in actions]
+
+
+class TestActionNotifications:
+    """Test the per-task desktop action notification queues."""
+
+    @pytest.fixture
+    def sent(self, monkeypatch):
+        """Notifications delivered, recorded after a short delay each."""
+        sent = []
+
+        async def notify_desktop_action(task_id, action_data):
+            await asyncio.sleep(0.001)
+            sent.append((task_id, action_data["status"]))
+        
+        monkeypatch.setattr(service_module, "notify_desktop_action", notify_desktop_action)
+        return sent
+
+    @pytest.mark.asyncio
+    async def test_delivers_in_order(self, desktop_service, sent):
+        """Test each task's notifications arrive in the order they were queued."""
+        first, second = uuid4(), uuid4()
+        for status in ("started", "completed"):
+            desktop_service._notify_action(first, {"status": status})
+            desktop_service._notify_action(second, {"status": status})
+        
+        await desktop_service.flush_notifications()
+        
+        assert [status for task_id, status in sent if task_id == str(first)] == ["started", "completed"]
+        assert [status for task_id, status in sent if task_id == str(second)] == ["started", "completed"]
+        assert desktop_service._notify_queues == {}
+        assert desktop_service._notify_senders == {}
+
+    @pytest.mark.asyncio
+    async def test_keeps_terminal_notifications(self, desktop_service, sent, monkeypatch):
+        """Test a full queue drops started notifications before terminal ones."""
+        monkeypatch.setattr(service_module, "MAX_PENDING_NOTIFICATIONS", 2)
+        task_id = uuid4()
+        
+        for status in ("completed", "started", "failed", "error"):
+            desktop_service._notify_action(task_id, {"status": status})
+        await desktop_service.flush_notifications()
+        
+        assert [status for _, status in sent] == ["completed", "failed", "error"]
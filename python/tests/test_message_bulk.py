@@ -0,0 +1,123 @@
+"""Tests for bulk message inserts and imports."""
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from bytebot.models import Message, Task
+from bytebot.models import message as message_module
+from bytebot.shared.task_types import Role
+
+
+@pytest_asyncio.fixture
+async def task(async_session):
+    """Task that owns the inserted messages."""
+    task = Task(title="Bulk task")
+    async_session.add(task)
+    await async_session.commit()
+    return task
+
+
+class TestBulkCreateTextMessages:
+    """Test batched Core inserts of text messages."""
+
+    @pytest.mark.asyncio
+    async def test_inserts_in_order(self, async_session, task):
+        """Test every text becomes a message and IDs keep input order."""
+        texts = ["first", "second", "third"]
+        
+        message_ids = await Message.bulk_create_text_messages(
+            async_session, task.id, Role.USER, texts
+        )
+        await async_session.commit()
+        
+        result = await async_session.execute(
+            select(Message.id, Message.role, Message.content).where(Message.task_id == task.id)
+        )
+        rows = {row.id: row for row in result}
+        
+        assert len(message_ids) == len(texts)
+        assert set(rows) == set(message_ids)
+        for message_id, text in zip(message_ids, texts):
+            assert rows[message_id].role is Role.USER
+            assert rows[message_id].content == [{"type": "text", "text": text}]
+
+    @pytest.mark.asyncio
+    async def test_sends_pages(self, async_session, task, monkeypatch):
+        """Test rows are sent in pages of BULK_INSERT_PAGE_SIZE."""
+        monkeypatch.setattr(message_module, "BULK_INSERT_PAGE_SIZE", 2)
+        executed = []
+        execute = async_session.execute
+
+        async def record_execute(statement, params=None, **kwargs):
+            executed.append(len(params))
+            return await execute(statement, params, **kwargs)
+        
+        monkeypatch.setattr(async_session, "execute", record_execute)
+        
+        message_ids = await Message.bulk_create_text_messages(
+            async_session, task.id, Role.ASSISTANT, (f"text {i}" for i in range(5))
+        )
+        
+        assert executed == [2, 2, 1]
+        assert len(message_ids) == 5
+
+    @pytest.mark.asyncio
+    async def test_empty_input(self, async_session, task):
+        """Test no texts insert nothing."""
+        assert await Message.bulk_create_text_messages(async_session, task.id, Role.USER, []) == []
+
+
+class TestCopyFromRecords:
+    """Test message imports through copy_from_records."""
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_insert(self, async_session, task):
+        """Test non-asyncpg sessions import through the batched INSERT path."""
+        given_id = uuid4()
+        created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        rows = [
+            {
+                "id": given_id,
+                "task_id": task.id,
+                "role": "assistant",
+                "content": [{"type": "text", "text": "imported"}],
+                "message_metadata": {"source": "import"},
+                "created_at": created_at,
+            },
+            {
+                "task_id": task.id,
+                "role": Role.USER,
+                "content": [{"type": "text", "text": "defaults"}],
+            },
+        ]
+        
+        message_ids = await Message.copy_from_records(async_session, rows)
+        await async_session.commit()
+        
+        assert len(message_ids) == 2
+        assert message_ids[0] == given_id
+        
+        imported = await async_session.get(Message, given_id)
+        assert imported.role is Role.ASSISTANT
+        assert imported.message_metadata == {"source": "import"}
+        assert imported.is_processed is False
+        assert imported.created_at.replace(tzinfo=timezone.utc) == created_at
+        assert imported.updated_at == imported.created_at
+        
+        defaulted = await async_session.get(Message, message_ids[1])
+        assert defaulted.role is Role.USER
+        assert defaulted.parent_message_id is None
+        now = datetime.now(timezone.utc)
+        assert now - defaulted.created_at.replace(tzinfo=timezone.utc) < timedelta(minutes=1)
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_role(self, async_session, task):
+        """Test rows with an invalid role are refused."""
+        rows = [{"task_id": task.id, "role": "narrator", "content": []}]
+        
+        with pytest.raises(ValueError):
+            await Message.copy_from_records(async_session, rows)
@@ -0,0 +1,88 @@
+"""Tests for message creation through the message service."""
+
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.exc import IntegrityError
+
+from bytebot.core.exceptions import BytebotNotFoundException
+from bytebot.models import Task
+from bytebot.schemas.message import MessageCreate
+from bytebot.services.message_service import MessageService, _violated_constraint
+from bytebot.shared.task_types import Role
+
+
+@pytest_asyncio.fixture
+async def task(async_session):
+    """Task the created messages belong to."""
+    task = Task(title="Message task")
+    async_session.add(task)
+    await async_session.commit()
+    return task
+
+
+def message_for(task_id, parent_message_id=None) -> MessageCreate:
+    """Create schema for a short user message."""
+    return MessageCreate(
+        task_id=task_id,
+        role=Role.USER,
+        content=[{"type": "text", "text": "hello"}],
+        parent_message_id=parent_message_id,
+    )
+
+
+class TestCreateMessageErrors:
+    """Test which missing reference a failed message insert reports."""
+
+    @pytest.mark.asyncio
+    async def test_missing_task(self, async_session):
+        """Test a dangling task reference names the task."""
+        task_id = uuid4()
+        
+        with pytest.raises(BytebotNotFoundException, match=f"Task {task_id} not found"):
+            await MessageService(async_session).create_message(message_for(task_id, uuid4()))
+
+    @pytest.mark.asyncio
+    async def test_missing_parent(self, async_session, task):
+        """Test a dangling parent reference on an existing task names the parent."""
+        parent_id = uuid4()
+        
+        with pytest.raises(BytebotNotFoundException, match=f"Parent message {parent_id} not found"):
+            await MessageService(async_session).create_message(message_for(task.id, parent_id))
+
+    @pytest.mark.asyncio
+    async def test_existing_parent(self, async_session, task):
+        """Test a message can reply to an existing message."""
+        service = MessageService(async_session)
+        parent = await service.create_message(message_for(task.id))
+        
+        reply = await service.create_message(message_for(task.id, parent.id))
+        
+        assert reply.parent_message_id == parent.id
+
+
+class TestViolatedConstraint:
+    """Test reading constraint names from driver errors."""
+
+    def test_psycopg_diagnostics(self):
+        """Test psycopg errors report the name through their diagnostics."""
+        orig = SimpleNamespace(diag=SimpleNamespace(constraint_name="message_parent_message_id_fkey"))
+        
+        assert _violated_constraint(IntegrityError("INSERT", {}, orig)) == "message_parent_message_id_fkey"
+
+    def test_asyncpg_cause(self):
+        """Test asyncpg errors report the name on the wrapped exception."""
+        cause = Exception("insert or update violates foreign key constraint")
+        cause.constraint_name = "message_task_id_fkey"
+        orig = Exception("foreign key violation")
+        orig.__cause__ = cause
+        
+        assert _violated_constraint(IntegrityError("INSERT", {}, orig)) == "message_task_id_fkey"
+
+    def test_unnamed(self):
+        """Test SQLite errors carry no constraint name."""
+        orig = Exception("FOREIGN KEY constraint failed")
+        
+        assert _violated_constraint(IntegrityError("INSERT", {}, orig)) is None
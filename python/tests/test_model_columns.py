@@ -0,0 +1,87 @@
+"""Tests for custom column types."""
+
+import pytest
+from sqlalchemy import select, text
+
+from bytebot.models import Message, Task
+from bytebot.models.base import SmallIntEnum
+from bytebot.shared.task_types import (
+    ROLE_CODES,
+    TASK_PRIORITY_CODES,
+    TASK_STATUS_CODES,
+    TASK_TYPE_CODES,
+    Role,
+    TaskPriority,
+    TaskStatus,
+    TaskType,
+)
+
+
+CODE_TABLES = [
+    (TaskStatus, TASK_STATUS_CODES),
+    (TaskPriority, TASK_PRIORITY_CODES),
+    (TaskType, TASK_TYPE_CODES),
+    (Role, ROLE_CODES),
+]
+
+
+class TestSmallIntEnum:
+    """Test SMALLINT enum code translation."""
+
+    @pytest.mark.parametrize("enum_class,codes", CODE_TABLES)
+    def test_code_table_is_complete(self, enum_class, codes):
+        """Test every member has a distinct code."""
+        assert set(codes) == set(enum_class)
+        assert len(set(codes.values())) == len(codes)
+
+    @pytest.mark.parametrize("enum_class,codes", CODE_TABLES)
+    def test_round_trip(self, enum_class, codes):
+        """Test members survive bind and result processing."""
+        column_type = SmallIntEnum(enum_class, codes)
+        
+        for member in enum_class:
+            code = column_type.process_bind_param(member, None)
+            assert code == codes[member]
+            assert column_type.process_result_value(code, None) is member
+
+    def test_binds_enum_values(self):
+        """Test plain string values bind to the member's code."""
+        column_type = SmallIntEnum(TaskStatus, TASK_STATUS_CODES)
+        
+        assert column_type.process_bind_param("RUNNING", None) == TASK_STATUS_CODES[TaskStatus.RUNNING]
+
+    def test_none_passes_through(self):
+        """Test NULL stays NULL in both directions."""
+        column_type = SmallIntEnum(Role, ROLE_CODES)
+        
+        assert column_type.process_bind_param(None, None) is None
+        assert column_type.process_result_value(None, None) is None
+
+    @pytest.mark.asyncio
+    async def test_database_round_trip(self, async_session):
+        """Test the columns store codes and load members."""
+        task = Task(
+            title="Enum task",
+            status=TaskStatus.PAUSED,
+            priority=TaskPriority.HIGH,
+            task_type=TaskType.CUSTOM,
+        )
+        async_session.add(task)
+        await async_session.flush()
+        async_session.add(Message(task_id=task.id, role=Role.ASSISTANT, content=[]))
+        await async_session.commit()
+        async_session.expunge_all()
+        
+        raw = (await async_session.execute(text("SELECT status, priority FROM task"))).one()
+        assert tuple(raw) == (
+            TASK_STATUS_CODES[TaskStatus.PAUSED],
+            TASK_PRIORITY_CODES[TaskPriority.HIGH],
+        )
+        
+        loaded = (await async_session.execute(select(Task))).scalar_one()
+        assert loaded.status is TaskStatus.PAUSED
+        assert loaded.priority is TaskPriority.HIGH
+        assert loaded.task_type is TaskType.CUSTOM
+        
+        role = (await async_session.execute(select(Message.role))).scalar_one()
+        assert role is Role.ASSISTANT
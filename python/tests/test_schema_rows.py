@@ -0,0 +1,139 @@
+"""Tests for building response schemas from ORM rows."""
+
+import contextvars
+from datetime import datetime, timedelta, timezone
+
+import orjson
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from bytebot.models import Message, Summary, Task
+from bytebot.schemas._fast import encode_task_list
+from bytebot.schemas.message import MessageResponse
+from bytebot.schemas.summary import SummaryResponse
+from bytebot.schemas.task import TaskResponse, TaskWithMessages, set_response_time
+from bytebot.shared.task_types import Role, TaskPriority, TaskType
+
+
+@pytest_asyncio.fixture
+async def rows(async_session):
+    """A finished task with a message and a summary, loaded back from the database."""
+    now = datetime.now(timezone.utc)
+    task = Task(
+        title="Row task",
+        description="Parity check",
+        task_type=TaskType.TEXT_GENERATION,
+        priority=TaskPriority.HIGH,
+        task_metadata={"source": "tests"},
+    )
+    task.start(now=now - timedelta(seconds=90))
+    task.complete({"answer": 42}, now=now)
+    async_session.add(task)
+    await async_session.flush()
+    
+    async_session.add_all([
+        Message(
+            task_id=task.id,
+            role=Role.ASSISTANT,
+            content=[{"type": "text", "text": "hello"}],
+            message_metadata={"k": "v"},
+            input_tokens=3,
+            output_tokens=4,
+        ),
+        Summary(task_id=task.id, title="Summary", content="Done"),
+    ])
+    await async_session.commit()
+    async_session.expunge_all()
+    
+    result = await async_session.execute(
+        select(Task).options(selectinload(Task.messages), selectinload(Task.summaries))
+    )
+    return result.scalar_one()
+
+
+class TestFromRowParity:
+    """Test from_row builds the same responses as model_validate."""
+
+    @pytest.mark.asyncio
+    async def test_task_response(self, rows):
+        """Test task responses match."""
+        assert TaskResponse.from_row(rows) == TaskResponse.model_validate(rows)
+
+    @pytest.mark.asyncio
+    async def test_task_with_messages(self, rows):
+        """Test task responses with nested messages match."""
+        built = TaskWithMessages.from_row(rows)
+        
+        assert built == TaskWithMessages.model_validate(rows)
+        assert all(isinstance(message, MessageResponse) for message in built.messages)
+
+    @pytest.mark.asyncio
+    async def test_message_response(self, rows):
+        """Test message responses serialize the same."""
+        message = rows.messages[0]
+        built = MessageResponse.from_row(message)
+        validated = MessageResponse.model_validate(message)
+        
+        assert orjson.loads(built.to_json_bytes()) == orjson.loads(validated.model_dump_json())
+
+    @pytest.mark.asyncio
+    async def test_summary_response(self, rows):
+        """Test summary responses match."""
+        summary = rows.summaries[0]
+        
+        assert SummaryResponse.from_row(summary) == SummaryResponse.model_validate(summary)
+
+    @pytest.mark.asyncio
+    async def test_fast_list_encoding(self, rows):
+        """Test the fast list encoder writes the schema's JSON."""
+        encoded = orjson.loads(encode_task_list([rows], 1, 0, 10))
+        
+        assert encoded["has_more"] is False
+        assert encoded["tasks"] == [orjson.loads(TaskResponse.model_validate(rows).model_dump_json())]
+
+    @pytest.mark.asyncio
+    async def test_task_without_messages(self, rows, async_session):
+        """Test tasks loaded with deferred message content skip the messages."""
+        async_session.expunge_all()
+        result = await async_session.execute(
+            select(Task).options(selectinload(Task.messages).defer(Message.content))
+        )
+        task = result.scalar_one()
+        built = TaskWithMessages.from_task_row(task)
+        
+        assert built.messages == []
+        assert built.id == rows.id
+
+
+class TestTaskDuration:
+    """Test the duration reported for unfinished tasks."""
+
+    def test_elapsed_uses_request_time(self):
+        """Test running tasks report the time elapsed at the request time."""
+        def build():
+            now = set_response_time(datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc))
+            task = Task(title="Running task")
+            task.start(now=now - timedelta(seconds=30))
+            return TaskResponse.from_row(task)
+        
+        # Run in a copied context so the request time does not leak into other tests
+        assert contextvars.copy_context().run(build).duration_seconds == 30.0
+
+    def test_not_started(self):
+        """Test pending tasks report no duration."""
+        assert TaskResponse.from_row(Task(title="Pending task")).duration_seconds is None
+
+    @pytest.mark.asyncio
+    async def test_completed_duration_is_stored(self, async_session):
+        """Test the database fills in the duration of finished tasks."""
+        started_at = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+        task = Task(title="Finished task", started_at=started_at)
+        task.completed_at = started_at + timedelta(seconds=90.5)
+        async_session.add(task)
+        await async_session.commit()
+        async_session.expunge_all()
+        
+        duration = (await async_session.execute(select(Task.duration_seconds))).scalar_one()
+        assert duration == 90.5
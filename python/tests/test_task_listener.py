@@ -0,0 +1,72 @@
+"""Tests for the task insert listener."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from bytebot.models import Task
+from bytebot.services import agent_service
+from bytebot.services.agent_service import AgentService, TaskListener
+from bytebot.shared.task_types import TaskStatus
+
+
+async def run_listener(listener: TaskListener, delay: float = 0.05) -> None:
+    """Run the listener's worker loop briefly, then stop it."""
+    worker = asyncio.create_task(listener._run())
+    await asyncio.sleep(delay)
+    worker.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await worker
+
+
+class TestTaskListener:
+    """Test dispatching of notified and swept tasks."""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_notifications_dispatch_once(self):
+        """Test repeated notifications for a task start it once."""
+        listener = TaskListener(poll_interval=60)
+        task_id = uuid4()
+        
+        with patch.object(AgentService, "start_processing") as start_processing:
+            for _ in range(3):
+                listener._on_notify(None, 0, "tasks_new", str(task_id))
+            await run_listener(listener)
+        
+        start_processing.assert_called_once_with(task_id)
+
+    @pytest.mark.asyncio
+    async def test_skips_tasks_already_running_here(self):
+        """Test tasks with a local processing run are not dispatched again."""
+        listener = TaskListener(poll_interval=60)
+        running_id, new_id = uuid4(), uuid4()
+        
+        with patch.dict(agent_service._active_tasks, {running_id: object()}), \
+                patch.object(AgentService, "start_processing") as start_processing:
+            listener._on_notify(None, 0, "tasks_new", str(running_id))
+            listener._on_notify(None, 0, "tasks_new", str(new_id))
+            await run_listener(listener)
+        
+        start_processing.assert_called_once_with(new_id)
+
+    @pytest.mark.asyncio
+    async def test_sweep_only_queues_pending_auto_start_tasks(self, async_session):
+        """Test the sweep picks pending tasks that asked to auto-start."""
+        wanted = Task(title="Auto start", auto_start=True)
+        manual = Task(title="Manual start")
+        running = Task(title="Running", auto_start=True, status=TaskStatus.RUNNING)
+        async_session.add_all([wanted, manual, running])
+        await async_session.commit()
+
+        @asynccontextmanager
+        async def get_session():
+            yield async_session
+        
+        listener = TaskListener(poll_interval=60)
+        with patch.object(agent_service.db_manager, "get_session", get_session):
+            await listener._sweep()
+        
+        assert listener._pending == {wanted.id}